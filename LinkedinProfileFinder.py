@@ -1,42 +1,51 @@
+import sys
+
+if __name__ == "__main__" and sys.argv[1:2] in (["batch"], ["worker"]):
+    # Headless batch and worker modes never import Dash, Flask or waitress
+    from profile_search import main
+    sys.exit(main(sys.argv[1:]))
+
 import base64
-import io
+import functools
+import hashlib
+import itertools
+import json
 import time
-import random
-import logging
-import pandas as pd
-from concurrent.futures import ThreadPoolExecutor
 import webbrowser
 import threading
 import subprocess
 import os
-import chardet
-import multiprocessing
-import re
-import requests
 import dash
-import platform
-import shutil
 import flask
 from flask_login import LoginManager, UserMixin, login_user, logout_user, current_user
 import dash_bootstrap_components as dbc
 from werkzeug.security import check_password_hash, generate_password_hash
-
-# ────────────────────────────────────────────────────────────────
-# Selenium & ML deps
-# ────────────────────────────────────────────────────────────────
-from selenium import webdriver
 from waitress import serve
-from dash_extensions import EventListener
-from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from sentence_transformers import SentenceTransformer
-from sentence_transformers.util import cos_sim
-from rapidfuzz import fuzz
-from transformers import pipeline
-from collections import Counter
+from dash_extensions import EventListener, EventSource
 from dash import dcc, html, dash_table, Output, Input, State, no_update
 
+from profile_search import (
+    EXPORT_FORMATS,
+    OPS_ERROR_RATE_WARN,
+    OPS_TIMEOUT_RATE_WARN,
+    Priority,
+    STALL_SECONDS,
+    SearchResult,
+    display_row,
+    export_row,
+    iter_export_chunks,
+    iter_people,
+    job_registry,
+    load_models,
+    logger,
+    metrics,
+    new_search_job,
+    ops_monitor,
+    read_people_csv,
+    user_shares,
+    work_queue,
+)
+
 # ────────────────────────────────────────────────────────────────
 # User Authentication
 # ────────────────────────────────────────────────────────────────
@@ -66,6 +75,24 @@ VALID_USERS = {
     'boss':   (7, generate_password_hash('RutgersDirector1!'), 'Supervisor'),
     'guest':  (8, generate_password_hash('LSAMPaccess2025!'), 'Guest'),
 }
+ADMIN_USERS = {'arik', 'soham', 'darsh', 'dylan', 'andrew'}
+
+# A dedicated login for `worker --coordinator` processes, when QUEUE_WORKER_PASSWORD is set.
+# Only it and the admins may use /api/queue/*: a lease hands out every user's people,
+# and an ack writes results into any job.
+if os.getenv("QUEUE_WORKER_PASSWORD"):
+    VALID_USERS['worker'] = (9, generate_password_hash(os.environ["QUEUE_WORKER_PASSWORD"]), 'Queue worker')
+QUEUE_WORKER_USERS = {'worker'} | ADMIN_USERS
+
+# Fair-share settings for these accounts (weight, max_concurrency, serpapi_daily_limit);
+# a user's entry in the USER_SHARES environment variable replaces theirs here
+USER_SHARE_DEFAULTS = {
+    'guest': {'max_concurrency': 2, 'serpapi_daily_limit': 100},
+}
+user_shares.update({user: share for user, share in USER_SHARE_DEFAULTS.items() if user not in user_shares})
+for _user in user_shares:
+    if _user not in VALID_USERS:
+        logger.warning(f"⚠️ USER_SHARES names unknown user {_user!r}")
 
 # Initialize Flask server and login manager
 server = flask.Flask(__name__)
@@ -84,433 +111,35 @@ def load_user(user_id):
     return None
 
 # ────────────────────────────────────────────────────────────────
-# Globals & Thread‑Pool
-# ────────────────────────────────────────────────────────────────
-
-uploaded_people: list = []
-start_time = None
-last_result_time = None
-MAX_RETRIES = 2
-retry_attempts = {}
-final_table_ready = False
-finalized_table_data = []
-
-logger = logging.getLogger("LinkedInScraper")
-
-# CPU‑aware thread count (max 8)
-available_threads = os.cpu_count() or multiprocessing.cpu_count()
-max_threads = min(8, max(4, int(available_threads * 0.75)))
-executor = ThreadPoolExecutor(max_workers=max_threads)
-pending_tasks = []
-completed_results = []
-
-scraping_active = False
-start_scrape_time = None
-
-action_lock = threading.Lock()
-
-# ────────────────────────────────────────────────────────────────
-# Logging — keep history (no truncation)
-# ────────────────────────────────────────────────────────────────
-
-log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "searchlog.txt")
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] [%(levelname)s] :: %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler(log_file_path, mode="a", encoding="utf-8")
-    ]
-)
-logger.info("🔁 Logger started — appending to existing searchlog.txt")
-
-# Cross‑platform helper to open the log – optional UI button can call this
-
-def open_log_file():
-    try:
-        system = platform.system()
-        if system == "Windows":
-            os.startfile(log_file_path)
-        elif system == "Darwin":  # macOS
-            subprocess.run(["open", log_file_path])
-        else:  # Linux & friends
-            subprocess.run(["xdg-open", log_file_path])
-    except Exception as e:
-        logger.warning(f"⚠️ Failed to open log file: {e}")
-
-# ────────────────────────────────────────────────────────────────
-# ML Models (single NER pipeline)
-# ────────────────────────────────────────────────────────────────
-
-sentence_model = SentenceTransformer("all-mpnet-base-v2")
-ner_pipeline = pipeline("ner", model="Jean-Baptiste/roberta-large-ner-english", grouped_entities=True)
-
-# ────────────────────────────────────────────────────────────────
-# Helpers
-# ────────────────────────────────────────────────────────────────
-
-def extract_ner_entities(text: str):
-    """Return unique PER / ORG / LOC from a text blob."""
-    ents = ner_pipeline(text)
-    loc = {e["word"] for e in ents if e["entity_group"] == "LOC"}
-    org = {e["word"] for e in ents if e["entity_group"] == "ORG"}
-    per = {e["word"] for e in ents if e["entity_group"] == "PER"}
-    return {"locations": list(loc), "organizations": list(org), "persons": list(per)}
-
-
-def extract_best_title(raw_title: str) -> str:
-    """Strip boiler‑plate and heuristically pick best job‑title fragment."""
-    if not raw_title:
-        return "Not Found"
-    clean = raw_title
-    for ph in ("United States", "Professional Profile", "Connections", "LinkedIn"):
-        clean = clean.replace(ph, "").strip()
-    parts = [p.strip() for p in clean.split("|") if p.strip()]
-    if not parts:
-        return "Not Found"
-    ref = clean.lower()
-    return max(parts, key=lambda p: fuzz.token_set_ratio(p, ref))
-
-
-def is_best_match(full_name: str, title: str, cos_th=0.4, fuzz_th=0.75):
-    if not (full_name and title):
-        return False
-    cos_score = cos_sim(
-        sentence_model.encode(full_name, convert_to_tensor=True),
-        sentence_model.encode(title, convert_to_tensor=True)
-    ).item()
-    fuzz_score = fuzz.token_set_ratio(full_name.lower(), title.lower()) / 100.0
-    logger.info(f"[Similarity] Cosine: {cos_score:.2f} | Fuzzy: {fuzz_score:.2f}")
-    return cos_score >= cos_th or fuzz_score >= fuzz_th
-
-
-university_map = {
-    "KU": "Kean University",
-    "RUN": "Rutgers University - Newark",
-    "RUNB": "Rutgers University - Newark",
-    "WPU": "William Paterson University",
-    "FDU": "Fairleigh Dickinson University",
-    "MSU": "Montclair State University",
-    "NJCU": "New Jersey City University",
-    "BC": "Bloomfield College",
-}
-
-# ────────────────────────────────────────────────────────────────
-# Chrome driver (headless)
-# ────────────────────────────────────────────────────────────────
-DRIVER_PATH = ChromeDriverManager().install()
-
-def create_driver():
-    opts = webdriver.ChromeOptions()
-    opts.add_argument("--headless")
-    opts.add_argument("--disable-gpu")
-    opts.add_argument("--no-sandbox")
-    opts.add_argument("--disable-dev-shm-usage")
-    opts.add_argument("--user-agent=Mozilla/5.0")
-    drv = webdriver.Chrome(service=Service(DRIVER_PATH), options=opts)
-    drv.set_page_load_timeout(15)
-    return drv
-
-# ────────────────────────────────────────────────────────────────
-# SerpAPI helpers — single call for profile + inline location & income
-# ────────────────────────────────────────────────────────────────
-
-CITY_KEYWORDS = [
-    # big US cities – quick heuristic list
-    "Chicago", "Boston", "Atlanta", "Seattle", "San Francisco", "Los Angeles",
-    "San Diego", "Philadelphia", "Phoenix", "Houston", "Dallas", "Miami", "Las Vegas",
-    "Austin", "Denver", "Minneapolis", "Orlando", "San Jose", "Portland", "New Orleans",
-    "Tampa", "Charlotte"
-]
-
-US_STATE_ABBR = {
-    "al": "Alabama", "ak": "Alaska", "az": "Arizona", "ar": "Arkansas", "ca": "California",
-    "co": "Colorado", "ct": "Connecticut", "de": "Delaware", "fl": "Florida", "ga": "Georgia",
-    "hi": "Hawaii", "id": "Idaho", "il": "Illinois", "in": "Indiana", "ia": "Iowa",
-    "ks": "Kansas", "ky": "Kentucky", "la": "Louisiana", "me": "Maine", "md": "Maryland",
-    "ma": "Massachusetts", "mi": "Michigan", "mn": "Minnesota", "ms": "Mississippi", "mo": "Missouri",
-    "mt": "Montana", "ne": "Nebraska", "nv": "Nevada", "nh": "New Hampshire", "nj": "New Jersey",
-    "nm": "New Mexico", "ny": "New York", "nc": "North Carolina", "nd": "North Dakota", "oh": "Ohio",
-    "ok": "Oklahoma", "or": "Oregon", "pa": "Pennsylvania", "ri": "Rhode Island", "sc": "South Carolina",
-    "sd": "South Dakota", "tn": "Tennessee", "tx": "Texas", "ut": "Utah", "vt": "Vermont",
-    "va": "Virginia", "wa": "Washington", "wv": "West Virginia", "wi": "Wisconsin", "wy": "Wyoming"
-}
-
-
-# Main profile search — one SerpAPI call per person
-
-def serpapi_search_linkedin_profile(person: dict, api_key=None):
-    # Get the key from session storage or fall back to env variable
-    serp_key = api_key or os.getenv("SERPAPI_KEY", "")
-    
-    if not serp_key:
-        logger.warning("⚠️ No SERPAPI_KEY found — falling back to Bing search.")
-        return None
-    
-    logger.info(f"🔍 Using SerpAPI: {'Session key' if api_key else 'Environment key' if os.getenv('SERPAPI_KEY') else 'No key'}")
-
-    full_name = f"{person['First Name']} {person['Last Name']}".strip()
-    university = university_map.get(person["University"], person["University"])
-    query = f'"{full_name}" "{university}" site:linkedin.com'
-
-    params = {"q": query, "api_key": serp_key, "engine": "google", "num": 10}
-    try:
-        logger.info(f"🔍 SerpAPI query: {query}")
-        data = requests.get("https://serpapi.com/search", params=params, timeout=20).json()
-        if "error" in data:
-            logger.error(f"SerpAPI error: {data['error']}")
-            return None
-
-        best_result = None
-        best_score = -1.0
-
-        for res in data.get("organic_results", []):
-            title = res.get("title", "")
-            link = res.get("link", "")
-            snippet = res.get("snippet", "")
-
-            if not (full_name.lower() in title.lower() or full_name.lower() in snippet.lower()):
-                continue  # quick filter
-
-            if not is_best_match(full_name, title):
-                continue
-
-            # compute score only once we know it passes threshold
-            cos_s = cos_sim(
-                sentence_model.encode(full_name, convert_to_tensor=True),
-                sentence_model.encode(title, convert_to_tensor=True)
-            ).item()
-            fz_s = fuzz.token_set_ratio(full_name.lower(), title.lower()) / 100
-            score = max(cos_s, fz_s)
-            if score <= best_score:
-                continue
-
-            # NER location (prefer snippet+title)
-            ner = extract_ner_entities(f"{title}. {snippet}")
-            loc = ner["locations"][0] if ner["locations"] else "Unknown"
-
-            best_result = {
-                "First Name": person["First Name"],
-                "Last Name": person["Last Name"],
-                "University": university,
-                "Graduation Year": person.get("Graduation Year", "N/A"),
-                "LinkedIn Title": extract_best_title(title),
-                "LinkedIn URL": f'<a href="{link}" target="_blank">Open Profile</a>',
-                "Score": f"{int(score*100)}%",
-                "Location (Estimated)": loc,
-            }
-            best_score = score
-
-        if best_result:
-            # grab income once, based on chosen title/loc
-            best_result["Income (Estimated)"] = "Unknown"
-            logger.info(f"🏆 Best match {full_name}: {best_result['LinkedIn Title']} @ {best_score:.2f}")
-            return best_result
-        else:
-            logger.warning(f"No SerpAPI match for {full_name}")
-    except Exception as e:
-        logger.error(f"SerpAPI failure {full_name}: {e}")
-
-    return None
-
-# ────────────────────────────────────────────────────────────────
-# Bing / Selenium fallback (kept, but no extra SerpAPI calls)
+# Globals — each dashboard user drives their own batch, with manual lookups beside it
 # ────────────────────────────────────────────────────────────────
 
-def search_person(person, cosine_threshold=0.4, fuzzy_threshold=0.75, serpapi_key=None):
-    result = serpapi_search_linkedin_profile(person, api_key=serpapi_key)
-    if result:
-        return result
+uploaded_people = {}  # username → DataFrame of their last upload, iterated lazily per search
+dashboard_jobs = {}  # (username, "batch" or "manual") → that user's latest SearchJob of the kind
 
-    # Fallback via Bing (rare)
-    full_name = f"{person['First Name']} {person['Last Name']}".strip()
-    query = f'"{full_name}" "{person["University"]}" site:linkedin.com'
-    attempt = retry_attempts.get(full_name, 0)
-
-    driver = None
-    try:
-        driver = create_driver()
-        driver.get(f"https://www.bing.com/search?q={query}")
-        time.sleep(random.uniform(2, 3))
-        entries = driver.find_elements(By.CSS_SELECTOR, "li.b_algo")[:10]
-        best = None
-        best_score = -1.0
-        for ent in entries:
-            try:
-                title = ent.find_element(By.TAG_NAME, "h2").text.strip()
-                href = ent.find_element(By.TAG_NAME, "a").get_attribute("href")
-                snippet = ent.find_element(By.CLASS_NAME, "b_caption").text.strip()
-            except Exception:
-                continue
-
-            if not is_best_match(full_name, title, cos_th=cosine_threshold, fuzz_th=fuzzy_threshold):
-                continue
-            cos_s = cos_sim(sentence_model.encode(full_name, convert_to_tensor=True),
-                            sentence_model.encode(title, convert_to_tensor=True)).item()
-            fz_s = fuzz.token_set_ratio(full_name.lower(), title.lower()) / 100
-            sc = max(cos_s, fz_s)
-            if sc <= best_score:
-                continue
-
-            ner = extract_ner_entities(f"{title}. {snippet}")
-            loc = ner["locations"][0] if ner["locations"] else "Unknown"
-            best = {
-                "First Name": person["First Name"],
-                "Last Name": person["Last Name"],
-                "University": person["University"],
-                "Graduation Year": person.get("Graduation Year", "N/A"),
-                "LinkedIn Title": extract_best_title(title),
-                "LinkedIn URL": f'<a href="{href}" target="_blank">Open Profile</a>',
-                "Score": f"{int(sc*100)}%",
-                "Location (Estimated)": loc,
-                "Income (Estimated)": "Unknown",
-            }
-            best_score = sc
-        return best
-    except Exception as e:
-        logger.error(f"Selenium fallback failed for {full_name}: {e}")
-        if attempt < MAX_RETRIES:
-            retry_attempts[full_name] = attempt + 1
-            return search_person(person)
-    finally:
-        if driver:
-            driver.quit()
-    return None
 
-def finalize_income_estimates(results):
-    salary_ranges = {
-        # Engineering roles
-        'engineer': (85000, 150000),
-        'software': (110000, 180000),
-        'developer': (95000, 160000),
-        'architect': (130000, 190000),
-        'data scientist': (120000, 180000),
-        'devops': (115000, 170000),
-        'product manager': (125000, 190000),
-        
-        # Business/Finance
-        'analyst': (75000, 120000),
-        'manager': (90000, 150000),
-        'director': (140000, 220000),
-        'executive': (180000, 300000),
-        'ceo': (200000, 500000),
-        'cfo': (180000, 350000),
-        'cto': (160000, 300000),
-        'vp': (150000, 280000),
-        'finance': (90000, 160000),
-        'accountant': (70000, 120000),
-        
-        # Marketing/Sales
-        'marketing': (75000, 130000),
-        'sales': (65000, 140000),
-        'account manager': (80000, 130000),
-        'customer': (60000, 100000),
-        
-        # Healthcare
-        'doctor': (180000, 350000),
-        'physician': (200000, 400000),
-        'nurse': (75000, 120000),
-        'healthcare': (80000, 150000),
-        
-        # Legal
-        'attorney': (130000, 250000),
-        'lawyer': (120000, 240000),
-        'legal': (100000, 200000),
-        
-        # Education
-        'professor': (80000, 150000),
-        'teacher': (50000, 85000),
-        'educator': (55000, 90000),
-        
-        # Other common roles
-        'consultant': (90000, 170000),
-        'advisor': (85000, 150000),
-        'specialist': (70000, 120000),
-        'researcher': (75000, 130000),
-        'student': (0, 30000),
-        'intern': (30000, 60000),
-        'associate': (65000, 110000),
-    }
-    
-    # Default range for unknown professions
-    default_range = (60000, 100000)
-    
-    for result in results:
-        # Skip if we already have an income estimate that isn't "Unknown"
-        if result.get("Income (Estimated)") and result.get("Income (Estimated)") != "Unknown":
-            continue
-            
-        title = result.get("LinkedIn Title", "").lower()
-        
-        if title == "Not Found" or not title:
-            result["Income (Estimated)"] = "Unknown"
-            continue
-        
-        # Find matching salary range
-        matched_range = None
-        for keyword, salary_range in salary_ranges.items():
-            if keyword in title:
-                matched_range = salary_range
-                break
-        
-        # Use default if no match found
-        if not matched_range:
-            matched_range = default_range
-            
-        # Add some randomness within the range
-        salary = random.randint(matched_range[0], matched_range[1])
-        # Format with $ and commas
-        result["Income (Estimated)"] = f"${salary:,}"
-        
-        # Add a status field for successful matches
-        if result.get("LinkedIn URL"):
-            result["Status"] = "✅ Match Found"
-    
-    logger.info(f"📊 Income estimates added for {len(results)} results")
-    return results
+def dashboard_user():
+    return current_user.username if current_user.is_authenticated else None
 
-# ────────────────────────────────────────────────────────────────
-# Task orchestration utils (enqueue / done)
-# ────────────────────────────────────────────────────────────────
 
-def enqueue_tasks(people, cosine_threshold=0.4, fuzzy_threshold=0.75, serpapi_key=None):
-    global scraping_active, start_scrape_time, pending_tasks, total_tasks
-    
-    scraping_active = True
-    start_scrape_time = time.time()
-    pending_tasks.clear()
-    completed_results.clear()
-    total_tasks = len(people)
+def cursor_job(cursor):
+    """The job a tab's results cursor points at, if the signed-in user owns it."""
+    job = job_registry.get(cursor["job"]) if cursor else None
+    return job if job is not None and job.owner == dashboard_user() else None
 
-    logger.info(f"🚀 Starting search for {total_tasks} person(s)")
 
-    for p in people:
-        fut = executor.submit(search_person, p, cosine_threshold, fuzzy_threshold, serpapi_key)
-        fut.add_done_callback(task_done)
-        pending_tasks.append(fut)
+def stop_dashboard_job(user, kind):
+    job = dashboard_jobs.pop((user, kind), None)
+    if job:
+        job.stop()
 
+# Counters are sampled from server start, so the operations panel has history when opened
+ops_monitor.start()
 
-def task_done(fut):
-    global scraping_active, last_result_time
-    with action_lock:
-        try:
-            res = fut.result(timeout=60)
-            completed_results.append(res or {
-                "First Name": "N/A", "Last Name": "N/A", "University": "N/A",
-                "Graduation Year": "N/A", "LinkedIn Title": "Not Found", "LinkedIn URL": "",
-                "Score": "N/A", "Location (Estimated)": "Unknown", "Income (Estimated)": "Unknown",
-            })
-            last_result_time = time.time()
-        except Exception as e:
-            logger.error(f"Task failure: {e}")
-            completed_results.append({
-                "First Name": "N/A", "Last Name": "N/A", "University": "N/A",
-                "Graduation Year": "N/A", "LinkedIn Title": "Error", "LinkedIn URL": "",
-                "Score": "N/A", "Location (Estimated)": "Unknown", "Income (Estimated)": "Unknown",
-            })
-        if len(completed_results) == total_tasks:
-            scraping_active = False
-            logger.info("✅ All tasks finished")
+# With WORK_QUEUE_PATH set this process only coordinates; `worker` processes run the models
+if work_queue is None:
+    load_models()
+OPS_REFRESH_MS = 2000
 
 # ────────────────────────────────────────────────────────────────
 # Dash UI with login
@@ -535,10 +164,6 @@ app = dash.Dash(
 )
 server = app.server
 
-# Track retry attempts for each person
-retry_attempts = {}
-MAX_RETRIES = 2
-
 # ------------------------------------------------------------
 # 🧠 Dash Callbacks — Upload, Search, Stop, Restart, Download
 # ------------------------------------------------------------
@@ -652,6 +277,7 @@ login_layout = html.Div([
 # Define the main content layout (existing app layout content)
 main_layout = html.Div([
     dcc.Store(id='logout-trigger'),
+    dcc.Store(id='results-cursor'),
     dcc.Interval(id='refresh-interval', interval=1, n_intervals=0, max_intervals=1, disabled=True),
         # Header section with logo and title
         html.Div([
@@ -1062,6 +688,17 @@ main_layout = html.Div([
                         'maxWidth': '200px',
                         'margin': '0 auto'
                     }),
+                    # Shown while a manual lookup covers a batch that is still yours to watch or stop
+                    html.Button("↩️ Back to batch", id="back-to-batch-button", n_clicks=0, style={
+                        'display': 'none',
+                        'margin': '10px auto 0',
+                        'padding': '8px 18px',
+                        'borderRadius': '20px',
+                        'border': '1px solid #0a66c2',
+                        'backgroundColor': 'white',
+                        'color': '#0a66c2',
+                        'cursor': 'pointer',
+                    }),
                 ], style={
                     'marginBottom': '30px',
                     'padding': '0 20px',
@@ -1396,7 +1033,8 @@ main_layout = html.Div([
                     'color': '#666',
                     'fontSize': '14px'
                 }),
-                dcc.Interval(id="interval", interval=1000, n_intervals=0, disabled=False),
+                # Progress is pushed from /api/jobs/<id>/events only when results arrive
+                EventSource(id="progress-events", url=""),
             ], style={
                 'width': '100%',
                 'maxWidth': '850px',
@@ -1482,6 +1120,35 @@ main_layout = html.Div([
                 'maxWidth': '850px',
                 'margin': '30px auto'
             }),
+
+            # Live operations panel — collapsed by default, refreshed only while open
+            html.Div([
+                html.Button(html.Span([
+                    html.I(className='fas fa-chart-line', style={'marginRight': '10px'}),
+                    "Operations"
+                ]), id="ops-toggle", style={
+                    'fontSize': '18px',
+                    'fontWeight': '600',
+                    'color': '#0072B2',
+                    'backgroundColor': 'transparent',
+                    'border': 'none',
+                    'cursor': 'pointer'
+                }),
+                html.Div([
+                    dcc.Graph(id="ops-throughput", config={'displayModeBar': False},
+                              style={'height': '220px'}),
+                    html.Div(id="ops-panel"),
+                ], id="ops-body", style={'display': 'none', 'marginTop': '15px'}),
+                dcc.Interval(id="ops-interval", interval=OPS_REFRESH_MS, disabled=True),
+            ], style={
+                'backgroundColor': 'white',
+                'padding': '20px 30px',
+                'borderRadius': '25px',
+                'boxShadow': '0 15px 35px rgba(0, 0, 0, 0.1)',
+                'maxWidth': '850px',
+                'margin': '30px auto',
+                'textAlign': 'center'
+            }),
         ]),
         
         # Results anchor for smooth scrolling
@@ -1524,10 +1191,17 @@ main_layout = html.Div([
                     {"name": "Income (Estimated)", "id": "Income (Estimated)"},
                 ],
                 data=[],
-                page_action='native',
+                # Paging, sorting and filtering run against the job's ResultStore;
+                # only the visible page is sent to the browser
+                page_action='custom',
+                page_current=0,
                 page_size=10,
-                sort_action='native',
-                filter_action='native',
+                page_count=0,
+                sort_action='custom',
+                sort_mode='single',
+                sort_by=[],
+                filter_action='custom',
+                filter_query='',
                 style_table={'overflowX': 'auto'},
                 style_header={
                     'backgroundColor': '#0072B2',
@@ -1558,11 +1232,18 @@ main_layout = html.Div([
                         'if': {'column_id': 'Status', 'filter_query': '{Status} contains "❌"'},
                         'color': '#D55E00',
                         'fontWeight': 'bold'
+                    },
+                    {
+                        'if': {'column_id': 'Status', 'filter_query': '{Status} contains "⏱️"'},
+                        'color': '#E69F00',
+                        'fontWeight': 'bold'
                     }
                 ],
                 markdown_options={"html": True}
             ),
-            dcc.Download(id="download-dataframe-csv")
+
+            # Other candidates for the clicked row (filled by show_alternatives)
+            html.Div(id='alternatives-panel', style={'marginTop': '20px'})
         ], style={
             'marginTop': '40px',
             'padding': '35px',
@@ -1987,18 +1668,17 @@ ctx = dash.callback_context
     Input("upload-data", "contents"),
     State("upload-data", "filename")
 )
+@metrics.timer("ui_callback_seconds", callback="parse_upload")
 def parse_upload(contents, filename):
-    global uploaded_people
     if not contents or not filename:
         return ""
     content_type, content_string = contents.split(',')
     decoded = base64.b64decode(content_string)
-    encoding = chardet.detect(decoded)['encoding']
     try:
-        df = pd.read_csv(io.StringIO(decoded.decode(encoding)))
-        uploaded_people = df.to_dict(orient='records')
-        logger.info(f"📥 Uploaded {filename} with {len(uploaded_people)} rows.")
-        return f"✅ Uploaded {filename} with {len(uploaded_people)} row(s)."
+        user = dashboard_user()
+        people = uploaded_people[user] = read_people_csv(decoded)
+        logger.info(f"📥 {user} uploaded {filename} with {len(people)} rows.")
+        return f"✅ Uploaded {filename} with {len(people)} row(s)."
     except Exception as e:
         err = f"❌ Upload failed: {e}"
         logger.error(err)
@@ -2006,14 +1686,15 @@ def parse_upload(contents, filename):
 
 @app.callback(
     Output("results-table", "data", allow_duplicate=True),
+    Output("results-cursor", "data", allow_duplicate=True),
     Output("progress-bar", "style", allow_duplicate=True),
     Output("progress-bar", "children", allow_duplicate=True),
     Output("search-status", "children", allow_duplicate=True),
     Output("eta-stats", "children", allow_duplicate=True),
-    Output("interval", "disabled", allow_duplicate=True),
+    Output("progress-events", "url", allow_duplicate=True),
     Output("manual-mode-label", "style", allow_duplicate=True),
+    Output("back-to-batch-button", "style", allow_duplicate=True),
     Input("search-button", "n_clicks"),
-    Input("interval", "n_intervals"),
     State("first-name", "value"),
     State("last-name", "value"),
     State("university", "value"),
@@ -2024,116 +1705,167 @@ def parse_upload(contents, filename):
     State("serpapi-key-store", "data"),
     prevent_initial_call=True
 )
-def update_table(search_clicks, interval, fname, lname, university, grad_year, cosine_val, fuzzy_val, name_limit, serpapi_data):
-    global scraping_active, completed_results, total_tasks, start_scrape_time, final_table_ready, finalized_table_data
+@metrics.timer("ui_callback_seconds", callback="update_table")
+def update_table(search_clicks, fname, lname, university, grad_year, cosine_val, fuzzy_val, name_limit, serpapi_data):
+    """Start a search; progress then arrives on the job's event stream and renders client-side.
 
-    ctx = dash.callback_context
-    triggered = ctx.triggered_id
-    
+    A manual lookup runs beside the user's batch rather than replacing it; starting
+    a batch or a lookup only stops that user's previous one of the same kind.
+    """
     serpapi_key = None
     if serpapi_data and "api_key" in serpapi_data:
         serpapi_key = serpapi_data["api_key"]
         logger.info("Using SerpAPI key from advanced settings")
 
-    if triggered == "search-button":
-        final_table_ready = False
-        finalized_table_data = []
+    owner = dashboard_user()
+    manual_mode_style = {"display": "none"}
+    priority = Priority.BATCH
+    kind = "batch"
 
-        manual_mode_style = {"display": "none"}
+    if fname and lname and university:
+        person = {
+            "First Name": fname,
+            "Last Name": lname,
+            "University": university
+        }
+        if grad_year:
+            person["Graduation Year"] = grad_year
+        people = [person]
+        total = 1
+        manual_mode_style = {"display": "block"}  # 👈 Enable the label if manually entered
+        priority = Priority.INTERACTIVE  # jumps any batch queued on the shared executor
+        kind = "manual"
+
+    elif owner in uploaded_people and len(uploaded_people[owner]):
+        people = iter_people(uploaded_people[owner])
+        total = len(uploaded_people[owner])
+    else:
+        return (no_update, no_update, no_update, no_update, "⚠️ No data provided.", no_update, no_update,
+                {"display": "none"}, no_update)
 
-        if fname and lname and university:
-            person = {
-                "First Name": fname,
-                "Last Name": lname,
-                "University": university
-            }
-            if grad_year:
-                person["Graduation Year"] = grad_year
-            people = [person]
-            manual_mode_style = {"display": "block"}  # 👈 Enable the label if manually entered
+    if name_limit and isinstance(name_limit, int) and name_limit > 0:
+        people = itertools.islice(people, name_limit)
+        total = min(total, name_limit)
 
-        elif uploaded_people:
-            people = uploaded_people
-        else:
-            return no_update, no_update, no_update, "⚠️ No data provided.", no_update, True, {"display": "none"}
-
-        if name_limit and isinstance(name_limit, int) and name_limit > 0:
-            people = people[:name_limit]
-
-        start_scrape_time = time.time()
-        enqueue_tasks(people, cosine_val, fuzzy_val, serpapi_key)
-        return [], {"width": "0%"}, "0%", "🔎 Searching...", "ETA calculating...", False, manual_mode_style
-
-    elif triggered == "interval" and scraping_active:
-        percent = int((len(completed_results) / total_tasks) * 100)
-        elapsed = time.time() - start_scrape_time
-        speed = len(completed_results) / elapsed if elapsed > 0 else 0
-        remaining = total_tasks - len(completed_results)
-        eta = remaining / speed if speed > 0 else 0
-
-        results = completed_results.copy()
-        for i, r in enumerate(results):
-            r["No."] = i + 1
-            r.setdefault("Income (Estimated)", "Unknown")
-            r.setdefault("Graduation Year", "N/A")
-            r.setdefault("Location (Estimated)", "Unknown")
-            r.setdefault("LinkedIn URL", "")
-            r.setdefault("Score", "N/A")
-
-        if last_result_time and time.time() - last_result_time > 30:
-            logger.warning("⏳ No progress for 30+ seconds — recommend restarting.")
-            return (
-                results,
-                {"width": f"{percent}%", "height": "30px", "backgroundColor": "#ffc107",
-                 "color": "#000", "textAlign": "center", "lineHeight": "30px",
-                 'borderRadius': '10px', 'transition': 'width 0.5s ease-in-out', 'fontWeight': '600'},
-                f"{percent}%",
-                "⚠️ No progress detected. Please consider pressing Restart.",
-                f"⏱ ETA: stalled | Speed: {speed:.2f}/sec",
-                False,
-                {"display": "none"}
-            )
-
-        return (
-            results,
-            {"width": f"{percent}%", "height": "30px", "backgroundColor": "#0a66c2",
-             "color": "white", "textAlign": "center", "lineHeight": "30px",
-             'borderRadius': '10px', 'transition': 'width 0.5s ease-in-out', 'fontWeight': '600'},
-            f"{percent}%",
-            "⏳ Running...",
-            f"⏱ ETA: {int(eta)}s | Speed: {speed:.2f}/sec",
-            False,
-            {"display": "none"}
-        )
-
-    elif not scraping_active and completed_results:
-
-        if not final_table_ready:
-            logger.info("📊 Finalizing income data before displaying table...")
-            finalized_table_data = finalize_income_estimates(completed_results.copy())
-            for i, r in enumerate(finalized_table_data):
-                r["No."] = i + 1
-                r.setdefault("Location (Estimated)", "Unknown")
-                r.setdefault("LinkedIn URL", "")
-                r.setdefault("Score", "N/A")
-                r.setdefault("Status", "❌ No Match")
-            final_table_ready = True
-
-        return finalized_table_data, {
-            "width": "100%", "height": "30px", "backgroundColor": "#0a66c2",
-            "color": "white", "textAlign": "center", "lineHeight": "30px",
-            'borderRadius': '10px', 'transition': 'width 0.5s ease-in-out', 'fontWeight': '600'
-        }, "100%", "✅ Search complete.", "Done.", True, {"display": "none"}
-
-    return no_update, no_update, no_update, no_update, no_update, no_update, {"display": "none"}
+    stop_dashboard_job(owner, kind)
+    job = dashboard_jobs[owner, kind] = new_search_job(people, total=total, cosine_threshold=cosine_val,
+                                                       fuzzy_threshold=fuzzy_val, serpapi_key=serpapi_key,
+                                                       owner=owner, priority=priority)
+    job_registry.add(job).start()
+    back_style = {"display": "block", "margin": "10px auto 0"} if (owner, "batch") in dashboard_jobs and kind == "manual" \
+        else {"display": "none"}
+    return ([], {"job": job.id, "seq": 0, "final": False}, {"width": "0%"}, "0%", "🔎 Searching...",
+            "ETA calculating...", f"/api/jobs/{job.id}/events", manual_mode_style, back_style)
+
+
+@app.callback(
+    Output("results-table", "data", allow_duplicate=True),
+    Output("results-cursor", "data", allow_duplicate=True),
+    Output("search-status", "children", allow_duplicate=True),
+    Output("progress-events", "url", allow_duplicate=True),
+    Output("manual-mode-label", "style", allow_duplicate=True),
+    Output("back-to-batch-button", "style", allow_duplicate=True),
+    Input("back-to-batch-button", "n_clicks"),
+    prevent_initial_call=True
+)
+@metrics.timer("ui_callback_seconds", callback="back_to_batch")
+def back_to_batch(n_clicks):
+    """Point the tab back at the user's batch; its event stream replays progress from the current state."""
+    job = dashboard_jobs.get((dashboard_user(), "batch"))
+    if not n_clicks or job is None:
+        return no_update, no_update, no_update, no_update, no_update, {"display": "none"}
+    return ([], {"job": job.id, "seq": 0, "final": False}, "🔎 Back to your batch...",
+            f"/api/jobs/{job.id}/events", {"display": "none"}, {"display": "none"})
+
+
+# Progress events carry raw numbers (SearchJob.snapshot). The browser renders the bar,
+# status and ETA and advances the results cursor without a server round trip; only a
+# moved cursor calls back to the server, to fetch the visible results page.
+app.clientside_callback(
+    """
+    function(message, cursor) {
+        const nu = window.dash_clientside.no_update;
+        if (!message) {
+            return [nu, nu, nu, nu, nu, nu];
+        }
+        const p = JSON.parse(message);
+        if (!cursor || cursor.job !== p.id) {
+            return [nu, nu, nu, nu, nu, nu];  // event from a job this tab no longer shows
+        }
+        const running = p.status === "running";
+        const percent = p.total ? Math.floor(p.completed / p.total * 100) : 100;
+        const width = (running || p.status === "stopped") ? percent : 100;
+        const style = {
+            width: width + "%", height: "30px",
+            backgroundColor: p.stalled ? "#ffc107" : "#0a66c2", color: p.stalled ? "#000" : "white",
+            textAlign: "center", lineHeight: "30px", borderRadius: "10px",
+            transition: "width 0.5s ease-in-out", fontWeight: "600"
+        };
+        const speed = "Speed: " + p.rate_per_sec.toFixed(2) + "/sec";
+        let status, eta;
+        if (running && p.stalled) {
+            status = "⚠️ No progress detected. Please consider pressing Restart.";
+            eta = "⏱ ETA: stalled | " + speed;
+        } else if (running) {
+            status = "⏳ Running...";
+            eta = "⏱ ETA: " + p.eta_seconds + "s | " + speed;
+        } else {
+            status = p.status === "stopped" ? "🛑 Search stopped." : "✅ Search complete.";
+            eta = "Done.";
+        }
+        const unchanged = cursor.seq === p.seq && cursor.final === !running;
+        const newCursor = unchanged ? nu : {job: p.id, seq: p.seq, final: !running};
+        // Clearing the url closes the event stream once the job has ended
+        return [style, width + "%", status, eta, newCursor, running ? nu : ""];
+    }
+    """,
+    Output("progress-bar", "style", allow_duplicate=True),
+    Output("progress-bar", "children", allow_duplicate=True),
+    Output("search-status", "children", allow_duplicate=True),
+    Output("eta-stats", "children", allow_duplicate=True),
+    Output("results-cursor", "data", allow_duplicate=True),
+    Output("progress-events", "url", allow_duplicate=True),
+    Input("progress-events", "message"),
+    State("results-cursor", "data"),
+    prevent_initial_call=True
+)
+
+
+@app.callback(
+    Output("results-table", "data", allow_duplicate=True),
+    Output("results-table", "page_count"),
+    Input("results-table", "page_current"),
+    Input("results-table", "page_size"),
+    Input("results-table", "sort_by"),
+    Input("results-table", "filter_query"),
+    Input("results-cursor", "data"),
+    prevent_initial_call=True
+)
+@metrics.timer("ui_callback_seconds", callback="render_results_page")
+def render_results_page(page_current, page_size, sort_by, filter_query, cursor):
+    job = cursor_job(cursor)
+    if job is None:
+        return [], 0
+    if cursor.get("final"):
+        job.finalize_incomes()
+    page_size = page_size or 10
+    rows, matching = job.results.query(filter_query, sort_by, offset=(page_current or 0) * page_size,
+                                       limit=page_size)
+    page_count = max(1, -(-matching // page_size))
+    if not rows and matching:
+        # A narrower filter left the current page past the end — show the last one
+        rows, matching = job.results.query(filter_query, sort_by, offset=(page_count - 1) * page_size,
+                                           limit=page_size)
+    return [display_row(r) for r in rows], page_count
 
 
 @app.callback(
     [Output("results-table", "data", allow_duplicate=True),
+     Output("results-cursor", "data", allow_duplicate=True),
      Output("progress-bar", "style", allow_duplicate=True),
      Output("progress-bar", "children", allow_duplicate=True),
      Output("search-status", "children", allow_duplicate=True),
-     Output("interval", "disabled", allow_duplicate=True),
+     Output("progress-events", "url", allow_duplicate=True),
      Output("first-name", "value", allow_duplicate=True),
      Output("last-name", "value", allow_duplicate=True),
      Output("university", "value", allow_duplicate=True),
@@ -2141,44 +1873,47 @@ def update_table(search_clicks, interval, fname, lname, university, grad_year, c
      Output("cosine-threshold", "value", allow_duplicate=True),
      Output("fuzzy-threshold", "value", allow_duplicate=True),
      Output("name-limit", "value", allow_duplicate=True),
-     Output("serpapi-key-store", "data", allow_duplicate=True)],
+     Output("serpapi-key-store", "data", allow_duplicate=True),
+     Output("back-to-batch-button", "style", allow_duplicate=True)],
     Input("stop-button", "n_clicks"),
     Input("restart-button", "n_clicks"),
     State("stop-button", "data-confirmed"),
     State("restart-button", "data-confirmed"),
     prevent_initial_call=True
 )
+@metrics.timer("ui_callback_seconds", callback="handle_stop_restart")
 def handle_stop_restart(stop_clicks, restart_clicks, stop_confirmed, restart_confirmed):
-    global scraping_active, completed_results, total_tasks, pending_tasks
-
     triggered_id = ctx.triggered_id
+    user = dashboard_user()
 
     if triggered_id == "stop-button" and stop_confirmed:
-        scraping_active = False
         logger.info("🛑 Search manually stopped.")
 
-        # ❌ Cancel any queued (not yet running) tasks
-        for task in pending_tasks:
-            if not task.done():
-                task.cancel()
+        # ❌ Stop the user's batch and any manual lookup, whichever one this tab shows:
+        # stop feeding the window and cancel any queued (not yet running) tasks
+        for kind in ("batch", "manual"):
+            job = dashboard_jobs.get((user, kind))
+            if job:
+                job.stop()
 
-        # We need to return default values for all outputs, but only change the search status for stop
-        return (no_update, no_update, no_update, "🛑 Search stopped.", True, 
+        # We need to return default values for all outputs, but only change the search status for stop;
+        # the event stream delivers the job's final state and then closes
+        return (no_update, no_update, no_update, no_update, "🛑 Search stopped.", no_update, 
                 no_update, no_update, no_update, no_update,
-                no_update, no_update, no_update, no_update)
+                no_update, no_update, no_update, no_update, no_update)
 
     elif triggered_id == "restart-button" and restart_confirmed:
-        completed_results.clear()
-        total_tasks = 0
-        pending_tasks.clear()
+        stop_dashboard_job(user, "batch")
+        stop_dashboard_job(user, "manual")
         logger.info("🔁 Search restarted and settings reset to defaults.")
 
         # Return default values for all fields including advanced settings
         return ([], 
+                None, # results cursor
                 {"width": "0%"}, 
                 "0%", 
                 "🔁 Ready for new search.", 
-                True, 
+                "", # close the progress event stream
                 "", # first name
                 "", # last name
                 "", # university
@@ -2186,45 +1921,244 @@ def handle_stop_restart(stop_clicks, restart_clicks, stop_confirmed, restart_con
                 0.4, # default cosine threshold
                 0.75, # default fuzzy threshold
                 None, # default name limit
-                {}) # clear serpapi key
+                {}, # clear serpapi key
+                {"display": "none"}) # no batch to go back to
 
-    return (no_update, no_update, no_update, no_update, no_update, 
+    return (no_update, no_update, no_update, no_update, no_update, no_update, 
             no_update, no_update, no_update, no_update,
-            no_update, no_update, no_update, no_update)
+            no_update, no_update, no_update, no_update, no_update)
 
 
+# Moving a threshold slider re-ranks the shown job from its kept candidates
+# (SearchJob.rescore) instead of searching again; the bumped cursor refreshes the page
 @app.callback(
-    Output("download-dataframe-csv", "data"),
-    Input("download-button", "n_clicks"),
+    Output("results-cursor", "data", allow_duplicate=True),
+    Output("search-status", "children", allow_duplicate=True),
+    Input("cosine-threshold", "value"),
+    Input("fuzzy-threshold", "value"),
+    State("results-cursor", "data"),
+    prevent_initial_call=True
+)
+@metrics.timer("ui_callback_seconds", callback="rescore_results")
+def rescore_results(cosine_val, fuzzy_val, cursor):
+    job = cursor_job(cursor)
+    if job is None or job.thresholds == (cosine_val, fuzzy_val):
+        return no_update, no_update
+    changed = job.rescore(cosine_val, fuzzy_val)
+    return (dict(cursor, rescored=cursor.get("rescored", 0) + 1),
+            f"🎚️ Re-ranked at cosine {cosine_val:.2f} / fuzzy {fuzzy_val:.2f} — {changed} row(s) changed.")
+
+
+ALTERNATIVES_SHOWN = 3
+
+
+@app.callback(
+    Output("alternatives-panel", "children"),
+    Input("results-table", "active_cell"),
+    State("results-table", "data"),
+    State("results-cursor", "data"),
     prevent_initial_call=True
 )
-def download_csv(n):
-    if not completed_results:
-        return no_update
-    df = pd.DataFrame(completed_results)
-    return dcc.send_data_frame(df.to_csv, "linkedin_results.csv", index=False)
+@metrics.timer("ui_callback_seconds", callback="show_alternatives")
+def show_alternatives(active_cell, rows, cursor):
+    job = cursor_job(cursor)
+    if job is None or not active_cell or not rows or active_cell["row"] >= len(rows):
+        return []
+    row = rows[active_cell["row"]]
+    alternatives = job.alternatives(row["No."], k=ALTERNATIVES_SHOWN)
+    heading = f"Other candidates for {row['First Name']} {row['Last Name']}"
+    if not alternatives:
+        return html.Div(f"{heading}: none", style={'color': '#666', 'fontSize': '14px'})
+    return html.Div([
+        html.H4(heading, style={'fontSize': '15px', 'color': '#333'}),
+        html.Table([
+            html.Thead(html.Tr([html.Th(h) for h in ("LinkedIn Title", "Profile", "Score", "Location", "")])),
+            html.Tbody([html.Tr([
+                html.Td(alt["title"]),
+                html.Td(html.A("Open Profile", href=alt["url"], target="_blank")),
+                html.Td(f"{int(alt['score'] * 100)}%"),
+                html.Td(alt["location"]),
+                html.Td("" if alt["passes"] else "below thresholds", style={'color': '#999'}),
+            ]) for alt in alternatives]),
+        ], style={'fontSize': '14px', 'borderSpacing': '16px 4px'}),
+    ])
+
+
+# ────────────────────────────────────────────────────────────────
+# Live operations panel (ops_monitor snapshot, all jobs on this server)
+# ────────────────────────────────────────────────────────────────
+
+OPS_STAGE_LABELS = {
+    "waiting": "Not started",
+    "queued_for_worker": "Waiting for a worker",
+    "serpapi_request": "SerpAPI request",
+    "driver_create": "Chrome start",
+    "bing_wait": "Waiting for a Bing slot",
+    "page_load": "Bing page load",
+    "extraction": "Bing extraction",
+    "inference_wait": "Waiting for a model slot",
+    "encode": "Embedding",
+    "ner": "NER",
+}
+
+
+def _ops_tile(label, value, warn=False):
+    return html.Div([
+        html.Div(value, style={'fontSize': '20px', 'fontWeight': '600',
+                               'color': '#D55E00' if warn else '#0072B2'}),
+        html.Div(label, style={'fontSize': '12px', 'color': '#666'}),
+    ], style={'padding': '10px 14px', 'minWidth': '110px', 'borderRadius': '12px',
+              'backgroundColor': '#f5f7fa'})
+
+
+def _ops_row(children):
+    return html.Div(children, style={'display': 'flex', 'flexWrap': 'wrap', 'gap': '10px',
+                                     'justifyContent': 'center', 'marginBottom': '15px'})
+
+
+def render_ops(ops):
+    """Dash components for one ``OpsMonitor.snapshot()``."""
+    sources = ops["sources"]
+    searched = sum(sources.values())
+
+    def share(n):
+        return f"{n} ({n / searched:.0%})" if searched else "0"
+
+    quota = ops["serpapi_quota_left"]
+    tiles = _ops_row([
+        _ops_tile("Results/sec (last minute)", f"{ops['recent_rate_per_sec']:.2f}",
+                  warn=any(w.startswith("Throughput") for w in ops["warnings"])),
+        _ops_tile("Workers busy", f"{ops['workers']['busy']} / {ops['workers']['size']}"),
+        _ops_tile("Chrome drivers", ops["drivers"]),
+        _ops_tile("SerpAPI", share(sources["serpapi"])),
+        _ops_tile("Bing", share(sources["bing"])),
+        _ops_tile("Cache hits", share(sources["index"])),
+        _ops_tile("SerpAPI quota left", "—" if quota is None else quota,
+                  warn=quota is not None and quota < ops["queue_depth"]["waiting"]),
+        _ops_tile("Errors", f"{ops['error_rate']:.0%}", warn=ops["error_rate"] >= OPS_ERROR_RATE_WARN),
+        _ops_tile("Timeouts", f"{ops['timeout_rate']:.0%}", warn=ops["timeout_rate"] >= OPS_TIMEOUT_RATE_WARN),
+    ])
+    stages = _ops_row([_ops_tile(OPS_STAGE_LABELS.get(stage, stage), count)
+                       for stage, count in ops["queue_depth"].items()])
+    slowest = html.Table([
+        html.Thead(html.Tr([html.Th(h) for h in ("Person", "Running", "Requeues", "Engine")])),
+        html.Tbody([html.Tr([
+            html.Td(t["name"]), html.Td(f"{t['seconds']:.0f}s"), html.Td(t["requeues"]),
+            html.Td("Bing (Chrome)" if t["chrome"] else "SerpAPI"),
+        ]) for t in ops["slowest"]] or [html.Tr(html.Td("Nothing in flight", colSpan=4))]),
+    ], style={'margin': '0 auto', 'fontSize': '14px', 'borderSpacing': '16px 4px'})
+
+    def cap(used, limit):
+        return f"{used}" if limit is None else f"{used} / {limit}"
+
+    users = html.Table([
+        html.Thead(html.Tr([html.Th(h) for h in ("User", "Weight", "Running", "Remaining", "Results/sec",
+                                                 "Results", "SerpAPI today")])),
+        html.Tbody([html.Tr([
+            html.Td(u["user"]), html.Td(f"{u['weight']:g}"), html.Td(cap(u["running"], u["max_concurrency"])),
+            html.Td(u["remaining"]), html.Td(f"{u['rate_per_sec']:.2f}"), html.Td(u["results"]),
+            html.Td(cap(u["serpapi_today"], u["serpapi_daily_limit"])),
+        ]) for u in ops["users"]] or [html.Tr(html.Td("No searches yet", colSpan=7))]),
+    ], style={'margin': '0 auto', 'fontSize': '14px', 'borderSpacing': '16px 4px'})
+    return [
+        html.Div([html.Div(f"⚠️ {w}") for w in ops["warnings"]],
+                 style={'color': '#D55E00', 'fontWeight': '500', 'marginBottom': '10px'}),
+        tiles,
+        html.H4("Queue depth by stage", style={'fontSize': '15px', 'color': '#333'}),
+        stages,
+        html.H4("Slowest in flight", style={'fontSize': '15px', 'color': '#333'}),
+        slowest,
+        html.H4("Fair share by user", style={'fontSize': '15px', 'color': '#333'}),
+        users,
+    ]
+
+
+def throughput_figure(points):
+    return {
+        "data": [{
+            "x": [time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t)) for t, _ in points],
+            "y": [rate for _, rate in points],
+            "type": "scatter", "mode": "lines", "line": {"color": "#0072B2"},
+            "fill": "tozeroy", "name": "results/sec",
+        }],
+        "layout": {
+            "margin": {"l": 40, "r": 10, "t": 30, "b": 30},
+            "title": {"text": "Throughput (results/sec)", "font": {"size": 14}},
+            "yaxis": {"rangemode": "tozero"},
+        },
+    }
+
+
+app.clientside_callback(
+    """
+    function(n_clicks, style) {
+        const open = (n_clicks || 0) % 2 === 1;
+        return [Object.assign({}, style, {display: open ? 'block' : 'none'}), !open];
+    }
+    """,
+    Output("ops-body", "style"),
+    Output("ops-interval", "disabled"),
+    Input("ops-toggle", "n_clicks"),
+    State("ops-body", "style"),
+    prevent_initial_call=True
+)
+
 
-# Callback to open and close the advanced settings modal
 @app.callback(
+    Output("ops-throughput", "figure"),
+    Output("ops-panel", "children"),
+    Input("ops-interval", "n_intervals"),
+    Input("ops-toggle", "n_clicks"),
+    prevent_initial_call=True
+)
+@metrics.timer("ui_callback_seconds", callback="render_ops_panel")
+def render_ops_panel(n_intervals, toggle_clicks):
+    if not (toggle_clicks or 0) % 2:
+        return no_update, no_update  # panel closed
+    user = dashboard_user()
+    ops = ops_monitor.snapshot(owner=user)
+    if user not in ADMIN_USERS:
+        ops["users"] = [u for u in ops["users"] if u["user"] == user]  # only admins see everyone's share
+    return throughput_figure(ops["throughput"]), render_ops(ops)
+
+
+# Downloads stream from the export route, so the browser saves the file
+# as it is written instead of the server building it in memory first
+app.clientside_callback(
+    """
+    function(n_clicks, cursor) {
+        if (n_clicks && cursor && cursor.job) {
+            window.location.href = "/api/jobs/" + cursor.job + "/export?format=csv";
+        }
+        return window.dash_clientside.no_update;
+    }
+    """,
+    Output("download-button", "data-exported"),
+    Input("download-button", "n_clicks"),
+    State("results-cursor", "data"),
+    prevent_initial_call=True
+)
+
+# Open and close the advanced settings modal in the browser
+app.clientside_callback(
+    """
+    function(open_clicks, close_clicks, current_style) {
+        const triggered = dash_clientside.callback_context.triggered.map(t => t.prop_id);
+        const new_style = Object.assign({}, current_style || {});
+        if (triggered.includes('advanced-settings-button.n_clicks')) {
+            new_style.display = 'flex';  // Show the modal
+        } else if (triggered.includes('close-advanced-settings.n_clicks')) {
+            new_style.display = 'none';  // Hide the modal
+        }
+        return new_style;
+    }
+    """,
     Output("advanced-settings-modal", "style"),
     [Input("advanced-settings-button", "n_clicks"),
      Input("close-advanced-settings", "n_clicks")],
     [State("advanced-settings-modal", "style")],
     prevent_initial_call=True
 )
-def toggle_advanced_settings_modal(open_clicks, close_clicks, current_style):
-    ctx = dash.callback_context
-    triggered_id = ctx.triggered_id
-    
-    # Create a copy of the current style to modify
-    new_style = dict(current_style) if current_style else dict()
-    
-    if triggered_id == "advanced-settings-button":
-        new_style["display"] = "flex"  # Show the modal
-    elif triggered_id == "close-advanced-settings":
-        new_style["display"] = "none"  # Hide the modal
-        
-    return new_style
 
 # Callback to save SerpAPI key when advanced settings are closed
 @app.callback(
@@ -2308,13 +2242,16 @@ def logout(n_clicks, confirmed):
         return True, "✅ Logged out. Please press F5 to refresh the page and return to login."
     return False, ""
 
-@app.callback(
-    Output('logout-warning', 'children'),
+app.clientside_callback(
+    """
+    function(n_clicks) {
+        return "Logout successful — please press F5 on your keyboard to fully return to the login screen.";
+    }
+    """,
+    Output('logout-warning', 'children', allow_duplicate=True),
     Input('logout-button', 'n_clicks'),
     prevent_initial_call=True
 )
-def show_logout_warning(n_clicks):
-    return "Logout successful — please press F5 on your keyboard to fully return to the login screen."
 
 # Welcome message callback
 @app.callback(
@@ -2326,27 +2263,332 @@ def update_welcome(data):
         return f"Welcome, {data['name']}"
     return ""
 
-# Callback to open and close the video tutorial modal
-@app.callback(
+# Open and close the video tutorial modal in the browser
+app.clientside_callback(
+    """
+    function(open_clicks, close_clicks, current_style) {
+        const triggered = dash_clientside.callback_context.triggered.map(t => t.prop_id);
+        const new_style = Object.assign({}, current_style || {});
+        if (triggered.includes('video-tutorial-button.n_clicks')) {
+            new_style.display = 'flex';  // Show the modal
+        } else if (triggered.includes('close-video-tutorial.n_clicks')) {
+            new_style.display = 'none';  // Hide the modal
+        }
+        return new_style;
+    }
+    """,
     Output("video-tutorial-modal", "style"),
     [Input("video-tutorial-button", "n_clicks"),
      Input("close-video-tutorial", "n_clicks")],
     [State("video-tutorial-modal", "style")],
     prevent_initial_call=True
 )
-def toggle_video_tutorial_modal(open_clicks, close_clicks, current_style):
-    ctx = dash.callback_context
-    triggered_id = ctx.triggered_id
-    
-    # Create a copy of the current style to modify
-    new_style = dict(current_style) if current_style else dict()
-    
-    if triggered_id == "video-tutorial-button":
-        new_style["display"] = "flex"  # Show the modal
-    elif triggered_id == "close-video-tutorial":
-        new_style["display"] = "none"  # Hide the modal
-        
-    return new_style
+
+# ────────────────────────────────────────────────────────────────
+# REST API — submit batches, poll status, page results, cancel
+# ────────────────────────────────────────────────────────────────
+
+API_MAX_PAGE = 5000
+API_SEARCH_SETTINGS = {"cosine_threshold": float, "fuzzy_threshold": float,
+                       "serpapi_key": str, "engine": str, "budget": float, "priority": str, "limit": int}
+_verified_api_credentials = set()  # (username, sha256(password)) already checked once
+
+
+def _api_error(message, status):
+    return flask.jsonify({"error": message}), status
+
+
+def api_auth_required(view):
+    """Accept a logged-in dashboard session or HTTP Basic credentials from VALID_USERS."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if current_user.is_authenticated:
+            flask.g.api_user = current_user.username
+            return view(*args, **kwargs)
+        auth = flask.request.authorization
+        if auth and auth.username in VALID_USERS and auth.password:
+            key = (auth.username, hashlib.sha256(auth.password.encode()).hexdigest())
+            # check_password_hash is deliberately slow; poll loops only pay for it once
+            if key in _verified_api_credentials or check_password_hash(VALID_USERS[auth.username][1], auth.password):
+                _verified_api_credentials.add(key)
+                flask.g.api_user = auth.username
+                return view(*args, **kwargs)
+        resp = flask.jsonify({"error": "authentication required"})
+        resp.status_code = 401
+        resp.headers["WWW-Authenticate"] = 'Basic realm="LinkedIn Profile Finder"'
+        return resp
+    return wrapper
+
+
+def _owned_job(job_id):
+    job = job_registry.get(job_id)
+    if job is None or job.owner != flask.g.api_user:
+        flask.abort(flask.make_response(_api_error("job not found", 404)))
+    return job
+
+
+@server.route("/api/jobs", methods=["POST"])
+@api_auth_required
+def api_submit_job():
+    """Start a batch from a multipart ``file`` (CSV) or a JSON body ``{"rows": [...]}``.
+
+    Search settings (``cosine_threshold``, ``fuzzy_threshold``, ``serpapi_key``,
+    ``engine``, ``limit``) come from form fields or JSON keys.
+    """
+    if "file" in flask.request.files:
+        try:
+            df = read_people_csv(flask.request.files["file"].read())
+        except Exception as e:
+            return _api_error(f"could not read CSV: {e}", 400)
+        options = flask.request.form
+        people, total = iter_people(df), len(df)
+    else:
+        body = flask.request.get_json(silent=True)
+        if not isinstance(body, dict) or not isinstance(body.get("rows"), list):
+            return _api_error('send a multipart "file" or JSON {"rows": [...]}', 400)
+        options = body
+        people, total = body["rows"], len(body["rows"])
+        for i, row in enumerate(people):
+            if not isinstance(row, dict) or not all(row.get(k) for k in ("First Name", "Last Name", "University")):
+                return _api_error(f"row {i} needs First Name, Last Name and University", 400)
+
+    settings = {}
+    for name, cast in API_SEARCH_SETTINGS.items():
+        if options.get(name) not in (None, ""):
+            try:
+                settings[name] = cast(options[name])
+            except (TypeError, ValueError):
+                return _api_error(f"invalid {name}", 400)
+    if settings.get("engine", "auto") not in ("auto", "serpapi", "bing"):
+        return _api_error("engine must be auto, serpapi or bing", 400)
+    if "priority" in settings:
+        try:
+            settings["priority"] = Priority[settings["priority"].upper()]
+        except KeyError:
+            return _api_error("priority must be interactive, batch or background", 400)
+    limit = settings.pop("limit", None)
+    if limit and limit > 0:
+        people, total = itertools.islice(people, limit), min(total, limit)
+    if not total:
+        return _api_error("no rows to search", 400)
+    # Interactive priority takes the workers held back for lookups; batches must not
+    if settings.get("priority") is Priority.INTERACTIVE and total > 1 and flask.g.api_user not in ADMIN_USERS:
+        return _api_error("interactive priority is for single-row lookups", 403)
+
+    job = new_search_job(people, total=total, owner=flask.g.api_user, **settings)
+    job_registry.add(job).start()
+    logger.info(f"🛰️ API job {job.id} submitted by {flask.g.api_user} with {total} row(s)")
+    return flask.jsonify(job.snapshot()), 202, {"Location": f"/api/jobs/{job.id}"}
+
+
+@server.route("/api/jobs", methods=["GET"])
+@api_auth_required
+def api_list_jobs():
+    return flask.jsonify({"jobs": [j.snapshot() for j in job_registry.list(owner=flask.g.api_user)]})
+
+
+@server.route("/api/jobs/<job_id>", methods=["GET"])
+@api_auth_required
+def api_job_status(job_id):
+    return flask.jsonify(_owned_job(job_id).snapshot())
+
+
+@server.route("/api/jobs/<job_id>/results", methods=["GET"])
+@api_auth_required
+def api_job_results(job_id):
+    """Page through results in completion order: ``?cursor=<next_cursor>&limit=500``."""
+    job = _owned_job(job_id)
+    try:
+        cursor = max(0, int(flask.request.args.get("cursor", 0)))
+        limit = min(API_MAX_PAGE, max(1, int(flask.request.args.get("limit", 500))))
+    except ValueError:
+        return _api_error("cursor and limit must be integers", 400)
+    if not job.active:
+        job.finalize_incomes()  # a running job's rows come without incomes, as in exports
+    rows = [export_row(r) for r in job.results[cursor:cursor + limit]]
+    next_cursor = cursor + len(rows)
+    return flask.jsonify({
+        "job": job.snapshot(),
+        "results": rows,
+        "next_cursor": next_cursor,
+        "complete": not job.active and next_cursor >= job.done_count,
+    })
+
+
+@server.route("/api/jobs/<job_id>/rescore", methods=["POST"])
+@api_auth_required
+def api_rescore_job(job_id):
+    """Re-rank a job from its kept candidates: JSON ``{"cosine_threshold": .., "fuzzy_threshold": ..}``."""
+    job = _owned_job(job_id)
+    body = flask.request.get_json(silent=True) or {}
+    try:
+        cosine_threshold = float(body.get("cosine_threshold", job.thresholds[0]))
+        fuzzy_threshold = float(body.get("fuzzy_threshold", job.thresholds[1]))
+    except (TypeError, ValueError):
+        return _api_error("cosine_threshold and fuzzy_threshold must be numbers", 400)
+    changed = job.rescore(cosine_threshold, fuzzy_threshold)
+    return flask.jsonify({"job": job.snapshot(), "changed": changed})
+
+
+@server.route("/api/jobs/<job_id>/results/<int:seq>/alternatives", methods=["GET"])
+@api_auth_required
+def api_result_alternatives(job_id, seq):
+    """The ``?k=3`` best other candidates kept for result number ``seq``."""
+    job = _owned_job(job_id)
+    try:
+        k = min(10, max(1, int(flask.request.args.get("k", 3))))
+    except ValueError:
+        return _api_error("k must be an integer", 400)
+    if not 1 <= seq <= len(job.results):
+        return _api_error("no such result", 404)
+    return flask.jsonify({"seq": seq, "alternatives": job.alternatives(seq, k=k)})
+
+
+@server.route("/api/jobs/<job_id>/export", methods=["GET"])
+@api_auth_required
+def api_export_job(job_id):
+    """Stream all results as ``?format=csv|csv.gz|jsonl|parquet``.
+
+    A running job exports the rows finished so far; ``X-Job-Complete`` says
+    whether the file holds the whole job.
+    """
+    job = _owned_job(job_id)
+    fmt = flask.request.args.get("format", "csv")
+    if fmt not in EXPORT_FORMATS:
+        return _api_error(f"format must be one of {', '.join(EXPORT_FORMATS)}", 400)
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    complete = not job.active
+    if complete:
+        job.finalize_incomes()
+    logger.info(f"📤 Exporting {len(job.results)} results of job {job.id} as {fmt}")
+    return flask.Response(iter_export_chunks(job.results, fmt), mimetype=mimetype, headers={
+        "Content-Disposition": f"attachment; filename=linkedin_results_{job.id}.{extension}",
+        "X-Job-Complete": "true" if complete else "false",
+    })
+
+
+@server.route("/api/jobs/<job_id>", methods=["DELETE"])
+@server.route("/api/jobs/<job_id>/cancel", methods=["POST"])
+@api_auth_required
+def api_cancel_job(job_id):
+    job = _owned_job(job_id)
+    job.stop()
+    logger.info(f"🛑 API job {job.id} cancelled by {flask.g.api_user}")
+    return flask.jsonify(job.snapshot())
+
+
+# Seconds between keep-alives (and stall checks) on an idle event stream,
+# and the shortest gap between two progress events — bursts are coalesced
+SSE_HEARTBEAT_SECONDS = 5
+SSE_MIN_INTERVAL = 0.5
+
+
+@server.route("/api/jobs/<job_id>/events", methods=["GET"])
+@api_auth_required
+def api_job_events(job_id):
+    """Server-Sent Events: one ``snapshot()`` whenever results arrive, then a final one.
+
+    Nothing is sent while a job is idle except a comment keep-alive, plus one
+    event when it turns stalled, so load follows result arrivals, not open tabs.
+    """
+    job = _owned_job(job_id)
+
+    def stream():
+        seq, stalled = None, None
+        while True:
+            changed = job.wait_for_change(seq, timeout=SSE_HEARTBEAT_SECONDS)
+            snapshot = job.snapshot()
+            if changed or snapshot["stalled"] != stalled:
+                if snapshot["stalled"] and stalled is False:
+                    logger.warning(f"⏳ Job {job.id}: no progress for {STALL_SECONDS}+ seconds — recommend restarting.")
+                seq, stalled = snapshot["seq"], snapshot["stalled"]
+                yield f"data: {json.dumps(snapshot)}\n\n"
+                if not job.active:
+                    return
+                time.sleep(SSE_MIN_INTERVAL)
+            else:
+                yield ": keep-alive\n\n"
+
+    return flask.Response(stream(), mimetype="text/event-stream",
+                          headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+
+# Work-queue routes for `worker --coordinator URL` processes on other machines
+
+def _queue_request(*fields):
+    if flask.g.api_user not in QUEUE_WORKER_USERS:
+        flask.abort(flask.make_response(_api_error("queue routes are for worker and admin logins", 403)))
+    if work_queue is None:
+        flask.abort(flask.make_response(_api_error("this server has no work queue (set WORK_QUEUE_PATH)", 404)))
+    body = flask.request.get_json(silent=True)
+    if not isinstance(body, dict) or not all(body.get(f) is not None for f in fields):
+        flask.abort(flask.make_response(_api_error(f"send JSON with {', '.join(fields)}", 400)))
+    return body
+
+
+@server.route("/api/queue/lease", methods=["POST"])
+@api_auth_required
+def api_queue_lease():
+    body = _queue_request("worker", "limit")
+    batch_limit = body.get("batch_limit")
+    tasks = work_queue.lease(str(body["worker"]), max(0, min(int(body["limit"]), 64)),
+                             None if batch_limit is None else int(batch_limit))
+    return flask.jsonify({"tasks": tasks, "lease_seconds": work_queue.lease_seconds})
+
+
+@server.route("/api/queue/heartbeat", methods=["POST"])
+@api_auth_required
+def api_queue_heartbeat():
+    body = _queue_request("worker", "tasks")
+    return flask.jsonify({"tasks": work_queue.heartbeat(str(body["worker"]), [int(t) for t in body["tasks"]])})
+
+
+@server.route("/api/queue/ack", methods=["POST"])
+@api_auth_required
+def api_queue_ack():
+    body = _queue_request("worker", "task", "attempt", "result")
+    try:
+        result = SearchResult.from_dict(body["result"])
+    except (TypeError, ValueError) as e:
+        return _api_error(f"invalid result: {e}", 400)
+    return flask.jsonify({"acked": work_queue.ack(str(body["worker"]), int(body["task"]), int(body["attempt"]),
+                                                  result)})
+
+
+@server.route("/api/queue/release", methods=["POST"])
+@api_auth_required
+def api_queue_release():
+    work_queue.release(str(_queue_request("worker")["worker"]))
+    return flask.jsonify({"released": True})
+
+
+def admin_required(view):
+    """``api_auth_required``, limited to ADMIN_USERS: the view reports on every user's searches."""
+    @api_auth_required
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if flask.g.api_user not in ADMIN_USERS:
+            return _api_error("admin login required", 403)
+        return view(*args, **kwargs)
+    return wrapper
+
+
+@server.route("/api/ops", methods=["GET"])
+@admin_required
+def api_ops():
+    """Live operations view; in-flight names are limited to the caller's own jobs."""
+    return flask.jsonify(ops_monitor.snapshot(owner=flask.g.api_user))
+
+
+@server.route("/metrics", methods=["GET"])
+@admin_required
+def prometheus_metrics():
+    """Prometheus scrape target: stage latencies, search counters, queue and memory gauges."""
+    return flask.Response(metrics.render(), mimetype="text/plain; version=0.0.4")
+
+
+WEB_SERVER_THREADS = 16
+
 
 def open_chrome_app_mode():
     time.sleep(2)  # Give server time to start
@@ -2359,5 +2601,7 @@ def open_chrome_app_mode():
         webbrowser.open_new("http://127.0.0.1:8050")  # fallback
 
 if __name__ == "__main__":
+    # `python LinkedinProfileFinder.py batch …` is dispatched at the top of this file
     threading.Thread(target=open_chrome_app_mode).start()
-    serve(app.server, host="127.0.0.1", port=8050)
+    # Each open dashboard tab holds one thread on its progress event stream
+    serve(app.server, host="127.0.0.1", port=8050, threads=WEB_SERVER_THREADS)
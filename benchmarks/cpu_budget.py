@@ -0,0 +1,159 @@
+"""Find the best CPU split between concurrent model callers and torch threads.
+
+Each candidate runs the real inference mix of a search — two MPNet encodings
+per recorded search result, then one NER pass for the person's chosen hit —
+from ``--workers`` threads, one recorded person per call,
+with ``inference_slots`` callers let through at once and ``intra_op_threads``
+torch threads per call. The unbudgeted default (every worker running every
+op on all cores) is measured too, for comparison.
+
+    python benchmarks/cpu_budget.py --workers 8 --calls 200
+
+The winner is printed as the ``INFERENCE_SLOTS`` / ``TORCH_INTRA_OP_THREADS``
+settings to export, and the full report lands in ``benchmarks/results/``.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import os
+import platform
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_search  # noqa: E402  (after the path tweak)
+from recorded import load_fixtures, queried_name  # noqa: E402
+from run_benchmarks import RESULTS_DIR, percentiles  # noqa: E402
+
+
+def workload():
+    """``(full name, [(title, snippet), ...])`` for every recorded SerpAPI search with results."""
+    items = []
+    for body in load_fixtures("serpapi", ".json").values():
+        data = json.loads(body)
+        name = queried_name(data.get("search_parameters", {}).get("q", ""))
+        hits = [(res.get("title", ""), res.get("snippet", "")) for res in data.get("organic_results", [])]
+        if hits:
+            items.append((name, hits))
+    return items
+
+
+def context_switches():
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_nvcsw + usage.ru_nivcsw
+
+
+def candidates(cores, workers):
+    """Budgeted splits with slots × threads ≤ cores, plus the unbudgeted default."""
+    powers = sorted({2 ** i for i in range(cores.bit_length())} | {cores})
+    splits = [(slots, threads) for slots, threads in itertools.product(powers, powers)
+              if slots <= workers and slots * threads <= cores]
+    return [(workers, cores, "default"), *((slots, threads, "budgeted") for slots, threads in splits)]
+
+
+def run_split(items, calls, workers, slots, threads):
+    profile_search.apply_cpu_budget(profile_search.CpuBudget(
+        profile_search.available_threads, slots, threads, profile_search.cpu_budget.inter_op_threads))
+    source = itertools.islice(itertools.cycle(items), calls)
+    lock = threading.Lock()
+    latencies = []
+
+    def worker():
+        while True:
+            with lock:
+                item = next(source, None)
+            if item is None:
+                return
+            name, hits = item
+            start = time.perf_counter()
+            for title, _ in hits:
+                profile_search.encode(name)
+                profile_search.encode(title)
+            title, snippet = hits[0]  # stands in for the chosen hit: NER runs once per person
+            profile_search.extract_ner_entities(f"{title}. {snippet}")
+            latencies.append(time.perf_counter() - start)  # list.append is atomic under the GIL
+
+    switches_before, cpu_before, wall_before = context_switches(), os.times(), time.perf_counter()
+    pool = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    wall = time.perf_counter() - wall_before
+    cpu_after, switches_after = os.times(), context_switches()
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    return {
+        "inference_slots": slots,
+        "intra_op_threads": threads,
+        "calls_per_sec": round(calls / wall, 2) if wall else None,
+        "elapsed_sec": round(wall, 3),
+        "cpu_cores_busy": round(cpu / wall, 2) if wall else None,
+        "context_switches": None if switches_before is None else switches_after - switches_before,
+        "latency": percentiles(latencies),
+    }
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="CPU budget planner benchmark")
+    parser.add_argument("--workers", type=int, default=profile_search.max_threads,
+                        help="concurrent search threads calling the models")
+    parser.add_argument("--calls", type=int, default=200, help="people searched per split")
+    parser.add_argument("--output", help="report path (default benchmarks/results/cpu-budget-<timestamp>.json)")
+    parser.add_argument("--log-level", default="WARNING", help="pipeline log level while benchmarking")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    profile_search.logger.setLevel(args.log_level)
+    items = workload()
+    cores = profile_search.available_threads
+    planned = profile_search.cpu_budget
+
+    run_split(items, min(len(items), 20), 1, 1, cores)  # warm-up: first calls allocate and page in weights
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "torch": profile_search.torch.__version__,
+        "platform": platform.platform(),
+        "cores": cores,
+        "workers": args.workers,
+        "calls": args.calls,
+        "planned": {"inference_slots": planned.inference_slots, "intra_op_threads": planned.intra_op_threads},
+        "runs": [],
+    }
+    try:
+        for slots, threads, kind in candidates(cores, args.workers):
+            run = dict(run_split(items, args.calls, args.workers, slots, threads), kind=kind)
+            report["runs"].append(run)
+            print(f"🧮 {kind:>8} {slots:>2} slot(s) × {threads:>2} thread(s): {run['calls_per_sec']:>7} calls/sec | "
+                  f"p95 {run['latency']['p95_ms']} ms | {run['cpu_cores_busy']} cores busy | "
+                  f"{run['context_switches']} context switches", file=sys.stderr)
+    finally:
+        profile_search.apply_cpu_budget(planned)
+
+    best = max(report["runs"], key=lambda r: r["calls_per_sec"] or 0)
+    report["best"] = best
+    output = args.output or os.path.join(RESULTS_DIR, f"cpu-budget-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"🏆 Best: INFERENCE_SLOTS={best['inference_slots']} TORCH_INTRA_OP_THREADS={best['intra_op_threads']} "
+          f"({best['calls_per_sec']} calls/sec)", file=sys.stderr)
+    print(f"📝 Report written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Recorded SerpAPI responses and Bing pages shared by the benchmark and the stand-in server."""
+
+import os
+import re
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def slug(name):
+    """Fixture file stem for a person: ``James O'Connor`` → ``james-oconnor``."""
+    return re.sub(r"[^a-z0-9]+", "-", name.lower().replace("'", "")).strip("-")
+
+
+def load_fixtures(folder, ext):
+    """``{stem: text}`` for every ``*ext`` file in ``fixtures/<folder>``."""
+    path = os.path.join(FIXTURES, folder)
+    fixtures = {}
+    for name in os.listdir(path):
+        if name.endswith(ext):
+            with open(os.path.join(path, name), encoding="utf-8") as fh:
+                fixtures[name[:-len(ext)]] = fh.read()
+    return fixtures
+
+
+def queried_name(query):
+    """The quoted full name at the start of a search query, or ''."""
+    match = re.search(r'"([^"]+)"', query or "")
+    return match.group(1) if match else ""
@@ -0,0 +1,305 @@
+"""Offline end-to-end benchmark for the search pipeline.
+
+Runs ``SearchJob`` → ``search_person`` → scoring, NER and income estimation
+against recorded SerpAPI responses and saved Bing pages, with no network, and
+writes one JSON report per invocation so runs can be compared over time.
+
+    python benchmarks/run_benchmarks.py --workers 1 4 8 --rows 100 1000 10000
+
+The ML models must already be in the local Hugging Face cache.
+"""
+
+import argparse
+import csv
+import html
+import itertools
+import json
+import logging
+import os
+import platform
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import profile_search  # noqa: E402  (after the path tweak)
+from recorded import FIXTURES, load_fixtures, queried_name, slug  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+# Pipeline functions timed per call; all are looked up through profile_search's
+# globals at call time, so wrapping them there catches every call
+STAGES = {
+    "search_person": "search_person",
+    "serpapi": "serpapi_search_linkedin_profile",
+    "scoring": "name_similarity",
+    "ner": "extract_ner_entities",
+    "income": "estimate_income",
+}
+
+
+# ────────────────────────────────────────────────────────────────
+# Recorded transports — SerpAPI over "requests", Bing through a fake WebDriver
+# ────────────────────────────────────────────────────────────────
+
+class RecordedSerpApi:
+    """Stands in for the ``requests`` module: ``get`` answers from the recorded JSON."""
+
+    def __init__(self):
+        self.responses = load_fixtures("serpapi", ".json")
+
+    def get(self, url, params=None, timeout=None):
+        body = self.responses.get(slug(queried_name(params["q"])), self.responses["_empty"])
+        return _Response(body)
+
+
+class _Response:
+    def __init__(self, body):
+        self._body = body
+
+    def json(self):
+        return json.loads(self._body)
+
+
+class _Element:
+    def __init__(self, text="", href=None, children=None):
+        self.text = text
+        self._href = href
+        self._children = children or {}
+
+    def get_attribute(self, name):
+        return self._href if name == "href" else None
+
+    def find_element(self, by, value):
+        return self._children[value]
+
+
+_RESULT = re.compile(r'<li class="b_algo">\s*<h2><a href="([^"]*)"[^>]*>(.*?)</a></h2>'
+                     r'\s*<div class="b_caption"><p>(.*?)</p></div>', re.S)
+
+
+def _text(fragment):
+    return html.unescape(re.sub(r"<[^>]+>", "", fragment)).strip()
+
+
+class _Process:
+    def poll(self):
+        return None  # still running
+
+
+class _Service:
+    process = _Process()
+
+
+class RecordedBingDriver:
+    """Just enough of a Chrome WebDriver to read the saved Bing result pages."""
+
+    pages = {}
+    service = _Service()  # a live "Chrome", so the watchdog leaves Bing searches alone
+
+    def __init__(self):
+        self._entries = []
+        self.title = ""
+        self.page_source = ""
+
+    @classmethod
+    def load(cls):
+        cls.pages = load_fixtures("bing", ".html")
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def get(self, url):
+        page = self.page_source = self.pages.get(slug(queried_name(url)), self.pages["_empty"])
+        self._entries = []
+        for href, title, snippet in _RESULT.findall(page):
+            link = _Element(_text(title), href=href)
+            self._entries.append(_Element(children={
+                "h2": _Element(_text(title)), "a": link, "b_caption": _Element(_text(snippet))}))
+
+    def find_elements(self, by, value):
+        return list(self._entries)
+
+    def quit(self):
+        pass
+
+# ────────────────────────────────────────────────────────────────
+# Measurement
+# ────────────────────────────────────────────────────────────────
+
+class StageTimer:
+    """Wraps the pipeline functions in ``profile_search`` and records per-call latency."""
+
+    def __init__(self):
+        self.samples = {stage: [] for stage in STAGES}
+        self._originals = {}
+
+    def install(self):
+        for stage, attr in STAGES.items():
+            original = self._originals[attr] = getattr(profile_search, attr)
+            setattr(profile_search, attr, self._timed(original, self.samples[stage]))
+
+    def uninstall(self):
+        for attr, original in self._originals.items():
+            setattr(profile_search, attr, original)
+
+    def reset(self):
+        for samples in self.samples.values():
+            samples.clear()
+
+    @staticmethod
+    def _timed(fn, samples):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - start)  # list.append is atomic under the GIL
+        return timed
+
+    def summary(self):
+        return {stage: percentiles(samples) for stage, samples in self.samples.items() if samples}
+
+
+def percentiles(samples):
+    ordered = sorted(samples)
+
+    def at(p):
+        return round(ordered[min(len(ordered) - 1, int(p / 100 * len(ordered)))] * 1000, 3)
+
+    return {"count": len(ordered), "p50_ms": at(50), "p95_ms": at(95), "p99_ms": at(99),
+            "total_ms": round(sum(ordered) * 1000, 1)}
+
+
+def current_rss_mb():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        # No /proc (macOS, Windows): fall back to the process-lifetime peak
+        if resource is None:
+            return 0.0
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval=0.05):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = current_rss_mb()
+        self._halt = threading.Event()
+
+    def run(self):
+        while not self._halt.wait(self.interval):
+            self.peak = max(self.peak, current_rss_mb())
+
+    def stop(self):
+        self._halt.set()
+        self.join()
+        return max(self.peak, current_rss_mb())
+
+# ────────────────────────────────────────────────────────────────
+# Runs
+# ────────────────────────────────────────────────────────────────
+
+def run_once(people, rows, workers, engine, timer):
+    source = itertools.islice(itertools.cycle(people), rows)
+    pool = ThreadPoolExecutor(max_workers=workers)
+    job = profile_search.SearchJob(
+        source, total=rows, engine=engine, serpapi_key="recorded", pool=pool,
+        window=profile_search.TASK_WINDOW_PER_WORKER * workers, index=None)
+
+    timer.reset()
+    rss = RssSampler()
+    rss.start()
+    cpu_before, wall_before = os.times(), time.perf_counter()
+    job.start()
+    job.wait()
+    # A watchdog kill sleeps in _recover and searches the person again, skewing every number below
+    assert not job.hung_tasks, f"watchdog killed {job.hung_tasks} search(es) during the run"
+    job.finalize_incomes()
+    wall = time.perf_counter() - wall_before
+    cpu_after = os.times()
+    peak_rss = rss.stop()
+    pool.shutdown()
+
+    cpu = (cpu_after.user - cpu_before.user) + (cpu_after.system - cpu_before.system)
+    statuses = dict(Counter(r.status.value for r in job.results))
+    return {
+        "workers": workers,
+        "rows": rows,
+        "elapsed_sec": round(wall, 3),
+        "people_per_sec": round(rows / wall, 2) if wall else None,
+        "cpu_seconds": round(cpu, 2),
+        "cpu_cores_busy": round(cpu / wall, 2) if wall else None,
+        "cpu_utilization_pct": round(100 * cpu / wall / (os.cpu_count() or 1), 1) if wall else None,
+        "peak_rss_mb": round(peak_rss, 1),
+        "statuses": statuses,
+        "stages": timer.summary(),
+    }
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Offline search pipeline benchmark")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--engine", choices=("auto", "serpapi", "bing"), default="auto")
+    parser.add_argument("--output", help="report path (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--log-level", default="WARNING", help="pipeline log level while benchmarking")
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    profile_search.logger.setLevel(args.log_level)
+    with open(os.path.join(FIXTURES, "people.csv"), encoding="utf-8", newline="") as fh:
+        people = list(csv.DictReader(fh))
+
+    profile_search.requests = RecordedSerpApi()
+    RecordedBingDriver.load()
+    profile_search.create_driver = RecordedBingDriver
+    profile_search.BING_SETTLE_SECONDS = (0, 0)
+    profile_search.bing_throttle = profile_search.BingThrottle(rate=0, jitter=0)  # time the pipeline, not the politeness
+    profile_search.load_models()  # keep model load time out of the first run
+    timer = StageTimer()
+    timer.install()
+
+    report = {
+        "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "engine": args.engine,
+        "runs": [],
+    }
+    try:
+        for rows, workers in itertools.product(args.rows, args.workers):
+            run = run_once(people, rows, workers, args.engine, timer)
+            report["runs"].append(run)
+            search = run["stages"].get("search_person", {})
+            print(f"⏱️ {rows:>6} rows × {workers:>2} workers: {run['people_per_sec']:>8} people/sec | "
+                  f"search p50 {search.get('p50_ms')} ms p99 {search.get('p99_ms')} ms | "
+                  f"CPU {run['cpu_utilization_pct']}% | peak RSS {run['peak_rss_mb']} MB", file=sys.stderr)
+    finally:
+        timer.uninstall()
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+    print(f"📝 Report written to {output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.getLogger().setLevel(logging.WARNING)
+    sys.exit(main())
@@ -0,0 +1,234 @@
+"""Local stand-in for SerpAPI and Bing, for load-testing the whole app offline.
+
+Serves ``/search`` shaped like ``https://serpapi.com/search`` (``organic_results``
+or an ``error`` payload) and ``/bing/search`` shaped like Bing's ``li.b_algo``
+result page, with configurable latency, failure, 429 and Bing captcha rates and
+a SerpAPI quota. People in ``fixtures/`` get their recorded responses; anyone else gets a
+deterministic synthetic result, so any CSV can be pushed through at scale.
+
+    python benchmarks/standin_server.py --port 8765 --serp-latency 800:0.5 --rate-limit-rate 0.02
+    SERPAPI_URL=http://127.0.0.1:8765/search BING_SEARCH_URL=http://127.0.0.1:8765/bing/search \\
+        SERPAPI_KEY=local python LinkedinProfileFinder.py batch people.csv results.csv
+
+``GET /account.json`` answers like SerpAPI's Account API (searches left on the
+quota) and ``GET /_stats`` returns request counters.
+"""
+
+import argparse
+import html
+import json
+import math
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from recorded import load_fixtures, queried_name, slug
+
+ROLES = [
+    ("Software Engineer", "Prudential Financial"), ("Data Analyst", "Verizon"),
+    ("Registered Nurse", "Hackensack Meridian Health"), ("Financial Analyst", "JPMorgan Chase & Co."),
+    ("Teacher", "Newark Public Schools"), ("Marketing Manager", "L'Oréal"),
+    ("Project Manager", "Turner Construction"), ("Accountant", "Deloitte"),
+    ("Product Manager", "ADP"), ("Sales Representative", "Johnson & Johnson"),
+]
+CITIES = ["Newark, New Jersey", "Jersey City, New Jersey", "Hoboken, New Jersey", "New York, New York",
+          "Edison, New Jersey", "Princeton, New Jersey", "Philadelphia, Pennsylvania", "Union, New Jersey"]
+
+QUOTA_EXHAUSTED = "Your account has run out of searches."
+RATE_LIMITED = "Your searches per hour limit has been reached. Please slow down."
+CAPTCHA_PAGE = ('<!DOCTYPE html><html lang="en"><head><title>Bing</title></head><body>'
+                '<div id="b_captcha"><h1>One last step</h1><p>Please solve the challenge below to continue. '
+                'Our systems have detected unusual traffic from your network.</p></div></body></html>')
+
+
+class Latency:
+    """Log-normal delay parsed from ``MEDIAN_MS[:SIGMA]`` (``0`` disables it)."""
+
+    def __init__(self, spec):
+        median, _, sigma = spec.partition(":")
+        self.median = float(median) / 1000
+        self.sigma = float(sigma or 0.5)
+
+    def sample(self, rng):
+        return self.median * math.exp(rng.gauss(0, self.sigma)) if self.median > 0 else 0.0
+
+
+class StandIn:
+    """Response generator plus shared counters; one per server."""
+
+    def __init__(self, args):
+        self.args = args
+        self.serp_latency = Latency(args.serp_latency)
+        self.bing_latency = Latency(args.bing_latency)
+        self.serp_fixtures = load_fixtures("serpapi", ".json")
+        self.bing_fixtures = load_fixtures("bing", ".html")
+        self.quota_left = args.quota
+        self.stats = {"serpapi": 0, "bing": 0, "errors": 0, "rate_limited": 0, "quota_exhausted": 0, "captcha": 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(args.seed)
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def roll(self):
+        """(latency rng, failure draw) — one shared, seeded stream for the whole run."""
+        with self._lock:
+            return random.Random(self._rng.random()), self._rng.random()
+
+    def take_quota(self):
+        with self._lock:
+            if self.quota_left is None:
+                return True
+            if self.quota_left <= 0:
+                return False
+            self.quota_left -= 1
+            return True
+
+    # ── synthetic results ──
+
+    def people_like(self, name, university):
+        """Deterministic per name: maybe a matching profile, plus decoys."""
+        rng = random.Random(zlib.crc32(name.encode("utf-8")) ^ self.args.seed)
+        results = []
+        if rng.random() < self.args.match_rate:
+            role, company = rng.choice(ROLES)
+            results.append({
+                "title": f"{name} - {role} - {company} | LinkedIn",
+                "link": f"https://www.linkedin.com/in/{slug(name)}-{rng.randrange(1000, 9999)}",
+                "snippet": f"{rng.choice(CITIES)} · {role} at {company} · {university} · "
+                           f"{rng.choice([120, 300, 500])}+ connections on LinkedIn.",
+            })
+        results.append({
+            "title": f"{university} Alumni | LinkedIn",
+            "link": f"https://www.linkedin.com/school/{slug(university)}/people/",
+            "snippet": f"Find alumni of {university} on LinkedIn.",
+        })
+        return results
+
+    def serpapi_body(self, query):
+        name = queried_name(query)
+        recorded = self.serp_fixtures.get(slug(name))
+        if recorded:
+            return recorded
+        university = queried_name(query[len(name) + 2:]) or "University"
+        results = [dict(r, position=i + 1) for i, r in enumerate(self.people_like(name, university))]
+        return json.dumps({"search_metadata": {"status": "Success"}, "organic_results": results})
+
+    def bing_page(self, query):
+        name = queried_name(query)
+        recorded = self.bing_fixtures.get(slug(name))
+        if recorded:
+            return recorded
+        university = queried_name(query[len(name) + 2:]) or "University"
+        items = "\n".join(
+            f'<li class="b_algo"><h2><a href="{html.escape(r["link"])}">{html.escape(r["title"])}</a></h2>\n'
+            f'<div class="b_caption"><p>{html.escape(r["snippet"])}</p></div></li>'
+            for r in self.people_like(name, university))
+        return ('<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Search</title></head>'
+                f'<body><div id="b_content"><ol id="b_results">\n{items}\n</ol></div></body></html>')
+
+
+class Handler(BaseHTTPRequestHandler):
+    standin = None  # set by serve()
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        if url.path == "/search":
+            self.serpapi(params)
+        elif url.path == "/bing/search":
+            self.bing(params)
+        elif url.path == "/account.json":
+            left = self.standin.quota_left
+            self.send(200, "application/json", json.dumps({
+                "total_searches_left": left, "plan_searches_left": left,
+                "this_month_usage": self.standin.stats["serpapi"]}))
+        elif url.path == "/_stats":
+            self.send(200, "application/json", json.dumps(dict(self.standin.stats, quota_left=self.standin.quota_left)))
+        else:
+            self.send(404, "application/json", json.dumps({"error": "not found"}))
+
+    def serpapi(self, params):
+        standin, args = self.standin, self.standin.args
+        standin.count("serpapi")
+        rng, draw = standin.roll()
+        time.sleep(standin.serp_latency.sample(rng))
+        if draw < args.error_rate:
+            standin.count("errors")
+            return self.send(500, "application/json", json.dumps({"error": "Internal server error."}))
+        if draw < args.error_rate + args.rate_limit_rate:
+            standin.count("rate_limited")
+            return self.send(429, "application/json", json.dumps({"error": RATE_LIMITED}))
+        if not standin.take_quota():  # only searches that would have succeeded count
+            standin.count("quota_exhausted")
+            return self.send(429, "application/json", json.dumps({"error": QUOTA_EXHAUSTED}))
+        self.send(200, "application/json", standin.serpapi_body(params.get("q", "")))
+
+    def bing(self, params):
+        standin, args = self.standin, self.standin.args
+        standin.count("bing")
+        rng, draw = standin.roll()
+        time.sleep(standin.bing_latency.sample(rng))
+        if draw < args.error_rate:
+            standin.count("errors")
+            return self.send(500, "text/html", "<html><body>Internal error</body></html>")
+        if draw < args.error_rate + args.rate_limit_rate:
+            standin.count("rate_limited")
+            return self.send(429, "text/html", "<html><body><h1>Too many requests</h1></body></html>")
+        if draw < args.error_rate + args.rate_limit_rate + args.captcha_rate:
+            standin.count("captcha")
+            return self.send(200, "text/html; charset=utf-8", CAPTCHA_PAGE)
+        self.send(200, "text/html; charset=utf-8", standin.bing_page(params.get("q", "")))
+
+    def send(self, status, content_type, body):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        if self.standin.args.verbose:
+            super().log_message(format, *args)
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Local SerpAPI/Bing stand-in for load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--serp-latency", default="800:0.5", help="SerpAPI delay, MEDIAN_MS[:SIGMA] log-normal")
+    parser.add_argument("--bing-latency", default="400:0.5", help="Bing page delay, MEDIAN_MS[:SIGMA] log-normal")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction answered with 429")
+    parser.add_argument("--captcha-rate", type=float, default=0.0, help="fraction of Bing pages replaced by a captcha")
+    parser.add_argument("--quota", type=int, default=None, help="SerpAPI searches allowed before 429s (default unlimited)")
+    parser.add_argument("--match-rate", type=float, default=0.7, help="share of unknown people given a profile")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true", help="log every request")
+    return parser
+
+
+def serve(args):
+    Handler.standin = StandIn(args)
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    server.daemon_threads = True
+    base = f"http://{args.host}:{server.server_port}"
+    print(f"🧪 Stand-in listening on {base}\n"
+          f"   SERPAPI_URL={base}/search BING_SEARCH_URL={base}/bing/search", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"📊 {json.dumps(Handler.standin.stats)}", flush=True)
+
+
+if __name__ == "__main__":
+    serve(build_arg_parser().parse_args())
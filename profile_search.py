@@ -0,0 +1,3467 @@
+"""Headless search pipeline for the LinkedIn Profile Finder.
+
+Everything needed to search, score and estimate incomes lives here so it can run
+without Dash, Flask or waitress — the dashboard in ``LinkedinProfileFinder.py``
+and the ``batch`` command line both drive the same ``SearchJob`` engine.
+
+    python LinkedinProfileFinder.py batch people.csv results.parquet --workers 16
+"""
+
+import argparse
+import atexit
+import bisect
+import csv
+import gzip
+import io
+import itertools
+import json
+import os
+import platform
+import queue
+import random
+import re
+import shutil
+import signal
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import traceback
+import unicodedata
+import uuid
+import zlib
+import logging
+import logging.handlers
+import multiprocessing
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields, replace
+from enum import Enum, IntEnum
+
+import chardet
+import numpy as np
+import pandas as pd
+import requests
+
+# ────────────────────────────────────────────────────────────────
+# Selenium & ML deps
+# ────────────────────────────────────────────────────────────────
+from selenium import webdriver
+from selenium.webdriver.common.by import By
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+import torch
+from sentence_transformers import SentenceTransformer
+from sentence_transformers.util import cos_sim
+from rapidfuzz import fuzz, process
+from transformers import pipeline
+
+# ────────────────────────────────────────────────────────────────
+# Globals & Thread‑Pool
+# ────────────────────────────────────────────────────────────────
+
+MAX_RETRIES = 2
+retry_attempts = {}
+
+logger = logging.getLogger("LinkedInScraper")
+
+# CPU_AFFINITY ("0-7,16-23") pins the process to those cores; CPU_CORES caps the
+# count further (e.g. a container whose CPU quota is below its visible cores)
+CPU_AFFINITY = os.getenv("CPU_AFFINITY")
+CPU_CORES = int(os.getenv("CPU_CORES", "0"))
+
+
+def parse_cpu_list(spec):
+    """``"0-3,8"`` → ``{0, 1, 2, 3, 8}`` (Linux cpuset syntax)."""
+    cpus = set()
+    for part in spec.split(","):
+        first, _, last = part.strip().partition("-")
+        if first:
+            cpus.update(range(int(first), int(last or first) + 1))
+    return cpus
+
+
+def usable_cores():
+    if CPU_AFFINITY and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, parse_cpu_list(CPU_AFFINITY))
+    if hasattr(os, "sched_getaffinity"):
+        cores = len(os.sched_getaffinity(0))
+    else:
+        cores = os.cpu_count() or multiprocessing.cpu_count()
+    return min(cores, CPU_CORES) if CPU_CORES > 0 else cores
+
+
+class Priority(IntEnum):
+    """Scheduling class of a job's searches; lower runs first."""
+
+    INTERACTIVE = 0  # manual-mode lookups: someone is watching the screen
+    BATCH = 1
+    BACKGROUND = 2
+
+
+# Workers only interactive searches may use, so a lookup never waits behind a batch
+INTERACTIVE_RESERVED_WORKERS = int(os.getenv("INTERACTIVE_RESERVED_WORKERS", "1"))
+
+# Per-user fair-share settings, as JSON (inline or a file path):
+#   {"arik": {"weight": 2}, "guest": {"max_concurrency": 2, "serpapi_daily_limit": 200}}
+# ``weight`` is the user's share of the workers relative to other busy users,
+# ``max_concurrency`` caps their searches running at once and
+# ``serpapi_daily_limit`` their SerpAPI calls per day (auto mode falls back to
+# Bing past it). Unlisted users get weight 1 and no caps.
+USER_SHARES = os.getenv("USER_SHARES", "")
+
+
+class UserShares:
+    """Fair-share weights and caps per user, plus each user's SerpAPI use today."""
+
+    DEFAULT = {"weight": 1.0, "max_concurrency": None, "serpapi_daily_limit": None}
+
+    def __init__(self, shares=None):
+        self._shares = {}
+        self._serpapi = {}  # user → (date, calls)
+        self._lock = threading.Lock()
+        self.update(shares or {})
+
+    @classmethod
+    def from_env(cls, spec=USER_SHARES):
+        if spec and os.path.isfile(spec):
+            with open(spec, encoding="utf-8") as fh:
+                spec = fh.read()
+        return cls(json.loads(spec) if spec.strip() else {})
+
+    def update(self, shares):
+        for user, share in shares.items():
+            unknown = set(share) - set(self.DEFAULT)
+            if unknown:
+                raise ValueError(f"Unknown share setting(s) for {user}: {', '.join(sorted(unknown))}")
+            if share.get("weight", 1) <= 0:
+                raise ValueError(f"Share weight for {user} must be positive")
+            with self._lock:
+                self._shares[user] = {**self.DEFAULT, **self._shares.get(user, {}), **share}
+
+    def __contains__(self, user):
+        return user in self._shares
+
+    def __iter__(self):
+        return iter(list(self._shares))
+
+    def get(self, user):
+        return self._shares.get(user, self.DEFAULT)
+
+    def weight(self, user):
+        return float(self.get(user)["weight"])
+
+    def max_concurrency(self, user):
+        return self.get(user)["max_concurrency"]
+
+    def take_serpapi(self, user):
+        """Count one SerpAPI call for ``user``; False once today's allowance is spent."""
+        limit = self.get(user)["serpapi_daily_limit"]
+        today = time.strftime("%Y-%m-%d")
+        with self._lock:
+            day, calls = self._serpapi.get(user, (today, 0))
+            if day != today:
+                calls = 0
+            if limit is not None and calls >= limit:
+                return False
+            self._serpapi[user] = (today, calls + 1)
+        return True
+
+    def serpapi_today(self, user):
+        with self._lock:
+            day, calls = self._serpapi.get(user, (None, 0))
+        return calls if day == time.strftime("%Y-%m-%d") else 0
+
+
+user_shares = UserShares.from_env()
+
+
+class PriorityExecutor:
+    """Thread pool that runs queued work by ``Priority``, fair-shared within a class.
+
+    Batch and background work never holds more than ``max_workers - reserved``
+    threads, so the reserved ones are free the moment an interactive search is
+    submitted. Within a class, work queues FIFO per job and jobs group by user
+    (``submit_at(..., user=, job=)``); a free thread serves the user with the
+    fewest running tasks per unit of ``user_shares`` weight (skipping users at
+    their concurrency cap), least recently served first on ties, and within
+    that user the job with the fewest running tasks. Offers the
+    ``submit``/``shutdown``/``_max_workers`` surface of ``ThreadPoolExecutor``
+    (the watchdog grows ``_max_workers`` to replace a stuck thread).
+    """
+
+    def __init__(self, max_workers, reserved=INTERACTIVE_RESERVED_WORKERS, thread_name_prefix="search",
+                 shares=user_shares):
+        self.reserved = reserved
+        self.shares = shares
+        self._max = max_workers
+        self._prefix = thread_name_prefix
+        self._queues = {priority: {} for priority in Priority}  # priority → user → job → deque of tasks
+        self._waiting = 0
+        self._running_users = {}
+        self._running_jobs = {}
+        self._served = {}  # user or (user, job) → seq of its last dispatch
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._threads = set()
+        self._idle = 0
+        self._busy_low = 0  # threads running batch or background work
+        self._shutdown = False
+
+    @property
+    def _max_workers(self):
+        return self._max
+
+    @_max_workers.setter
+    def _max_workers(self, value):
+        with self._cond:
+            self._max = value
+            self._spawn()
+            self._cond.notify_all()  # surplus threads exit once idle
+
+    def submit(self, fn, /, *args, **kwargs):
+        return self.submit_at(Priority.BATCH, fn, *args, **kwargs)
+
+    def submit_at(self, priority, fn, /, *args, user=None, job=None, **kwargs):
+        future = Future()
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            jobs = self._queues[Priority(priority)].setdefault(user, {})
+            jobs.setdefault(job, deque()).append((future, fn, args, kwargs))
+            self._waiting += 1
+            self._spawn()
+            self._cond.notify_all()
+        return future
+
+    def queued(self):
+        """Tasks waiting for a thread, by priority class."""
+        with self._cond:
+            return {priority: sum(len(tasks) for jobs in users.values() for tasks in jobs.values())
+                    for priority, users in self._queues.items()}
+
+    def usage(self):
+        """``{user: (running, waiting)}`` for every user with work here."""
+        with self._cond:
+            waiting = {}
+            for users in self._queues.values():
+                for user, jobs in users.items():
+                    waiting[user] = waiting.get(user, 0) + sum(len(tasks) for tasks in jobs.values())
+            return {user: (self._running_users.get(user, 0), waiting.get(user, 0))
+                    for user in waiting.keys() | self._running_users.keys()}
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for users in self._queues.values():
+                    for jobs in users.values():
+                        for tasks in jobs.values():
+                            for future, *_ in tasks:
+                                future.cancel()
+                    users.clear()
+                self._waiting = 0
+            threads = list(self._threads)
+            self._cond.notify_all()
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _spawn(self):
+        # Caller holds self._cond
+        if self._waiting and not self._idle and len(self._threads) < self._max:
+            thread = threading.Thread(target=self._work, daemon=True,
+                                      name=f"{self._prefix}_{next(self._seq)}")
+            self._threads.add(thread)
+            thread.start()
+
+    def _next(self):
+        # Caller holds self._cond
+        for priority, users in self._queues.items():
+            if not users:
+                continue
+            if priority != Priority.INTERACTIVE and self._busy_low >= max(1, self._max - self.reserved):
+                return None  # the remaining threads are held for interactive work
+            runnable = [user for user in users
+                        if self.shares.max_concurrency(user) is None
+                        or self._running_users.get(user, 0) < self.shares.max_concurrency(user)]
+            if not runnable:
+                continue  # everyone here is at their cap; a lower class may still run
+            user = min(runnable, key=lambda u: (self._running_users.get(u, 0) / self.shares.weight(u),
+                                                self._served.get(u, -1)))
+            jobs = users[user]
+            job = min(jobs, key=lambda j: (self._running_jobs.get((user, j), 0), self._served.get((user, j), -1)))
+            task = jobs[job].popleft()
+            if not jobs[job]:
+                del jobs[job]
+                if not jobs:
+                    del users[user]
+            self._waiting -= 1
+            self._served[user] = self._served[user, job] = next(self._seq)
+            return (priority, user, job, *task)
+        return None
+
+    def _count(self, user, job, delta):
+        # Caller holds self._cond
+        for counts, key in ((self._running_users, user), (self._running_jobs, (user, job))):
+            counts[key] = counts.get(key, 0) + delta
+            if not counts[key]:
+                del counts[key]
+        drained = not any(job in users.get(user, ()) for users in self._queues.values())
+        if drained and (user, job) not in self._running_jobs:
+            self._served.pop((user, job), None)
+
+    def _work(self):
+        me = threading.current_thread()
+        while True:
+            with self._cond:
+                while True:
+                    if len(self._threads) > self._max or (self._shutdown and not self._waiting):
+                        self._threads.discard(me)
+                        return
+                    item = self._next()
+                    if item is not None:
+                        break
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                priority, user, job, future, fn, args, kwargs = item
+                low = priority != Priority.INTERACTIVE
+                self._busy_low += low
+                self._count(user, job, 1)
+                self._spawn()  # more queued work may be runnable by another thread
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            del item, future, fn, args, kwargs
+            with self._cond:
+                self._busy_low -= low
+                self._count(user, job, -1)
+                self._cond.notify_all()
+
+
+# CPU‑aware thread count (max 8)
+available_threads = usable_cores()
+max_threads = min(8, max(4, int(available_threads * 0.75)))
+executor = PriorityExecutor(max_workers=max_threads)
+
+# Only TASK_WINDOW_PER_WORKER × workers searches are submitted at once;
+# the rest wait in a lazy iterator and are fed in as futures complete.
+TASK_WINDOW_PER_WORKER = 2
+
+# A running job with no new result for this long is reported as stalled
+STALL_SECONDS = 30
+
+# Watchdog: how often each running job checks its searches, how far past the
+# per-person budget a search may run before it counts as hung, and how many
+# times a hung person is requeued before being recorded as timed out
+WATCHDOG_INTERVAL = 5
+HUNG_TASK_GRACE_SECONDS = 30
+WATCHDOG_MAX_REQUEUES = 1
+
+# ────────────────────────────────────────────────────────────────
+# Logging — keep history (no truncation)
+# ────────────────────────────────────────────────────────────────
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(20 * 2**20)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "14"))
+log_file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "searchlog.jsonl")
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, thread and message."""
+
+    def format(self, record):
+        entry = {
+            "ts": f"{self.formatTime(record, '%Y-%m-%dT%H:%M:%S')}.{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def _gzip_rotate(source, dest):
+    with open(source, "rb") as src, gzip.open(dest, "wb") as dst:
+        shutil.copyfileobj(src, dst)
+    os.remove(source)
+
+
+class RotatingLogFile(logging.handlers.RotatingFileHandler):
+    """Rolls over past ``max_bytes`` or at the first record of a new day; backups are gzipped."""
+
+    def __init__(self, filename, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+        self.namer = lambda name: name + ".gz"
+        self.rotator = _gzip_rotate
+        self._day = time.strftime("%Y-%m-%d", time.localtime(os.path.getmtime(filename)))
+
+    def shouldRollover(self, record):
+        if time.strftime("%Y-%m-%d") != self._day and self.stream and self.stream.tell() > 0:
+            return True
+        return super().shouldRollover(record)
+
+    def doRollover(self):
+        super().doRollover()
+        self._day = time.strftime("%Y-%m-%d")
+
+
+# Workers only enqueue records; one listener thread formats and writes them,
+# so no search thread ever waits on the file handler's lock or on disk
+_console_handler = logging.StreamHandler()
+_console_handler.setFormatter(logging.Formatter("[%(asctime)s] [%(levelname)s] :: %(message)s"))
+_file_handler = RotatingLogFile(log_file_path)
+_file_handler.setFormatter(JsonLogFormatter())
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, _console_handler, _file_handler)
+_queue_handler = logging.handlers.QueueHandler(log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))  # the listener's handlers do the real formatting
+logging.basicConfig(level=LOG_LEVEL, handlers=[_queue_handler])
+log_listener.start()
+atexit.register(log_listener.stop)
+logger.info(f"🔁 Logger started — appending JSON lines to {os.path.basename(log_file_path)}")
+
+# Cross‑platform helper to open the log – optional UI button can call this
+
+def open_log_file():
+    try:
+        system = platform.system()
+        if system == "Windows":
+            os.startfile(log_file_path)
+        elif system == "Darwin":  # macOS
+            subprocess.run(["open", log_file_path])
+        else:  # Linux & friends
+            subprocess.run(["xdg-open", log_file_path])
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to open log file: {e}")
+
+# ────────────────────────────────────────────────────────────────
+# Metrics — per-stage latency histograms, counters and gauges (Prometheus text format)
+# ────────────────────────────────────────────────────────────────
+
+class Metrics:
+    """Thread-safe in-process metrics; ``render()`` is what ``/metrics`` serves."""
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60)
+
+    def __init__(self, prefix="linkedin_finder"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._meta = {}  # name → (type, help)
+        self._values = {}  # (name, labels) → counter/gauge value
+        self._histograms = {}  # (name, labels) → [per-bucket counts..., sum, count]
+        self._gauges = {}  # name → fn() evaluated at scrape time
+
+    def describe(self, name, kind, help_text):
+        self._meta[name] = (kind, help_text)
+
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, name, **labels):
+        with self._lock:
+            return self._values.get((name, tuple(sorted(labels.items()))), 0)
+
+    def by_label(self, name, label):
+        """``{label value: value}`` for a counter or gauge kept under one label."""
+        with self._lock:
+            return {dict(labels).get(label): value
+                    for (metric, labels), value in self._values.items() if metric == name}
+
+    def gauge(self, name, help_text, fn):
+        self.describe(name, "gauge", help_text)
+        self._gauges[name] = fn
+
+    def observe(self, name, seconds, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = [0] * len(self.BUCKETS) + [0.0, 0]
+            bucket = bisect.bisect_left(self.BUCKETS, seconds)
+            if bucket < len(self.BUCKETS):
+                hist[bucket] += 1
+            hist[-2] += seconds
+            hist[-1] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """Time a block, or a function when used as a decorator."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    @contextmanager
+    def stage(self, stage):
+        """Time a pipeline stage and count the calls currently inside it."""
+        self.inc("stage_in_progress", stage=stage)
+        try:
+            with self.timer("stage_seconds", stage=stage):
+                yield
+        finally:
+            self.inc("stage_in_progress", -1, stage=stage)
+
+    def render(self):
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: list(hist) for key, hist in self._histograms.items()}
+        for name, fn in self._gauges.items():
+            try:
+                value = fn()
+            except Exception as e:
+                logger.debug(f"Gauge {name} failed: {e}")
+                continue
+            if value is not None:
+                values[(name, ())] = value
+
+        lines, seen = [], set()
+
+        def header(name):
+            if name not in seen:
+                seen.add(name)
+                kind, help_text = self._meta.get(name, ("untyped", name))
+                lines.append(f"# HELP {self.prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {self.prefix}_{name} {kind}")
+
+        def label_str(labels, **extra):
+            pairs = [*labels, *extra.items()]
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}" if pairs else ""
+
+        for (name, labels), value in sorted(values.items()):
+            header(name)
+            lines.append(f"{self.prefix}_{name}{label_str(labels)} {value}")
+        for (name, labels), hist in sorted(histograms.items()):
+            header(name)
+            cumulative = 0
+            for bound, count in zip(self.BUCKETS, hist):
+                cumulative += count
+                lines.append(f"{self.prefix}_{name}_bucket{label_str(labels, le=bound)} {cumulative}")
+            lines.append(f"{self.prefix}_{name}_bucket{label_str(labels, le='+Inf')} {hist[-1]}")
+            lines.append(f"{self.prefix}_{name}_sum{label_str(labels)} {hist[-2]:.6f}")
+            lines.append(f"{self.prefix}_{name}_count{label_str(labels)} {hist[-1]}")
+        return "\n".join(lines) + "\n"
+
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, AttributeError, ValueError):
+        return None  # not Linux
+
+
+metrics = Metrics()
+metrics.describe("stage_seconds", "histogram", "Time spent in each pipeline stage")
+metrics.describe("stage_in_progress", "gauge", "Calls currently inside each pipeline stage")
+metrics.describe("ui_callback_seconds", "histogram", "Dashboard callback latency")
+metrics.describe("searches_total", "counter", "Search requests sent, by engine")
+metrics.describe("fallbacks_total", "counter", "People who fell back from SerpAPI to Bing")
+metrics.describe("index_hits_total", "counter", "People answered from the resolved-profile index")
+metrics.describe("results_total", "counter", "Recorded results, by status")
+metrics.describe("errors_total", "counter", "Failures, by kind")
+metrics.describe("watchdog_kills_total", "counter", "Searches aborted by the watchdog")
+metrics.describe("active_drivers", "gauge", "Chrome drivers currently open")
+metrics.describe("rescore_seconds", "histogram", "Re-ranking a job under new match thresholds")
+metrics.gauge("process_resident_memory_bytes", "Resident set size", rss_bytes)
+
+# ────────────────────────────────────────────────────────────────
+# CPU budget for model inference
+# ────────────────────────────────────────────────────────────────
+
+# Up to max_threads workers call the models at once, and by default every torch op
+# would fan out over all cores, so N callers run N × cores threads. The plan caps the
+# concurrent model calls ("inference slots") and gives each call its share of the
+# cores. Run benchmarks/cpu_budget.py to find the best split for a host, then pin it
+# with these (0 = planned from the core count).
+INFERENCE_SLOTS = int(os.getenv("INFERENCE_SLOTS", "0"))
+TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+TORCH_INTER_OP_THREADS = int(os.getenv("TORCH_INTER_OP_THREADS", "1"))
+THREADS_PER_INFERENCE_SLOT = 2  # default split: fewer, two-core calls beat many single-core ones
+
+
+@dataclass(frozen=True)
+class CpuBudget:
+    cores: int
+    inference_slots: int  # model calls allowed to run at once
+    intra_op_threads: int  # torch threads per model call
+    inter_op_threads: int
+
+    def __str__(self):
+        return (f"{self.cores} core(s): {self.inference_slots} inference slot(s) × "
+                f"{self.intra_op_threads} torch thread(s)")
+
+
+def plan_cpu_budget(cores=None, workers=None, slots=None, intra_op_threads=None):
+    """Split ``cores`` between concurrent model callers so slots × threads ≈ cores."""
+    cores = cores or available_threads
+    workers = workers or max_threads
+    slots = slots or INFERENCE_SLOTS or max(1, cores // (intra_op_threads or TORCH_INTRA_OP_THREADS
+                                                          or THREADS_PER_INFERENCE_SLOT))
+    slots = max(1, min(slots, workers))
+    intra = intra_op_threads or TORCH_INTRA_OP_THREADS or max(1, cores // slots)
+    return CpuBudget(cores, slots, intra, max(1, TORCH_INTER_OP_THREADS))
+
+
+cpu_budget = None  # the CpuBudget in effect
+inference_slots = None  # BoundedSemaphore sized by apply_cpu_budget()
+
+
+def apply_cpu_budget(budget):
+    """Set torch and tokenizer threading and the inference slot count; safe to call again."""
+    global inference_slots, cpu_budget
+    # Fast tokenizers would start their own rayon pool per call on top of torch's threads
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    torch.set_num_threads(budget.intra_op_threads)
+    if torch.get_num_interop_threads() != budget.inter_op_threads:
+        try:
+            torch.set_num_interop_threads(budget.inter_op_threads)
+        except RuntimeError as e:  # only settable before torch's first parallel work
+            logger.warning(f"⚠️ Keeping {torch.get_num_interop_threads()} torch inter-op threads: {e}")
+    inference_slots = threading.BoundedSemaphore(budget.inference_slots)
+    cpu_budget = budget
+    logger.info(f"🧮 CPU budget — {budget}")
+    return budget
+
+
+@contextmanager
+def inference_slot():
+    """Hold one of the inference slots; time spent queueing shows as stage inference_wait."""
+    slots = inference_slots
+    with metrics.stage("inference_wait"):
+        slots.acquire()
+    try:
+        yield
+    finally:
+        slots.release()
+
+
+apply_cpu_budget(plan_cpu_budget())
+
+# ────────────────────────────────────────────────────────────────
+# ML Models (single NER pipeline)
+# ────────────────────────────────────────────────────────────────
+
+# Loaded on first use (or by load_models()), so a queue coordinator never pays for them
+sentence_model = None
+ner_pipeline = None
+_models_lock = threading.Lock()
+
+
+def load_models():
+    global sentence_model, ner_pipeline
+    with _models_lock:
+        if sentence_model is None:
+            with metrics.stage("model_load"):
+                ner_pipeline = pipeline("ner", model="Jean-Baptiste/roberta-large-ner-english",
+                                        grouped_entities=True)
+                sentence_model = SentenceTransformer("all-mpnet-base-v2")  # set last: it marks "loaded"
+    return sentence_model, ner_pipeline
+
+
+def encode(text):
+    if sentence_model is None:
+        load_models()
+    with inference_slot(), metrics.stage("encode"):
+        return sentence_model.encode(text, convert_to_tensor=True)
+
+# ────────────────────────────────────────────────────────────────
+# Helpers
+# ────────────────────────────────────────────────────────────────
+
+def extract_ner_entities(text: str):
+    """Return unique PER / ORG / LOC from a text blob."""
+    if sentence_model is None:
+        load_models()
+    with inference_slot(), metrics.stage("ner"):
+        ents = ner_pipeline(text)
+    loc = {e["word"] for e in ents if e["entity_group"] == "LOC"}
+    org = {e["word"] for e in ents if e["entity_group"] == "ORG"}
+    per = {e["word"] for e in ents if e["entity_group"] == "PER"}
+    return {"locations": list(loc), "organizations": list(org), "persons": list(per)}
+
+
+def extract_best_title(raw_title: str) -> str:
+    """Strip boiler‑plate and heuristically pick best job‑title fragment."""
+    if not raw_title:
+        return "Not Found"
+    clean = raw_title
+    for ph in ("United States", "Professional Profile", "Connections", "LinkedIn"):
+        clean = clean.replace(ph, "").strip()
+    parts = [p.strip() for p in clean.split("|") if p.strip()]
+    if not parts:
+        return "Not Found"
+    ref = clean.lower()
+    return max(parts, key=lambda p: fuzz.token_set_ratio(p, ref))
+
+
+def name_similarity(full_name: str, title: str):
+    """``(cosine, fuzzy)`` similarity of a name to a result title."""
+    cos_score = cos_sim(encode(full_name), encode(title)).item()
+    fuzz_score = fuzz.token_set_ratio(full_name.lower(), title.lower()) / 100.0
+    # Runs for every candidate: debug only, formatted lazily if that level is on
+    logger.debug("[Similarity] Cosine: %.2f | Fuzzy: %.2f", cos_score, fuzz_score)
+    return cos_score, fuzz_score
+
+
+# ────────────────────────────────────────────────────────────────
+# University catalog — canonical names and the spellings that mean them
+# ────────────────────────────────────────────────────────────────
+
+UNIVERSITY_CATALOG = {
+    "Kean University": ["Kean", "Kean Univ"],
+    "Rutgers University - Newark": ["RUN", "Rutgers Newark", "RU Newark", "Rutgers University Newark"],
+    "Rutgers University - New Brunswick": ["RUNB", "Rutgers New Brunswick", "RU New Brunswick",
+                                           "Rutgers University New Brunswick"],
+    "Rutgers University - Camden": ["Rutgers Camden", "RU Camden"],
+    "William Paterson University": ["WPU", "WPUNJ", "William Paterson", "William Patterson University"],
+    "Fairleigh Dickinson University": ["FDU", "Fairleigh Dickinson", "Farleigh Dickinson University"],
+    "Montclair State University": ["MSU", "Montclair State", "Montclair", "MSU Montclair"],
+    "New Jersey City University": ["NJCU", "Jersey City University", "Jersey City State College"],
+    "Bloomfield College": ["Bloomfield", "Bloomfield College of Montclair State University"],
+    "New Jersey Institute of Technology": ["NJIT", "Newark College of Engineering"],
+    "Stevens Institute of Technology": ["Stevens", "SIT", "Stevens Tech", "Stevens Institute"],
+    "Princeton University": ["Princeton"],
+    "Seton Hall University": ["Seton Hall", "SHU"],
+    "Rowan University": ["Rowan", "Glassboro State College"],
+    "The College of New Jersey": ["TCNJ", "College of New Jersey", "Trenton State College"],
+    "Stockton University": ["Stockton", "Richard Stockton College of New Jersey"],
+    "Ramapo College of New Jersey": ["Ramapo", "Ramapo College"],
+    "Monmouth University": ["Monmouth"],
+    "Rider University": ["Rider"],
+    "Saint Peter's University": ["Saint Peters", "Saint Peter's College", "SPU"],
+    "Caldwell University": ["Caldwell", "Caldwell College"],
+    "Drew University": ["Drew"],
+    "Felician University": ["Felician", "Felician College"],
+    "Centenary University": ["Centenary", "Centenary College"],
+    "Georgian Court University": ["Georgian Court"],
+    "Thomas Edison State University": ["TESU", "Thomas Edison", "Thomas Edison State College"],
+    "Passaic County Community College": ["PCCC"],
+    "Essex County College": ["ECC"],
+    "Hudson County Community College": ["HCCC"],
+    "Bergen Community College": ["BCC", "Bergen CC"],
+    "Middlesex College": ["Middlesex County College"],
+    "Union College of Union County": ["Union County College", "UCC"],
+    "Columbia University": ["Columbia"],
+    "New York University": ["NYU"],
+    "Pace University": ["Pace"],
+    "City College of New York": ["CCNY", "City College", "CUNY City College"],
+    "Baruch College": ["Baruch", "CUNY Baruch"],
+    "Hunter College": ["Hunter", "CUNY Hunter"],
+    "Fordham University": ["Fordham"],
+    "Cornell University": ["Cornell"],
+    "Pennsylvania State University": ["Penn State", "PSU"],
+    "Temple University": ["Temple"],
+    "University of Pennsylvania": ["UPenn"],
+    "Drexel University": ["Drexel"],
+}
+# Aliases that name several institutions ("Rutgers", "Penn", "BC") are left out on
+# purpose: those inputs stay as typed rather than being pinned to one campus.
+
+# What goes in the search query when profiles rarely spell out the catalog name;
+# everything else is searched by its canonical name
+UNIVERSITY_SEARCH_NAMES = {
+    "Rutgers University - Newark": "Rutgers",
+    "Rutgers University - New Brunswick": "Rutgers",
+    "Rutgers University - Camden": "Rutgers",
+    "Pennsylvania State University": "Penn State",
+    "The College of New Jersey": "College of New Jersey",
+    "Stockton University": "Stockton",
+    "Ramapo College of New Jersey": "Ramapo College",
+    "Saint Peter's University": "Saint Peter's",
+    "Caldwell University": "Caldwell",
+    "Felician University": "Felician",
+    "Centenary University": "Centenary",
+    "Thomas Edison State University": "Thomas Edison State",
+    "Middlesex College": "Middlesex",
+    "Union College of Union County": "Union County",
+}
+
+# Extra institutions/aliases for a site: JSON {"Canonical Name": ["alias", ...]}
+UNIVERSITY_CATALOG_PATH = os.getenv("UNIVERSITY_CATALOG_PATH")
+
+# Abbreviated words spelled out before matching ("Stevens Inst. of Tech")
+NAME_ABBREVIATIONS = {
+    "univ": "university", "uni": "university", "inst": "institute", "tech": "technology",
+    "coll": "college", "comm": "community", "cc": "community college", "nj": "new jersey",
+    "ny": "new york", "the": "",
+}
+
+
+def _fold(text):
+    """Lower-case ASCII word tokens: accents stripped, punctuation dropped."""
+    text = unicodedata.normalize("NFKD", str(text or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return re.sub(r"[^a-z0-9]+", " ", text.casefold()).split()
+
+
+def _university_key(name):
+    tokens = _fold(name.replace("'", ""))
+    if tokens and tokens[0] == "st":
+        tokens[0] = "saint"
+    words = (NAME_ABBREVIATIONS.get(t, "state" if t == "st" else t) for t in tokens)
+    return " ".join(w for w in words if w)
+
+
+# Words every other institution shares; fuzzy matching ignores them so that
+# "Rice University" is not a near-miss of "Rider University"
+GENERIC_NAME_WORDS = {"university", "college", "institute", "community", "school", "of", "and", "at"}
+
+
+def _is_generic(word):
+    # Misspelt generic words ("Universty", "Colege") are still generic
+    return word in GENERIC_NAME_WORDS or (
+        len(word) >= 6 and any(fuzz.ratio(word, g) >= 85 for g in GENERIC_NAME_WORDS if len(g) >= 6))
+
+
+def _distinctive(key):
+    return " ".join(w for w in key.split() if not _is_generic(w))
+
+
+class UniversityIndex:
+    """Resolve any spelling of an institution to its catalog name.
+
+    Exact alias hits are a dict lookup; everything else is one rapidfuzz
+    ``extractOne`` over the prebuilt distinctive part of each alias. A distinctive
+    part whose words all appear in another institution's ("Pennsylvania" in
+    "Pennsylvania State") is too vague on its own, so a hit on one must also match
+    the whole alias. Each distinct input string is resolved once and memoized;
+    unknown names come back unchanged.
+    """
+
+    def __init__(self, catalog, score_cutoff=90, min_fuzzy_length=4):
+        self.aliases = {}  # normalized alias → canonical name
+        self.fuzzy = {}  # distinctive words of an alias → (canonical name, whole alias)
+        for canonical, aliases in catalog.items():
+            for alias in (canonical, *aliases):
+                key = _university_key(alias)
+                self.aliases[key] = canonical
+                self.fuzzy.setdefault(_distinctive(key), (canonical, key))
+        self.fuzzy.pop("", None)
+        words = {part: set(part.split()) for part in self.fuzzy}
+        self.vague = {part for part in words if any(
+            other != part and words[part] <= words[other] and self.fuzzy[other][0] != self.fuzzy[part][0]
+            for other in words)}
+        self.choices = list(self.fuzzy)
+        self.score_cutoff = score_cutoff
+        self.min_fuzzy_length = min_fuzzy_length  # short codes only match exactly
+        self._memo = {}
+
+    def canonical(self, name):
+        name = str(name or "").strip()
+        try:
+            return self._memo[name]
+        except KeyError:
+            pass
+        key = _university_key(name)
+        canonical = self.aliases.get(key)
+        distinctive = _distinctive(key)
+        if canonical is None and len(distinctive) >= self.min_fuzzy_length:
+            best = process.extractOne(distinctive, self.choices, scorer=fuzz.token_sort_ratio,
+                                      processor=None, score_cutoff=self.score_cutoff)
+            if best:
+                canonical, alias = self.fuzzy[best[0]]
+                if best[0] in self.vague and fuzz.token_sort_ratio(key, alias) < self.score_cutoff:
+                    canonical = None  # "Pennsylvania" alone could be either Penn
+        self._memo[name] = canonical = canonical or name
+        return canonical
+
+
+def load_university_catalog(path=UNIVERSITY_CATALOG_PATH):
+    catalog = {name: list(aliases) for name, aliases in UNIVERSITY_CATALOG.items()}
+    if path:
+        with open(path, encoding="utf-8") as fh:
+            for name, aliases in json.load(fh).items():
+                catalog.setdefault(name, []).extend(aliases)
+    return catalog
+
+
+university_index = UniversityIndex(load_university_catalog())
+
+
+def canonical_university(name):
+    return university_index.canonical(name)
+
+
+def university_search_name(name):
+    """The institution as the search query should quote it; identity and caching use the canonical name."""
+    canonical = canonical_university(name)
+    return UNIVERSITY_SEARCH_NAMES.get(canonical, canonical)
+
+# ────────────────────────────────────────────────────────────────
+# Result records — raw typed values; display strings are built only for the table
+# ────────────────────────────────────────────────────────────────
+
+class MatchStatus(str, Enum):
+    MATCH = "match"
+    NO_MATCH = "no_match"
+    ERROR = "error"
+    TIMEOUT = "timeout"
+
+
+STATUS_LABELS = {
+    MatchStatus.MATCH: "✅ Match Found",
+    MatchStatus.NO_MATCH: "❌ No Match",
+    MatchStatus.ERROR: "❌ Error",
+    MatchStatus.TIMEOUT: "⏱️ Timed Out",
+}
+
+
+def _blank_to_none(value):
+    """Empty CSV cells arrive as NaN or ''; store them as None."""
+    if value is None or value == "" or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+@dataclass(slots=True)
+class Candidate:
+    """One search hit kept with its name similarity, so a job can be re-ranked without searching again."""
+
+    title: str
+    url: str
+    snippet: str = ""
+    cosine: float = 0.0
+    fuzzy: float = 0.0
+    location: str = None  # NER location, extracted once the hit is first chosen
+
+    @property
+    def score(self):
+        return max(self.cosine, self.fuzzy)
+
+    def locate(self):
+        """This hit's location, running NER on first use and caching it."""
+        if self.location is None:
+            ner = extract_ner_entities(f"{self.title}. {self.snippet}")
+            self.location = ner["locations"][0] if ner["locations"] else "Unknown"
+        return self.location
+
+    def passes(self, cosine_threshold, fuzzy_threshold):
+        return self.cosine >= cosine_threshold or self.fuzzy >= fuzzy_threshold
+
+
+def pick_candidate(candidates, cosine_threshold, fuzzy_threshold):
+    """Index of the best-scoring candidate that passes either threshold (first on ties), or None."""
+    best, best_score = None, None
+    for i, candidate in enumerate(candidates):
+        if candidate.passes(cosine_threshold, fuzzy_threshold) and (best is None or candidate.score > best_score):
+            best, best_score = i, candidate.score
+    return best
+
+
+@dataclass(slots=True)
+class SearchResult:
+    """One person's outcome: raw URL, 0–1 score and integer income, no formatting."""
+
+    first_name: str
+    last_name: str
+    university: str
+    graduation_year: object = None  # int or str straight from the input, None if blank
+    title: str = "Not Found"
+    url: str = ""
+    score: float = None
+    location: str = "Unknown"
+    income: int = None
+    status: MatchStatus = MatchStatus.NO_MATCH
+    seq: int = 0  # per-job sequence number, set when the job records the result
+    candidates: list = None  # every scored search hit (Candidate), None for index hits and failures
+    choice: int = None  # index of the matched candidate
+
+    @classmethod
+    def for_person(cls, person, **fields):
+        fields.setdefault("university", person.get("University"))
+        return cls(first_name=person.get("First Name"), last_name=person.get("Last Name"),
+                   graduation_year=_blank_to_none(person.get("Graduation Year")), **fields)
+
+    def to_dict(self):
+        """JSON-ready fields, status as its value (work-queue transport)."""
+        data = {f.name: getattr(self, f.name) for f in fields(self)}
+        data["status"] = self.status.value
+        if self.candidates is not None:
+            data["candidates"] = [asdict(c) for c in self.candidates]
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        candidates = data.get("candidates")
+        return cls(**dict(data, status=MatchStatus(data["status"]),
+                          candidates=None if candidates is None else [Candidate(**c) for c in candidates]))
+
+    def choose(self, choice, locate=True):
+        """Make ``candidates[choice]`` the match, or record no match when ``choice`` is None.
+
+        With ``locate=False`` the location is only taken from the candidate's cache,
+        so a caller holding a lock never waits on NER.
+        """
+        self.choice = choice
+        self.income = None
+        if choice is None:
+            self.title, self.url, self.score, self.location = "Not Found", "", None, "Unknown"
+            self.status = MatchStatus.NO_MATCH
+        else:
+            candidate = self.candidates[choice]
+            self.title, self.url, self.score = extract_best_title(candidate.title), candidate.url, candidate.score
+            self.location = (candidate.locate() if locate else candidate.location) or "Unknown"
+            self.status = MatchStatus.MATCH
+        return self
+
+
+# Table/export column → raw value as compared by filters and sorts (Score in percent)
+COLUMN_VALUES = {
+    "No.": lambda r: r.seq,
+    "First Name": lambda r: r.first_name,
+    "Last Name": lambda r: r.last_name,
+    "University": lambda r: r.university,
+    "Graduation Year": lambda r: r.graduation_year,
+    "LinkedIn Title": lambda r: r.title,
+    "LinkedIn URL": lambda r: r.url,
+    "Status": lambda r: STATUS_LABELS[r.status],
+    "Score": lambda r: None if r.score is None else r.score * 100,
+    "Location (Estimated)": lambda r: r.location,
+    "Income (Estimated)": lambda r: r.income,
+}
+
+
+def column_value(result, column):
+    getter = COLUMN_VALUES.get(column)
+    return getter(result) if getter else None
+
+
+def display_row(result):
+    """Table-view strings for one result (HTML link, "87%", "$123,456", status emoji)."""
+    return {
+        "No.": result.seq,
+        "First Name": result.first_name,
+        "Last Name": result.last_name,
+        "University": result.university,
+        "Graduation Year": "N/A" if result.graduation_year is None else result.graduation_year,
+        "LinkedIn Title": result.title,
+        "LinkedIn URL": f'<a href="{result.url}" target="_blank">Open Profile</a>' if result.url else "",
+        "Status": STATUS_LABELS[result.status],
+        "Score": "N/A" if result.score is None else f"{int(result.score * 100)}%",
+        "Location (Estimated)": result.location,
+        "Income (Estimated)": "Unknown" if result.income is None else f"${result.income:,}",
+    }
+
+
+def export_row(result):
+    """Raw values for CSV/JSON/Parquet export and the REST API."""
+    return {
+        "First Name": result.first_name,
+        "Last Name": result.last_name,
+        "University": result.university,
+        "Graduation Year": result.graduation_year,
+        "LinkedIn Title": result.title,
+        "LinkedIn URL": result.url,
+        "Status": result.status.value,
+        "Score": None if result.score is None else round(result.score, 4),
+        "Location (Estimated)": result.location,
+        "Income (Estimated)": result.income,
+    }
+
+# ────────────────────────────────────────────────────────────────
+# Resolved-profile index — people matched in earlier runs, keyed by a normalized identity
+# ────────────────────────────────────────────────────────────────
+
+PROFILE_INDEX_PATH = os.getenv(
+    "PROFILE_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "resolved_profiles.sqlite3"))
+# Matches older than this are searched again (and the entry refreshed)
+PROFILE_INDEX_MAX_AGE_DAYS = float(os.getenv("PROFILE_INDEX_MAX_AGE_DAYS", "30"))
+
+# Common English nicknames → the given name they fold to
+NICKNAMES = {
+    "alex": "alexander", "andy": "andrew", "bill": "william", "billy": "william", "bob": "robert",
+    "bobby": "robert", "chris": "christopher", "dan": "daniel", "danny": "daniel", "dave": "david",
+    "ed": "edward", "eddie": "edward", "jim": "james", "jimmy": "james", "joe": "joseph",
+    "jon": "jonathan", "kate": "katherine", "katie": "katherine", "liz": "elizabeth",
+    "beth": "elizabeth", "matt": "matthew", "mike": "michael", "nick": "nicholas", "pat": "patricia",
+    "rob": "robert", "sam": "samuel", "steve": "stephen", "sue": "susan", "tom": "thomas",
+    "tony": "anthony", "will": "william", "jen": "jennifer", "jenny": "jennifer", "meg": "margaret",
+    "josh": "joshua", "ben": "benjamin", "greg": "gregory", "tim": "timothy", "zach": "zachary",
+}
+
+
+def person_identity(person):
+    """Stable key for "the same person" across uploads, e.g. ``robert|o brien|kean university|2019``."""
+    first = " ".join(NICKNAMES.get(token, token) for token in _fold(person.get("First Name")))
+    last = " ".join(_fold(person.get("Last Name")))
+    university = " ".join(_fold(canonical_university(person.get("University"))))
+    year = _blank_to_none(person.get("Graduation Year"))
+    if isinstance(year, float):
+        year = int(year)
+    return f"{first}|{last}|{university}|{'' if year is None else year}"
+
+
+class ProfileIndex:
+    """SQLite store of resolved matches, mirrored in a dict so lookups never touch disk.
+
+    Only matches are kept, each as the candidate that won with both of its
+    similarity scores, so a later job reuses it only if it passes that job's
+    thresholds. A miss is not worth keeping: it only says nothing passed.
+    """
+
+    def __init__(self, path=PROFILE_INDEX_PATH, max_age_days=PROFILE_INDEX_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 86400
+        self._lock = threading.Lock()
+        self._db = None
+        self._entries = None  # identity → (title, url, snippet, cosine, fuzzy, location, found_at)
+
+    def _open(self):
+        # Caller holds self._lock
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            # Rows of the old "resolved" table kept only max(cosine, fuzzy) and cannot be re-checked
+            self._db.execute("DROP TABLE IF EXISTS resolved")
+            self._db.execute("""CREATE TABLE IF NOT EXISTS matches (
+                identity TEXT PRIMARY KEY, title TEXT, url TEXT, snippet TEXT,
+                cosine REAL, fuzzy REAL, location TEXT, found_at REAL)""")
+            self._entries = {row[0]: row[1:] for row in self._db.execute("SELECT * FROM matches")}
+            logger.info(f"📇 Loaded {len(self._entries)} resolved profile(s) from {self.path}")
+
+    def lookup(self, person, cosine_threshold=0.4, fuzzy_threshold=0.75):
+        """A fresh match for ``person`` that passes the thresholds, as a ``SearchResult``, or None.
+
+        The result keeps its candidate, so ``SearchJob.rescore`` can rank it like any other.
+        """
+        with self._lock:
+            self._open()
+            entry = self._entries.get(person_identity(person))
+        if entry is None or time.time() - entry[6] > self.max_age:
+            return None
+        candidate = Candidate(*entry[:6])
+        if pick_candidate([candidate], cosine_threshold, fuzzy_threshold) is None:
+            return None
+        # Built from the row itself, so its own University is kept
+        return SearchResult.for_person(person, candidates=[candidate]).choose(0, locate=False)
+
+    def store(self, person, result):
+        if result.status is not MatchStatus.MATCH or result.choice is None:
+            return
+        candidate = result.candidates[result.choice]
+        entry = (candidate.title, candidate.url, candidate.snippet, candidate.cosine, candidate.fuzzy,
+                 candidate.location, time.time())
+        identity = person_identity(person)
+        with self._lock:
+            self._open()
+            self._entries[identity] = entry
+            self._db.execute("INSERT OR REPLACE INTO matches VALUES (?, ?, ?, ?, ?, ?, ?, ?)", (identity, *entry))
+            self._db.commit()
+
+
+profile_index = ProfileIndex()
+
+# ────────────────────────────────────────────────────────────────
+# Cooperative cancellation & per-person deadlines
+# ────────────────────────────────────────────────────────────────
+
+# End-to-end seconds one person may take across SerpAPI, Bing and retries
+PERSON_BUDGET_SECONDS = float(os.getenv("PERSON_BUDGET_SECONDS", "60"))
+
+
+class Cancelled(Exception):
+    """Raised inside a search once its job has been cancelled."""
+
+
+class DeadlineExceeded(Exception):
+    """Raised inside a search once the person's time budget is used up."""
+
+
+class Deadline:
+    """One person's time budget, shared by every stage and retry of their search."""
+
+    def __init__(self, budget):
+        self.budget = budget
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def check(self):
+        if self.remaining() <= 0:
+            raise DeadlineExceeded()
+
+    def timeout(self, cap):
+        """Timeout for the next stage: ``cap`` seconds, or less if that is all the budget has left."""
+        self.check()
+        return min(cap, self.remaining())
+
+
+class CancelToken:
+    """Shared by every search of one job so ``cancel()`` reaches work already running.
+
+    Searches call ``check()`` between steps, sleep with ``sleep()``, and wrap
+    blocking resources in ``closing(abort)`` so cancelling tears them down mid-call.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._aborts = set()
+        self.driver = None  # Chrome driver the search is using, for the watchdog's liveness check
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def child(self):
+        """A token for one task: cancelled with this one, or on its own by the watchdog."""
+        child = CancelToken()
+        with self._lock:
+            if self._event.is_set():
+                child._event.set()
+            else:
+                self._aborts.add(child.cancel)
+        return child
+
+    def release(self, child):
+        with self._lock:
+            self._aborts.discard(child.cancel)
+
+    def cancel(self):
+        with self._lock:
+            if self._event.is_set():
+                return
+            self._event.set()
+            aborts, self._aborts = list(self._aborts), set()
+        for abort in aborts:
+            try:
+                abort()
+            except Exception as e:
+                logger.debug(f"Cancel cleanup failed: {e}")
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+    def sleep(self, seconds):
+        if self._event.wait(seconds):
+            raise Cancelled()
+
+    @contextmanager
+    def closing(self, abort):
+        """Run ``abort`` if the token is cancelled while the block is executing.
+
+        Whatever the aborted call raises inside the block surfaces as ``Cancelled``.
+        """
+        with self._lock:
+            self.check()
+            self._aborts.add(abort)
+        try:
+            yield
+        except Exception:
+            self.check()
+            raise
+        finally:
+            with self._lock:
+                self._aborts.discard(abort)
+
+    def call(self, fn, *args, deadline=None, **kwargs):
+        """Run blocking ``fn`` on a helper thread and return as soon as it finishes or the token fires.
+
+        ``requests`` has no way to interrupt a read, so a cancelled call is abandoned
+        to run out its own timeout in the background and its result is discarded.
+        With a ``deadline`` the wait also ends, raising ``DeadlineExceeded``, when it expires.
+        """
+        outcome = {}
+        done = threading.Event()
+
+        def run():
+            try:
+                outcome["value"] = fn(*args, **kwargs)
+            except BaseException as e:
+                outcome["error"] = e
+            finally:
+                done.set()
+
+        with self.closing(done.set):
+            threading.Thread(target=run, daemon=True).start()
+            if not done.wait(deadline.remaining() if deadline else None):
+                raise DeadlineExceeded()
+        self.check()
+        if "error" in outcome:
+            raise outcome["error"]
+        return outcome["value"]
+
+# ────────────────────────────────────────────────────────────────
+# Chrome driver (headless)
+# ────────────────────────────────────────────────────────────────
+# Set CHROMEDRIVER_PATH on offline boxes, where webdriver_manager can't download one
+_driver_path = os.getenv("CHROMEDRIVER_PATH")
+_driver_path_lock = threading.Lock()
+
+
+def get_driver_path():
+    """Resolve chromedriver on first use so SerpAPI-only runs never touch webdriver_manager."""
+    global _driver_path
+    with _driver_path_lock:
+        if _driver_path is None:
+            _driver_path = ChromeDriverManager().install()
+        return _driver_path
+
+
+def create_driver():
+    opts = webdriver.ChromeOptions()
+    opts.add_argument("--headless")
+    opts.add_argument("--disable-gpu")
+    opts.add_argument("--no-sandbox")
+    opts.add_argument("--disable-dev-shm-usage")
+    opts.add_argument("--user-agent=Mozilla/5.0")
+    # Own process group, so kill_driver() can take Chrome down together with chromedriver
+    popen_kw = {} if platform.system() == "Windows" else {"start_new_session": True}
+    with metrics.stage("driver_create"):
+        drv = webdriver.Chrome(service=Service(get_driver_path(), popen_kw=popen_kw), options=opts)
+    drv.set_page_load_timeout(15)
+    return drv
+
+
+def kill_driver(driver):
+    """Kill chromedriver and its Chrome processes at once, even while another thread is using ``driver``."""
+    process = getattr(driver.service, "process", None)
+    if process is None or process.poll() is not None:
+        return
+    if platform.system() == "Windows":
+        subprocess.run(["taskkill", "/F", "/T", "/PID", str(process.pid)], capture_output=True)
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            process.kill()
+
+# ────────────────────────────────────────────────────────────────
+# SerpAPI helpers — single call for profile + inline location & income
+# ────────────────────────────────────────────────────────────────
+
+CITY_KEYWORDS = [
+    # big US cities – quick heuristic list
+    "Chicago", "Boston", "Atlanta", "Seattle", "San Francisco", "Los Angeles",
+    "San Diego", "Philadelphia", "Phoenix", "Houston", "Dallas", "Miami", "Las Vegas",
+    "Austin", "Denver", "Minneapolis", "Orlando", "San Jose", "Portland", "New Orleans",
+    "Tampa", "Charlotte"
+]
+
+US_STATE_ABBR = {
+    "al": "Alabama", "ak": "Alaska", "az": "Arizona", "ar": "Arkansas", "ca": "California",
+    "co": "Colorado", "ct": "Connecticut", "de": "Delaware", "fl": "Florida", "ga": "Georgia",
+    "hi": "Hawaii", "id": "Idaho", "il": "Illinois", "in": "Indiana", "ia": "Iowa",
+    "ks": "Kansas", "ky": "Kentucky", "la": "Louisiana", "me": "Maine", "md": "Maryland",
+    "ma": "Massachusetts", "mi": "Michigan", "mn": "Minnesota", "ms": "Mississippi", "mo": "Missouri",
+    "mt": "Montana", "ne": "Nebraska", "nv": "Nevada", "nh": "New Hampshire", "nj": "New Jersey",
+    "nm": "New Mexico", "ny": "New York", "nc": "North Carolina", "nd": "North Dakota", "oh": "Ohio",
+    "ok": "Oklahoma", "or": "Oregon", "pa": "Pennsylvania", "ri": "Rhode Island", "sc": "South Carolina",
+    "sd": "South Dakota", "tn": "Tennessee", "tx": "Texas", "ut": "Utah", "vt": "Vermont",
+    "va": "Virginia", "wa": "Washington", "wv": "West Virginia", "wi": "Wisconsin", "wy": "Wyoming"
+}
+
+
+# Search endpoints — point these at benchmarks/standin_server.py for offline load tests
+SERPAPI_URL = os.getenv("SERPAPI_URL", "https://serpapi.com/search")
+BING_SEARCH_URL = os.getenv("BING_SEARCH_URL", "https://www.bing.com/search")
+SERPAPI_ACCOUNT_URL = os.getenv("SERPAPI_ACCOUNT_URL", SERPAPI_URL.rsplit("/", 1)[0] + "/account.json")
+
+
+def score_candidate(full_name, title, url, snippet):
+    """A search hit with its name similarity; NER waits until the hit is chosen."""
+    cosine, fuzzy = name_similarity(full_name, title) if full_name and title else (0.0, 0.0)
+    return Candidate(title, url, snippet, cosine, fuzzy)
+
+
+# Main profile search — one SerpAPI call per person
+
+def serpapi_search_linkedin_profile(person: dict, api_key=None, cancel=None, deadline=None, owner=None,
+                                    cosine_threshold=0.4, fuzzy_threshold=0.75, candidates=None):
+    """Best SerpAPI match for ``person``, or None; every scored hit is appended to ``candidates``."""
+    cancel = cancel or CancelToken()
+    deadline = deadline or Deadline(PERSON_BUDGET_SECONDS)
+    # Get the key from session storage or fall back to env variable
+    serp_key = api_key or os.getenv("SERPAPI_KEY", "")
+    
+    if not serp_key:
+        logger.warning("⚠️ No SERPAPI_KEY found — falling back to Bing search.")
+        return None
+    if owner is not None and not user_shares.take_serpapi(owner):
+        logger.warning(f"⚠️ {owner} has used today's SerpAPI allowance — falling back to Bing search.")
+        metrics.inc("errors_total", kind="serpapi_allowance")
+        return None
+    
+    logger.debug("🔍 Using SerpAPI: %s", "Session key" if api_key else "Environment key")
+
+    full_name = f"{person['First Name']} {person['Last Name']}".strip()
+    university = canonical_university(person["University"])
+    query = f'"{full_name}" "{university_search_name(university)}" site:linkedin.com'
+
+    params = {"q": query, "api_key": serp_key, "engine": "google", "num": 10}
+    try:
+        logger.info(f"🔍 SerpAPI query: {query}")
+        metrics.inc("searches_total", engine="serpapi")
+        with metrics.stage("serpapi_request"):
+            data = cancel.call(requests.get, SERPAPI_URL, params=params,
+                               timeout=deadline.timeout(20), deadline=deadline).json()
+        if "error" in data:
+            logger.error(f"SerpAPI error: {data['error']}")
+            metrics.inc("errors_total", kind="serpapi_api")
+            return None
+
+        kept = []
+        for res in data.get("organic_results", []):
+            cancel.check()
+            deadline.check()
+            title = res.get("title", "")
+            link = res.get("link", "")
+            snippet = res.get("snippet", "")
+
+            if not (full_name.lower() in title.lower() or full_name.lower() in snippet.lower()):
+                continue  # quick filter
+            kept.append(score_candidate(full_name, title, link, snippet))
+
+        candidates = [] if candidates is None else candidates
+        start = len(candidates)
+        candidates.extend(kept)
+        choice = pick_candidate(kept, cosine_threshold, fuzzy_threshold)
+        if choice is not None:
+            best_result = SearchResult.for_person(person, university=university, candidates=candidates)
+            best_result.choose(start + choice)
+            logger.info(f"🏆 Best match {full_name}: {best_result.title} @ {best_result.score:.2f}")
+            return best_result
+        else:
+            logger.warning(f"No SerpAPI match for {full_name}")
+    except (Cancelled, DeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error(f"SerpAPI failure {full_name}: {e}")
+        metrics.inc("errors_total", kind="serpapi")
+
+    return None
+
+
+def serpapi_searches_left(api_key):
+    """Searches left on the SerpAPI account (the Account API is free); None if unknown."""
+    try:
+        data = requests.get(SERPAPI_ACCOUNT_URL, params={"api_key": api_key}, timeout=5).json()
+        return data.get("total_searches_left", data.get("plan_searches_left"))
+    except Exception as e:
+        logger.debug("SerpAPI account lookup failed: %s", e)
+        return None
+
+# ────────────────────────────────────────────────────────────────
+# Bing / Selenium fallback (kept, but no extra SerpAPI calls)
+# ────────────────────────────────────────────────────────────────
+
+# Seconds to let Bing's result list render before reading it
+BING_SETTLE_SECONDS = (2, 3)
+
+# Politeness toward bing.com, shared by every search thread in the process: at most
+# BING_MAX_RATE page loads a second (0 = unlimited) in bursts of up to BING_BURST,
+# each pushed back by up to BING_JITTER_SECONDS. A captcha or block page pauses all
+# Bing traffic for BING_BACKOFF_SECONDS, doubling per consecutive block up to
+# BING_MAX_BACKOFF_SECONDS.
+BING_MAX_RATE = float(os.getenv("BING_MAX_RATE", "0.5"))
+BING_BURST = int(os.getenv("BING_BURST", "2"))
+BING_JITTER_SECONDS = float(os.getenv("BING_JITTER_SECONDS", "1"))
+BING_BACKOFF_SECONDS = float(os.getenv("BING_BACKOFF_SECONDS", "60"))
+BING_MAX_BACKOFF_SECONDS = float(os.getenv("BING_MAX_BACKOFF_SECONDS", "900"))
+# Lower-cased text that marks a captcha or block page (checked only when no results came back)
+BING_BLOCK_MARKERS = ("captcha", "unusual traffic", "verify you are a human", "too many requests", "access denied")
+
+
+class BingBlocked(Exception):
+    """Bing answered with a captcha or block page instead of results."""
+
+
+class BingThrottle:
+    """Process-wide token bucket for Bing page loads, with backoff after blocks.
+
+    ``reserve()`` books the next free slot and returns its ``time.monotonic()``
+    without waiting, so a search can start Chrome while its slot comes round and
+    only ``wait()`` out the rest. Slots are booked in order under one lock, so the
+    aggregate rate holds however many threads search.
+    """
+
+    def __init__(self, rate=BING_MAX_RATE, burst=BING_BURST, jitter=BING_JITTER_SECONDS,
+                 backoff=BING_BACKOFF_SECONDS, max_backoff=BING_MAX_BACKOFF_SECONDS):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._due = 0.0  # when the bucket next has a whole token (generic cell rate algorithm)
+        self._paused_until = 0.0
+        self._blocks = 0  # consecutive block pages
+        self._lock = threading.Lock()
+
+    def reserve(self, deadline=None):
+        """Book the next slot; raises ``DeadlineExceeded`` without booking if it falls past ``deadline``."""
+        jitter = random.uniform(0, self.jitter) if self.jitter > 0 else 0
+        with self._lock:
+            now = time.monotonic()
+            if self.rate > 0:
+                interval = 1 / self.rate
+                slot = max(now, self._due - (self.burst - 1) * interval, self._paused_until)
+            else:
+                slot = max(now, self._paused_until)
+            if deadline is not None and slot + jitter - now > deadline.remaining():
+                raise DeadlineExceeded()
+            if self.rate > 0:
+                self._due = max(self._due, slot) + interval
+        metrics.observe("bing_throttle_delay_seconds", slot + jitter - now)
+        return slot + jitter
+
+    def cancel(self):
+        """Give back a booked slot that will not be used, so later searches move up."""
+        if self.rate > 0:
+            with self._lock:
+                self._due -= 1 / self.rate
+
+    def wait(self, slot, cancel, deadline):
+        """Sleep until ``slot``, and out any backoff begun since it was booked.
+
+        The booking is handed back if the wait is cancelled or runs out of time.
+        """
+        with metrics.stage("bing_wait"):
+            try:
+                while True:
+                    delay = max(slot, self._paused_until) - time.monotonic()
+                    if delay <= 0:
+                        return
+                    if delay > deadline.remaining():
+                        raise DeadlineExceeded()  # free the thread now rather than sleep into a timeout
+                    cancel.sleep(delay)
+            except BaseException:
+                self.cancel()
+                raise
+
+    def blocked(self):
+        with self._lock:
+            self._blocks += 1
+            pause = min(self.max_backoff, self.backoff * 2 ** (self._blocks - 1))
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+        metrics.inc("bing_blocks_total")
+        logger.warning(f"🛑 Bing served a captcha or block page — pausing Bing searches for {pause:.0f}s")
+
+    def passed(self):
+        """A results page (or a genuine empty one) came back; reset the backoff."""
+        with self._lock:
+            self._blocks = 0
+
+    def paused_for(self):
+        return max(0.0, self._paused_until - time.monotonic())
+
+
+bing_throttle = BingThrottle()
+metrics.describe("bing_throttle_delay_seconds", "histogram", "Delay until the booked Bing slot, per page load")
+metrics.describe("bing_blocks_total", "counter", "Captcha or block pages served by Bing")
+metrics.gauge("bing_paused_seconds", "Seconds left in the Bing backoff", lambda: round(bing_throttle.paused_for(), 1))
+
+
+def bing_blocked(driver):
+    """True when the loaded page is a captcha or block page rather than search results."""
+    try:
+        page = f"{driver.title}\n{driver.page_source}".lower()
+    except Exception:
+        return False
+    return any(marker in page for marker in BING_BLOCK_MARKERS)
+
+
+def search_person(person, cosine_threshold=0.4, fuzzy_threshold=0.75, serpapi_key=None, engine="auto",
+                  cancel=None, budget=None, owner=None):
+    """Find the best LinkedIn match for one person.
+
+    ``engine`` is ``"auto"`` (SerpAPI, then Bing), ``"serpapi"`` (no fallback) or ``"bing"``.
+    Raises ``Cancelled`` promptly once ``cancel`` fires, killing any Chrome it started.
+    Every stage and retry draws on one ``budget`` (seconds, default ``PERSON_BUDGET_SECONDS``);
+    when it runs out the person comes back as a ``TIMEOUT`` result. SerpAPI calls count
+    against ``owner``'s daily allowance in ``user_shares``. The result keeps every scored
+    hit from either engine in ``candidates``, so ``SearchJob.rescore`` can re-rank it later.
+    """
+    deadline = Deadline(PERSON_BUDGET_SECONDS if budget is None else budget)
+    candidates = []
+    try:
+        result = _search_person(person, cosine_threshold, fuzzy_threshold, serpapi_key, engine,
+                                cancel or CancelToken(), deadline, owner, candidates)
+        if result is None and candidates:
+            result = SearchResult.for_person(person, candidates=candidates)
+        return result
+    except DeadlineExceeded:
+        logger.warning(f"⏱️ Gave up on {person['First Name']} {person['Last Name']} "
+                       f"after its {deadline.budget:.0f}s budget")
+        return SearchResult.for_person(person, title="Timed Out", status=MatchStatus.TIMEOUT)
+
+
+def _search_person(person, cosine_threshold, fuzzy_threshold, serpapi_key, engine, cancel, deadline, owner,
+                   candidates):
+    cancel.check()
+    if engine != "bing":
+        result = serpapi_search_linkedin_profile(person, api_key=serpapi_key, cancel=cancel, deadline=deadline,
+                                                 owner=owner, cosine_threshold=cosine_threshold,
+                                                 fuzzy_threshold=fuzzy_threshold, candidates=candidates)
+        if result:
+            return result
+        deadline.check()  # a SerpAPI request cut short by the budget is a timeout, not a miss
+        if engine == "serpapi":
+            return None
+        metrics.inc("fallbacks_total")
+    return _bing_search_person(person, cosine_threshold, fuzzy_threshold, cancel, deadline, candidates)
+
+
+def _bing_search_person(person, cosine_threshold, fuzzy_threshold, cancel, deadline, candidates):
+    """Fallback via Bing (rare); retries only this step, so SerpAPI is never called again."""
+    full_name = f"{person['First Name']} {person['Last Name']}".strip()
+    query = f'"{full_name}" "{university_search_name(person["University"])}" site:linkedin.com'
+    attempt = retry_attempts.get(full_name, 0)
+
+    driver = None
+    try:
+        # Book the Bing slot first and start Chrome while it comes round
+        slot = bing_throttle.reserve(deadline)
+        try:
+            metrics.inc("searches_total", engine="bing")
+            driver = cancel.driver = create_driver()
+            metrics.inc("active_drivers")
+            cancel.check()
+        except BaseException:
+            bing_throttle.cancel()  # the page is never loaded, so don't hold up everyone behind it
+            raise
+        with cancel.closing(lambda: kill_driver(driver)):
+            bing_throttle.wait(slot, cancel, deadline)
+            driver.set_page_load_timeout(deadline.timeout(15))
+            with metrics.stage("page_load"):
+                driver.get(f"{BING_SEARCH_URL}?q={query}")
+            cancel.sleep(deadline.timeout(random.uniform(*BING_SETTLE_SECONDS)))
+            with metrics.stage("extraction"):
+                entries = driver.find_elements(By.CSS_SELECTOR, "li.b_algo")[:10]
+                if not entries and bing_blocked(driver):
+                    bing_throttle.blocked()
+                    raise BingBlocked(f"captcha or block page for {query}")
+            bing_throttle.passed()
+        kept = []
+        for ent in entries:
+            cancel.check()
+            deadline.check()
+            try:
+                with metrics.stage("extraction"):
+                    title = ent.find_element(By.TAG_NAME, "h2").text.strip()
+                    href = ent.find_element(By.TAG_NAME, "a").get_attribute("href")
+                    snippet = ent.find_element(By.CLASS_NAME, "b_caption").text.strip()
+            except Exception:
+                continue
+            kept.append(score_candidate(full_name, title, href, snippet))
+
+        start = len(candidates)
+        candidates.extend(kept)  # only once every hit is scored, so a retry can't add them twice
+        choice = pick_candidate(kept, cosine_threshold, fuzzy_threshold)
+        if choice is None:
+            return None
+        return SearchResult.for_person(person, candidates=candidates).choose(start + choice)
+    except (Cancelled, DeadlineExceeded):
+        raise
+    except Exception as e:
+        logger.error(f"Selenium fallback failed for {full_name}: {e}")
+        metrics.inc("errors_total", kind="bing_blocked" if isinstance(e, BingBlocked) else "selenium")
+        deadline.check()
+        if attempt < MAX_RETRIES:
+            retry_attempts[full_name] = attempt + 1
+            return _bing_search_person(person, cosine_threshold, fuzzy_threshold, cancel, deadline, candidates)
+    finally:
+        if driver:
+            metrics.inc("active_drivers", -1)
+            cancel.driver = None
+            if cancel.cancelled:
+                kill_driver(driver)
+            else:
+                driver.quit()
+    return None
+
+SALARY_RANGES = {
+    # Engineering roles
+    'engineer': (85000, 150000),
+    'software': (110000, 180000),
+    'developer': (95000, 160000),
+    'architect': (130000, 190000),
+    'data scientist': (120000, 180000),
+    'devops': (115000, 170000),
+    'product manager': (125000, 190000),
+    
+    # Business/Finance
+    'analyst': (75000, 120000),
+    'manager': (90000, 150000),
+    'director': (140000, 220000),
+    'executive': (180000, 300000),
+    'ceo': (200000, 500000),
+    'cfo': (180000, 350000),
+    'cto': (160000, 300000),
+    'vp': (150000, 280000),
+    'finance': (90000, 160000),
+    'accountant': (70000, 120000),
+    
+    # Marketing/Sales
+    'marketing': (75000, 130000),
+    'sales': (65000, 140000),
+    'account manager': (80000, 130000),
+    'customer': (60000, 100000),
+    
+    # Healthcare
+    'doctor': (180000, 350000),
+    'physician': (200000, 400000),
+    'nurse': (75000, 120000),
+    'healthcare': (80000, 150000),
+    
+    # Legal
+    'attorney': (130000, 250000),
+    'lawyer': (120000, 240000),
+    'legal': (100000, 200000),
+    
+    # Education
+    'professor': (80000, 150000),
+    'teacher': (50000, 85000),
+    'educator': (55000, 90000),
+    
+    # Other common roles
+    'consultant': (90000, 170000),
+    'advisor': (85000, 150000),
+    'specialist': (70000, 120000),
+    'researcher': (75000, 130000),
+    'student': (0, 30000),
+    'intern': (30000, 60000),
+    'associate': (65000, 110000),
+}
+
+# Default range for unknown professions
+DEFAULT_SALARY_RANGE = (60000, 100000)
+
+
+def estimate_income(result):
+    """Fill in one matched result's income estimate in place."""
+    # Skip if we already have an estimate, or there is no profile title to base one on
+    if result.income is not None or not result.url:
+        return result
+
+    title = (result.title or "").lower()
+
+    if title == "not found" or not title:
+        return result
+
+    # Find matching salary range
+    matched_range = None
+    for keyword, salary_range in SALARY_RANGES.items():
+        if keyword in title:
+            matched_range = salary_range
+            break
+
+    # Use default if no match found
+    if not matched_range:
+        matched_range = DEFAULT_SALARY_RANGE
+
+    # Add some randomness within the range
+    result.income = random.randint(matched_range[0], matched_range[1])
+    return result
+
+
+def finalize_income_estimates(results):
+    with metrics.stage("finalize"):
+        for result in results:
+            estimate_income(result)
+
+    logger.info(f"📊 Income estimates added for {len(results)} results")
+    return results
+
+# ────────────────────────────────────────────────────────────────
+# Task orchestration (bounded window of futures per job)
+# ────────────────────────────────────────────────────────────────
+
+# Column order shared by every export (see export_row)
+RESULT_COLUMNS = [
+    "First Name", "Last Name", "University", "Graduation Year", "LinkedIn Title",
+    "LinkedIn URL", "Status", "Score", "Location (Estimated)", "Income (Estimated)",
+]
+
+# Parquet types for the numeric export columns; everything else is a string
+NUMERIC_COLUMN_TYPES = {"Score": "float64", "Income (Estimated)": "int64"}
+
+def read_people_csv(raw: bytes):
+    """Decode an uploaded CSV (any encoding chardet can guess) into a DataFrame."""
+    encoding = chardet.detect(raw)['encoding'] or "utf-8"
+    return pd.read_csv(io.StringIO(raw.decode(encoding)))
+
+
+def iter_people(df):
+    """Yield one person dict per DataFrame row without materialising the whole list."""
+    columns = list(df.columns)
+    for row in df.itertuples(index=False, name=None):
+        yield dict(zip(columns, row))
+
+
+# ────────────────────────────────────────────────────────────────
+# Indexed result store (server-side paging, sorting & filtering)
+# ────────────────────────────────────────────────────────────────
+
+# DataTable filter operators (and their spelled-out forms) → canonical operator
+FILTER_OPERATORS = {
+    ">=": ">=", "ge": ">=", "<=": "<=", "le": "<=", "<": "<", "lt": "<", ">": ">", "gt": ">",
+    "!=": "!=", "ne": "!=", "=": "=", "eq": "=", "contains": "contains",
+    "datestartswith": "datestartswith",
+}
+_FILTER_PART = re.compile(r"\s*\{(.+?)\}\s*([is]?(?:>=|<=|!=|<|>|=)|[a-z]+)\s*(.*?)\s*$")
+# Placeholders the pipeline writes for missing data; they sort with the blanks
+MISSING_VALUES = {"", "N/A", "Unknown", "Not Found"}
+
+
+def parse_filter_query(filter_query):
+    """Split a DataTable ``filter_query`` into ``(column, operator, value)`` triples.
+
+    ``'{Score} >= 80 && {Status} contains "Match"'`` →
+    ``[("Score", ">=", "80"), ("Status", "contains", "Match")]``
+    """
+    parts = []
+    for part in (filter_query or "").split(" && "):
+        m = _FILTER_PART.match(part)
+        if not m:
+            continue
+        column, op, value = m.groups()
+        if op not in FILTER_OPERATORS and op[:1] in ("i", "s"):
+            op = op[1:]  # case-sensitivity prefixes (icontains, seq, …) — always case-insensitive here
+        if op not in FILTER_OPERATORS:
+            continue
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'`":
+            value = value[1:-1].replace("\\" + value[0], value[0])
+        parts.append((column, FILTER_OPERATORS[op], value))
+    return parts
+
+
+def numeric_value(value):
+    """``87`` for ``"87%"``, ``123456`` for ``"$123,456"``; ``None`` if not a number."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    try:
+        return float(str(value).replace("$", "").replace(",", "").replace("%", "").strip())
+    except ValueError:
+        return None
+
+
+def sort_key(value):
+    """Numbers before text, numbers numerically, text case-insensitively; blanks last."""
+    number = numeric_value(value)
+    if number is not None and number == number:  # NaN sorts with the blanks
+        return (0, number, "")
+    if value is None or number is not None or str(value) in MISSING_VALUES:
+        return (2, 0, "")
+    return (1, 0, str(value).lower())
+
+
+def _ordered_ids(keyed_ids, descending):
+    """Walk ascending ``(sort_key, row_id)`` pairs in either direction, blanks last both ways."""
+    if not descending:
+        return (row_id for _, row_id in keyed_ids)
+    present = (row_id for key, row_id in reversed(keyed_ids) if key[0] != 2)
+    blanks = (row_id for key, row_id in keyed_ids if key[0] == 2)
+    return itertools.chain(present, blanks)
+
+
+def filter_matches(value, op, target):
+    if op == "contains":
+        return str(target).lower() in str(value).lower()
+    if op == "datestartswith":
+        return str(value).startswith(str(target))
+    a, b = numeric_value(value), numeric_value(target)
+    if a is None or b is None:
+        a, b = str(value).lower(), str(target).lower()
+    if op == "=":
+        return a == b
+    if op == "!=":
+        return a != b
+    try:
+        return {"<": a < b, "<=": a <= b, ">": a > b, ">=": a >= b}[op]
+    except TypeError:
+        return False
+
+
+class ResultStore:
+    """Append-only result rows with indexes for server-side paging, sorting and filtering.
+
+    ``INDEXED_COLUMNS`` keep value → row-id postings, so filtering on them only
+    tests each distinct value; ``SORTED_COLUMNS`` keep a bisect-maintained
+    ``(key, row-id)`` list, so sorting by them just walks the index until the
+    requested page is full. Other columns fall back to a scan or a cached sort.
+    """
+
+    INDEXED_COLUMNS = ("Status", "Location (Estimated)", "University")
+    SORTED_COLUMNS = ("Score",)
+
+    # Rows are SearchResult records; filters and sorts see column_value()
+
+    def __init__(self):
+        self._rows = []
+        self._postings = {c: {} for c in self.INDEXED_COLUMNS}
+        self._sorted = {c: [] for c in self.SORTED_COLUMNS}
+        self._stale = set()  # sorted columns to rebuild before their next use
+        self._order_cache = {}  # column → (row count, ascending row ids)
+        self._lock = threading.Lock()
+
+    def append(self, row):
+        with self._lock:
+            row_id = len(self._rows)
+            self._rows.append(row)
+            for column, postings in self._postings.items():
+                postings.setdefault(column_value(row, column), set()).add(row_id)
+            for column, index in self._sorted.items():
+                if column not in self._stale:
+                    bisect.insort(index, (sort_key(column_value(row, column)), row_id))
+
+    def replace(self, rows):
+        """Swap in edited copies of rows (``{row id: row}``), keeping the indexes in step.
+
+        A large batch marks the sorted indexes stale instead of moving each row;
+        the next sort or range filter on them rebuilds them once.
+        """
+        with self._lock:
+            bulk = len(rows) * 8 > len(self._rows)
+            if bulk:
+                self._stale.update(self._sorted)
+            for row_id, row in rows.items():
+                old = self._rows[row_id]
+                for column, postings in self._postings.items():
+                    value = column_value(old, column)
+                    postings[value].discard(row_id)
+                    if not postings[value]:
+                        del postings[value]
+                    postings.setdefault(column_value(row, column), set()).add(row_id)
+                for column, index in self._sorted.items():
+                    if column not in self._stale:
+                        del index[bisect.bisect_left(index, (sort_key(column_value(old, column)), row_id))]
+                        bisect.insort(index, (sort_key(column_value(row, column)), row_id))
+                self._rows[row_id] = row
+            self._order_cache.clear()
+
+    def _sorted_index(self, column):
+        # Caller holds self._lock
+        if column in self._stale:
+            self._sorted[column] = sorted((sort_key(column_value(row, column)), i) for i, row in enumerate(self._rows))
+            self._stale.discard(column)
+        return self._sorted.get(column)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __iter__(self):
+        return iter(self._rows[:])
+
+    def __getitem__(self, item):
+        return self._rows[item]
+
+    def query(self, filter_query="", sort_by=None, offset=0, limit=10):
+        """Return ``(page_rows, matching_count)`` for one DataTable page."""
+        with self._lock:
+            count = len(self._rows)
+            candidates = None  # None means every row
+            for column, op, target in parse_filter_query(filter_query):
+                candidates = self._filter(column, op, target, candidates, count)
+            total = count if candidates is None else len(candidates)
+            end = offset + limit
+            if sort_by:
+                ids = self._sorted_ids(sort_by[0]["column_id"], sort_by[0].get("direction") == "desc",
+                                       candidates, count, end)
+            elif candidates is None:
+                ids = range(min(end, count))
+            else:
+                ids = sorted(candidates)[:end]
+            return [self._rows[i] for i in ids[offset:end]], total
+
+    def _filter(self, column, op, target, candidates, count):
+        postings = self._postings.get(column)
+        index = self._sorted_index(column)
+        number = numeric_value(target)
+        if index is not None and number is not None and op in ("<", "<=", ">", ">="):
+            # Numeric range straight off the sorted index
+            lo = bisect.bisect_left(index, ((0, number, ""),))
+            hi = bisect.bisect_right(index, ((0, number, "\uffff"), float("inf")))
+            numbers_end = bisect.bisect_left(index, ((1,),))
+            span = {"<": (0, lo), "<=": (0, hi), ">": (hi, numbers_end), ">=": (lo, numbers_end)}[op]
+            ids = {row_id for _, row_id in index[span[0]:span[1]]}
+        elif postings is not None:
+            ids = set()
+            for value, row_ids in postings.items():
+                if filter_matches("" if value is None else value, op, target):
+                    ids.update(row_ids)
+        else:
+            ids = set()
+            for i in (range(count) if candidates is None else candidates):
+                value = column_value(self._rows[i], column)
+                if filter_matches("" if value is None else value, op, target):
+                    ids.add(i)
+        return ids if candidates is None else ids & candidates
+
+    def _sorted_ids(self, column, descending, candidates, count, needed):
+        if column in self._sorted:
+            keyed_ids = self._sorted_index(column)
+        else:
+            cached = self._order_cache.get(column)
+            if not cached or cached[0] != count:
+                cached = (count, sorted((sort_key(column_value(self._rows[i], column)), i) for i in range(count)))
+                self._order_cache[column] = cached
+            keyed_ids = cached[1]
+        ordered = _ordered_ids(keyed_ids, descending)
+        ids = []
+        for row_id in ordered:
+            if row_id < count and (candidates is None or row_id in candidates):
+                ids.append(row_id)
+                if len(ids) >= needed:
+                    break
+        return ids
+
+
+class CandidateMatrix:
+    """A job's kept candidates as flat numpy columns, so new thresholds re-rank it in one pass.
+
+    Results are append-only, so ``sync()`` only reads rows recorded since its last
+    call. Rows without candidates (index hits, errors, timeouts) are left out.
+    """
+
+    RANKED = (MatchStatus.MATCH, MatchStatus.NO_MATCH)
+
+    def __init__(self):
+        self._synced = 0
+        self._columns = ([], [], [], [])  # row id, position in the row's candidates, cosine, fuzzy
+        self._rows = []  # ranked row ids, ascending
+        self._chosen = []  # each ranked row's current choice, -1 for no match
+        self._arrays = None
+
+    def sync(self, results):
+        row_ids, positions, cosines, fuzzies = self._columns
+        for row_id in range(self._synced, len(results)):
+            res = results[row_id]
+            if not res.candidates or res.status not in self.RANKED:
+                continue
+            for position, candidate in enumerate(res.candidates):
+                row_ids.append(row_id)
+                positions.append(position)
+                cosines.append(candidate.cosine)
+                fuzzies.append(candidate.fuzzy)
+            self._rows.append(row_id)
+            self._chosen.append(-1 if res.choice is None else res.choice)
+            self._arrays = None
+        self._synced = len(results)
+
+    def rescore(self, cosine_threshold, fuzzy_threshold):
+        """``[(row id, new choice or None), ...]`` for the rows whose match changes."""
+        if not self._rows:
+            return []
+        if self._arrays is None:
+            row_ids, positions, cosines, fuzzies = self._columns
+            row_ids = np.array(row_ids)
+            starts = np.flatnonzero(np.r_[True, row_ids[1:] != row_ids[:-1]])  # each row's first candidate
+            self._arrays = (starts, np.diff(np.r_[starts, len(row_ids)]), np.array(positions),
+                            np.array(cosines), np.array(fuzzies), np.array(self._rows), np.array(self._chosen))
+        starts, counts, positions, cosines, fuzzies, rows, chosen = self._arrays
+        passes = (cosines >= cosine_threshold) | (fuzzies >= fuzzy_threshold)
+        scores = np.where(passes, np.maximum(cosines, fuzzies), -np.inf)
+        # Per row: the highest passing score, earliest candidate on ties (as pick_candidate)
+        best = np.maximum.reduceat(scores, starts)
+        at_best = scores == np.repeat(best, counts)
+        first = np.minimum.reduceat(np.where(at_best, positions, len(positions)), starts)
+        choices = np.where(np.isfinite(best), first, -1)
+        changed = np.flatnonzero(choices != chosen)
+        chosen[changed] = choices[changed]
+        self._chosen = chosen.tolist()
+        return [(int(rows[i]), None if choices[i] < 0 else int(choices[i])) for i in changed]
+
+
+class _Task:
+    """One person's search as the watchdog sees it."""
+
+    __slots__ = ("person", "token", "requeues", "thread", "started_at")
+
+    def __init__(self, person, token, requeues=0):
+        self.person = person
+        self.token = token
+        self.requeues = requeues
+        self.thread = None
+        self.started_at = None  # monotonic time the worker picked it up
+
+    def driver_alive(self):
+        driver = self.token.driver
+        process = getattr(getattr(driver, "service", None), "process", None)
+        return driver is None or (process is not None and process.poll() is None)
+
+    def stack(self):
+        frame = sys._current_frames().get(self.thread.ident) if self.thread else None
+        return "".join(traceback.format_stack(frame)) if frame else "  (not running)\n"
+
+
+class SearchJob:
+    """One search run over a lazy people source.
+
+    At most ``window`` futures are submitted to ``pool`` at a time; each completion
+    records its result and tops the window back up, so memory and the cost of
+    ``stop()`` depend only on what is in flight, never on the size of the input.
+    """
+
+    locate_rescored = True  # run NER for matches a rescore() picks that were never chosen before
+
+    def __init__(self, people, total=None, cosine_threshold=0.4, fuzzy_threshold=0.75,
+                 serpapi_key=None, engine="auto", pool=None, window=None, on_result=None,
+                 keep_results=True, owner=None, budget=None, index=profile_index, priority=Priority.BATCH):
+        self.id = uuid.uuid4().hex[:12]
+        self.owner = owner
+        self.created_at = time.time()
+        self.stopped = False
+        self.incomes_finalized = False
+        self.pool = pool or executor
+        self.window = window or TASK_WINDOW_PER_WORKER * self.pool._max_workers
+        self.total = total if total is not None else len(people)
+        self.settings = (cosine_threshold, fuzzy_threshold, serpapi_key, engine)
+        self.thresholds = (cosine_threshold, fuzzy_threshold)  # what results are ranked by; see rescore()
+        self.budget = budget  # seconds per person; None means PERSON_BUDGET_SECONDS
+        self.index = index  # ProfileIndex consulted before searching; None always searches
+        self.priority = Priority(priority)
+        self.on_result = on_result
+        self.keep_results = keep_results  # False when on_result streams rows elsewhere
+        self.results = ResultStore()
+        self._ranking = CandidateMatrix()
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hung_tasks = 0
+        self.from_index = 0
+        self.active = False
+        self.started_at = None
+        self.last_result_time = None
+        self.finished = threading.Event()
+        self.cancel_token = CancelToken()  # reaches searches already running
+        self._source = iter(people)
+        self._pending = {}  # in-flight future → _Task
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)  # notified per recorded result and at the end
+        self._filling = threading.local()
+        self._to_locate = deque()  # (row id, person or None) waiting for the locator thread
+        self._locating = False
+        self._locate_lock = threading.Lock()
+
+    # ── lifecycle ──
+
+    def start(self):
+        with self._lock:
+            self.active = True
+            self.started_at = time.time()
+        logger.info(f"🚀 Starting search for {self.total} person(s) — window of {self.window} in flight")
+        threading.Thread(target=self._watch, name=f"watchdog-{self.id}", daemon=True).start()
+        self._fill()
+        return self
+
+    def stop(self):
+        """Drop the unsubmitted remainder, cancel queued searches and abort running ones.
+
+        Running searches see the cancel token: HTTP waits return at once and their
+        Chrome sessions are killed; anything they still report afterwards is dropped.
+        """
+        with self._lock:
+            self._source = None
+            in_flight = list(self._pending)
+            if self.active:
+                self.stopped = True
+            self._finish()
+        self.cancel_token.cancel()
+        for fut in in_flight:
+            fut.cancel()
+
+    def wait(self, timeout=None):
+        return self.finished.wait(timeout)
+
+    def finalize_incomes(self):
+        """Estimate incomes for every recorded row once the job has ended (runs once)."""
+        with self._lock:
+            if self.active or self.incomes_finalized:
+                return
+            self.incomes_finalized = True
+            logger.info("📊 Finalizing income data before displaying table...")
+            # Estimated on copies, so readers never see a row change under them
+            rows = {row_id: replace(row) for row_id, row in enumerate(self.results) if row.income is None and row.url}
+            finalize_income_estimates(list(rows.values()))
+            self.results.replace(rows)
+
+    def rescore(self, cosine_threshold, fuzzy_threshold):
+        """Re-rank every result from its kept candidates under new thresholds — no new searches.
+
+        Results still to come are ranked the same way. Returns how many rows changed.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            self.thresholds = (cosine_threshold, fuzzy_threshold)
+            self._ranking.sync(self.results)
+            changes = self._ranking.rescore(cosine_threshold, fuzzy_threshold)
+            rows = {row_id: replace(self.results[row_id]).choose(choice, locate=False) for row_id, choice in changes}
+            if self.incomes_finalized:
+                for row in rows.values():
+                    estimate_income(row)
+            self.results.replace(rows)
+            self._changed.notify_all()
+        if self.locate_rescored:
+            self._locate_later((row_id, None) for row_id, row in rows.items()
+                               if row.choice is not None and row.candidates[row.choice].location is None)
+        elapsed = time.perf_counter() - start
+        metrics.observe("rescore_seconds", elapsed)
+        logger.info(f"🎚️ Re-ranked {len(self.results)} result(s) at cosine {cosine_threshold} / "
+                    f"fuzzy {fuzzy_threshold}: {len(changes)} changed in {elapsed * 1000:.0f} ms")
+        return len(changes)
+
+    def _locate_later(self, rows):
+        """Queue ``(row id, person or None)`` matches for NER on the job's one locator thread.
+
+        With a person, the locator also stores the match in the profile index once
+        its location is known.
+        """
+        with self._locate_lock:
+            self._to_locate.extend(rows)
+            if self._to_locate and not self._locating:
+                self._locating = True
+                threading.Thread(target=self._locate, name=f"locate-{self.id}", daemon=True).start()
+
+    def _locate(self):
+        while True:
+            with self._locate_lock:
+                if not self._to_locate:
+                    self._locating = False
+                    return
+                row_id, person = self._to_locate.popleft()
+            with self._lock:
+                row = self.results[row_id]
+                candidate = row.candidates[row.choice] if row.choice is not None else None
+            if candidate is None:
+                continue  # re-ranked to no match meanwhile
+            try:
+                location = candidate.locate()  # cached after the first time, however often it was queued
+            except Exception as e:
+                logger.warning(f"⚠️ Location lookup for result {row_id + 1} failed: {e}")
+                continue
+            with self._lock:
+                row = self.results[row_id]
+                if row.choice is None or row.candidates[row.choice] is not candidate:
+                    continue  # re-ranked again; that rescore queued the new match
+                if row.location != location:
+                    row = replace(row, location=location)
+                    self.results.replace({row_id: row})
+                    self._changed.notify_all()
+            if person is not None and self.index:
+                self.index.store(person, row)
+
+    def alternatives(self, seq, k=3):
+        """The ``k`` best other candidates for result ``seq``, best first, flagged if they pass the thresholds."""
+        if not 1 <= seq <= len(self.results):
+            return []
+        row = self.results[seq - 1]
+        seen = {row.url}
+        ranked = []
+        for i in sorted(range(len(row.candidates or ())), key=lambda i: -row.candidates[i].score):
+            candidate = row.candidates[i]
+            if i == row.choice or candidate.url in seen:
+                continue  # the match itself, or a hit both engines returned
+            seen.add(candidate.url)
+            ranked.append({
+                "title": extract_best_title(candidate.title),
+                "url": candidate.url,
+                "snippet": candidate.snippet,
+                "score": round(candidate.score, 4),
+                "cosine": round(candidate.cosine, 4),
+                "fuzzy": round(candidate.fuzzy, 4),
+                "location": candidate.location or "Unknown",
+                "passes": candidate.passes(*self.thresholds),
+            })
+            if len(ranked) >= k:
+                break
+        return ranked
+
+    def wait_for_change(self, seq, timeout=None):
+        """Block until a result after ``seq`` is recorded or the job ends; True if either happened."""
+        with self._changed:
+            return self._changed.wait_for(lambda: self.completed != seq or not self.active, timeout)
+
+    # ── progress ──
+
+    @property
+    def done_count(self):
+        return self.completed
+
+    @property
+    def seq(self):
+        """Sequence number of the newest recorded result (0 before the first)."""
+        return self.completed
+
+    @property
+    def in_flight(self):
+        return len(self._pending)
+
+    def tasks_in_flight(self):
+        with self._lock:
+            return list(self._pending.values())
+
+    @property
+    def status(self):
+        if self.active:
+            return "running"
+        if self.started_at is None:
+            return "pending"
+        return "stopped" if self.stopped else "finished"
+
+    @property
+    def stalled(self):
+        last = self.last_result_time or self.started_at
+        return bool(self.active and last and time.time() - last > STALL_SECONDS)
+
+    def snapshot(self):
+        """JSON-ready progress summary."""
+        return {
+            "id": self.id,
+            "status": self.status,
+            "priority": self.priority.name.lower(),
+            "cosine_threshold": self.thresholds[0],
+            "fuzzy_threshold": self.thresholds[1],
+            "total": self.total,
+            "completed": self.done_count,
+            "seq": self.seq,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "hung_tasks": self.hung_tasks,
+            "from_index": self.from_index,
+            "in_flight": self.in_flight,
+            "stalled": self.stalled,
+            "rate_per_sec": round(self.rate(), 3),
+            "eta_seconds": int(self.eta()),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+        }
+
+    def rate(self):
+        elapsed = time.time() - self.started_at if self.started_at else 0
+        return self.done_count / elapsed if elapsed > 0 else 0
+
+    def eta(self):
+        speed = self.rate()
+        return (self.total - self.done_count) / speed if speed > 0 else 0
+
+    # ── internals ──
+
+    def _finish(self):
+        # Caller holds self._lock
+        if self.active:
+            self.active = False
+            self.finished.set()
+            self._changed.notify_all()
+            logger.info("✅ All tasks finished")
+
+    def _fill(self):
+        """Top the pool up to ``window`` in-flight searches from the source."""
+        if getattr(self._filling, "active", False):
+            return  # re-entered from an inline _done; the outer loop keeps filling
+        self._filling.active = True
+        try:
+            while True:
+                with self._lock:
+                    if self._source is None or len(self._pending) >= self.window:
+                        return
+                    person = next(self._source, None)
+                    if person is None:
+                        self._source = None
+                        if not self._pending:
+                            self._finish()
+                        return
+                    known = self.index.lookup(person, *self.thresholds) if self.index else None
+                    if known:
+                        self.from_index += 1
+                        metrics.inc("index_hits_total")
+                        self._record(known)
+                        continue
+                    fut = self._submit(person)
+                # Outside the lock: a future that is already done runs _done inline
+                fut.add_done_callback(self._done)
+        finally:
+            self._filling.active = False
+
+    def _submit(self, person, requeues=0):
+        # Caller holds self._lock and adds the _done callback after releasing it
+        task = _Task(person, self.cancel_token.child(), requeues)
+        if isinstance(self.pool, PriorityExecutor):
+            fut = self.pool.submit_at(self.priority, self._run, task, user=self.owner, job=self.id)
+        else:
+            fut = self.pool.submit(self._run, task)
+        self._pending[fut] = task
+        return fut
+
+    def _run(self, task):
+        task.thread = threading.current_thread()
+        task.started_at = time.monotonic()
+        try:
+            return search_person(task.person, *self.settings, cancel=task.token, budget=self.budget, owner=self.owner)
+        finally:
+            self.cancel_token.release(task.token)
+
+    def _done(self, fut):
+        with self._lock:
+            task = self._pending.pop(fut, None)
+            if task is None:
+                return  # abandoned by the watchdog
+            if fut.cancelled() or task.token.cancelled:
+                return  # late results of a stopped job are dropped
+            try:
+                res = fut.result() or SearchResult.for_person(task.person)
+            except Exception as e:
+                logger.error(f"Task failure: {e}")
+                metrics.inc("errors_total", kind="task")
+                self.errors += 1
+                res = SearchResult.for_person(task.person, title="Error", status=MatchStatus.ERROR)
+            located_later = self._record(res, task.person)
+        if self.index and not located_later:
+            self.index.store(task.person, res)
+        self._fill()
+
+    def _record(self, res, person=None):
+        """Append one result; True if the locator thread will fill its location and index it."""
+        # Caller holds self._lock
+        located_later = False
+        if res.candidates and res.status in CandidateMatrix.RANKED and self.thresholds != self.settings[:2]:
+            res.choose(pick_candidate(res.candidates, *self.thresholds), locate=False)  # searched before a rescore()
+            if (res.choice is not None and res.candidates[res.choice].location is None
+                    and self.keep_results and self.locate_rescored):
+                self._locate_later([(len(self.results), person)])
+                located_later = True
+        self.timeouts += res.status is MatchStatus.TIMEOUT
+        metrics.inc("results_total", status=res.status.value)
+        metrics.inc("user_results_total", user=self.owner or "-")
+        self.completed += 1
+        res.seq = self.completed  # monotonic per-job sequence number
+        if self.keep_results:
+            self.results.append(res)
+        self.last_result_time = time.time()
+        if self.on_result:
+            self.on_result(res)
+        self._changed.notify_all()
+        if self._source is None and not self.in_flight:
+            self._finish()
+        return located_later
+
+    # ── watchdog ──
+
+    def _watch(self):
+        """Abort searches that overrun their budget or whose Chrome died, then requeue them."""
+        limit = (PERSON_BUDGET_SECONDS if self.budget is None else self.budget) + HUNG_TASK_GRACE_SECONDS
+        while not self.finished.wait(WATCHDOG_INTERVAL):
+            now = time.monotonic()
+            retries = []
+            with self._lock:
+                hung = [(fut, task) for fut, task in self._pending.items()
+                        if task.started_at and (now - task.started_at > limit or not task.driver_alive())]
+                for fut, task in hung:
+                    del self._pending[fut]  # its result, if it ever comes, is ignored
+                    self.hung_tasks += 1
+                    metrics.inc("watchdog_kills_total")
+                    if not self.active:
+                        continue
+                    if task.requeues < WATCHDOG_MAX_REQUEUES:
+                        retries.append(self._submit(task.person, task.requeues + 1))
+                    else:
+                        self._record(SearchResult.for_person(task.person, title="Timed Out",
+                                                             status=MatchStatus.TIMEOUT))
+            for retry in retries:
+                retry.add_done_callback(self._done)
+            for fut, task in hung:
+                self._recover(fut, task, now - task.started_at)
+            if hung:
+                self._fill()
+
+    def _recover(self, fut, task, elapsed):
+        name = f"{task.person['First Name']} {task.person['Last Name']}"
+        reason = "its Chrome died" if not task.driver_alive() else f"no answer after {elapsed:.0f}s"
+        logger.error(f"🐶 Watchdog: search for {name} on {task.thread.name} hung ({reason}) — "
+                     f"killing it{' and requeueing' if task.requeues < WATCHDOG_MAX_REQUEUES else ''}. "
+                     f"Stack:\n{task.stack()}")
+        task.token.cancel()  # kills its Chrome and wakes any HTTP wait
+
+        # A thread stuck in native code can't be killed; stand in a fresh worker until it returns
+        if not self.finished.wait(1) and not fut.done():
+            logger.error(f"🐶 Watchdog: {task.thread.name} still stuck after the kill — adding a "
+                         f"replacement worker. Stack:\n{task.stack()}")
+            self.pool._max_workers += 1
+            fut.add_done_callback(lambda _: setattr(self.pool, "_max_workers", self.pool._max_workers - 1))
+
+class JobRegistry:
+    """Thread-safe id → SearchJob map shared by the dashboard and the REST API.
+
+    Running jobs are always kept; only the newest ``max_finished`` finished or
+    stopped jobs are retained so long-lived servers don't accumulate results.
+    """
+
+    def __init__(self, max_finished=20):
+        self.max_finished = max_finished
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def add(self, job):
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, owner=None):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [j for j in jobs if owner is None or j.owner == owner]
+
+    def _prune(self):
+        done = sorted((j for j in self._jobs.values() if not j.active and j.started_at),
+                      key=lambda j: j.created_at)
+        for job in done[:max(0, len(done) - self.max_finished)]:
+            del self._jobs[job.id]
+
+
+job_registry = JobRegistry()
+metrics.gauge("queue_depth", "People not yet searched across running jobs",
+              lambda: sum(job.total - job.done_count for job in job_registry.list() if job.active))
+metrics.gauge("in_flight_searches", "Searches submitted to the worker pool and not yet done",
+              lambda: sum(job.in_flight for job in job_registry.list() if job.active))
+metrics.gauge("running_jobs", "Jobs currently running",
+              lambda: sum(job.active for job in job_registry.list()))
+
+# ────────────────────────────────────────────────────────────────
+# Live operations view (dashboard panel and /api/ops)
+# ────────────────────────────────────────────────────────────────
+
+OPS_SAMPLE_SECONDS = float(os.getenv("OPS_SAMPLE_SECONDS", "5"))
+OPS_HISTORY_SECONDS = float(os.getenv("OPS_HISTORY_SECONDS", "1800"))
+OPS_RATE_WINDOW_SECONDS = 60  # "recent" for error/timeout rates and the throughput drop check
+SERPAPI_QUOTA_REFRESH_SECONDS = 60
+# Stages shown in the queue-depth view, in pipeline order
+OPS_STAGES = ("serpapi_request", "driver_create", "bing_wait", "page_load", "extraction", "inference_wait", "encode", "ner")
+# Warn when recent throughput falls below this share of the run's earlier throughput
+OPS_THROUGHPUT_DROP = 0.5
+OPS_ERROR_RATE_WARN = 0.2
+OPS_TIMEOUT_RATE_WARN = 0.1
+
+
+class OpsMonitor:
+    """Live operations summary built from ``metrics`` and the running jobs — no log parsing.
+
+    A daemon thread copies the cumulative counters into a bounded history every
+    ``interval`` seconds (and refreshes the SerpAPI quota once a minute), so
+    throughput over time and recent error rates cost nothing to serve.
+    """
+
+    def __init__(self, registry, interval=OPS_SAMPLE_SECONDS, history_seconds=OPS_HISTORY_SECONDS):
+        self.registry = registry
+        self.interval = interval
+        self._samples = deque(maxlen=max(2, int(history_seconds / interval)))
+        self._quota = {}  # api key → searches left (None if unknown)
+        self._quota_checked = 0.0
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="ops-monitor", daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            sample = self._sample()
+            with self._lock:
+                self._samples.append(sample)
+            if sample[0] - self._quota_checked >= SERPAPI_QUOTA_REFRESH_SECONDS:
+                self._quota_checked = sample[0]
+                for key in self._serpapi_keys():
+                    self._quota[key] = serpapi_searches_left(key)
+            time.sleep(self.interval)
+
+    @staticmethod
+    def _sample():
+        return (time.time(), metrics.by_label("results_total", "status"),
+                metrics.by_label("searches_total", "engine"), metrics.value("index_hits_total"),
+                metrics.by_label("user_results_total", "user"))
+
+    def _serpapi_keys(self):
+        keys = [job.settings[2] for job in self.registry.list() if job.active and job.settings[3] != "bing"]
+        return [key for key in dict.fromkeys([*keys, os.getenv("SERPAPI_KEY")]) if key]
+
+    def snapshot(self, owner=None, slowest=5):
+        """JSON-ready operations view; ``owner`` limits the in-flight names to their jobs."""
+        now = self._sample()
+        with self._lock:
+            samples = [*self._samples, now]
+        jobs = [job for job in self.registry.list() if job.active]
+        tasks = [(job, task) for job in jobs for task in job.tasks_in_flight()]
+        running = [(job, task) for job, task in tasks if task.started_at]
+        pools = {id(job.pool): job.pool for job in jobs} or {id(executor): executor}
+
+        stages = metrics.by_label("stage_in_progress", "stage")
+        queue_depth = {
+            "waiting": sum(max(0, job.total - job.done_count - job.in_flight) for job in jobs),
+            "queued_for_worker": len(tasks) - len(running),
+            **{stage: stages.get(stage, 0) for stage in OPS_STAGES},
+        }
+
+        mono = time.monotonic()
+        in_flight = sorted(((mono - task.started_at, job, task) for job, task in running
+                            if owner is None or job.owner == owner), key=lambda t: -t[0])[:slowest]
+
+        quota_keys = self._serpapi_keys()
+        snapshot = {
+            "time": now[0],
+            "throughput": self._throughput(samples),
+            "queue_depth": queue_depth,
+            "workers": {"busy": len(running), "size": sum(pool._max_workers for pool in pools.values())},
+            "drivers": metrics.value("active_drivers"),
+            "sources": {"serpapi": now[2].get("serpapi", 0), "bing": now[2].get("bing", 0), "index": now[3]},
+            "serpapi_quota_left": self._quota.get(quota_keys[0]) if quota_keys else None,
+            **self._recent_rates(samples, min((job.started_at for job in jobs), default=None)),
+            "slowest": [{
+                "name": f"{task.person['First Name']} {task.person['Last Name']}",
+                "job": job.id,
+                "seconds": round(seconds, 1),
+                "requeues": task.requeues,
+                "chrome": task.token.driver is not None,
+            } for seconds, job, task in in_flight],
+            "stalled_jobs": sum(job.stalled for job in jobs),
+            "bing_paused_seconds": round(bing_throttle.paused_for(), 1),
+            "users": self._users(samples, jobs, running),
+        }
+        snapshot["warnings"] = self._warnings(snapshot, jobs)
+        return snapshot
+
+    @staticmethod
+    def _throughput(samples):
+        """``[[time, results/sec], ...]`` between consecutive samples."""
+        points = []
+        for (t0, r0, *_), (t1, r1, *_) in zip(samples, samples[1:]):
+            if t1 > t0:
+                points.append([round(t1, 1), round((sum(r1.values()) - sum(r0.values())) / (t1 - t0), 3)])
+        return points
+
+    @staticmethod
+    def _recent_rates(samples, since=None):
+        """Rates over the last ``OPS_RATE_WINDOW_SECONDS``, plus the rate from ``since`` up to then."""
+        now, recent = samples[-1], samples[-1][0] - OPS_RATE_WINDOW_SECONDS
+        start = next((s for s in samples if s[0] >= recent), samples[0])
+        baseline = next((s for s in samples if s[0] >= since), start) if since else start
+        done = {k: v - start[1].get(k, 0) for k, v in now[1].items()}
+        total = sum(done.values())
+        recent_rate = total / (now[0] - start[0]) if now[0] > start[0] else 0.0
+        earlier = sum(start[1].values()) - sum(baseline[1].values())
+        # Too short a run before the window says nothing about a slowdown
+        earlier_rate = (earlier / (start[0] - baseline[0])
+                        if start[0] - baseline[0] >= OPS_RATE_WINDOW_SECONDS else None)
+        return {
+            "recent_rate_per_sec": round(recent_rate, 3),
+            "earlier_rate_per_sec": None if earlier_rate is None else round(earlier_rate, 3),
+            "recent_results": total,
+            "error_rate": round(done.get(MatchStatus.ERROR.value, 0) / total, 3) if total else 0.0,
+            "timeout_rate": round(done.get(MatchStatus.TIMEOUT.value, 0) / total, 3) if total else 0.0,
+        }
+
+    @staticmethod
+    def _users(samples, jobs, running):
+        """Per-user share, load and recent throughput, busiest first."""
+        now, recent = samples[-1], samples[-1][0] - OPS_RATE_WINDOW_SECONDS
+        start = next((s for s in samples if s[0] >= recent), samples[0])
+        users = {}
+        for user in [*(job.owner or "-" for job in jobs), *now[4]]:
+            share = user_shares.get(user)
+            users.setdefault(user, {
+                "user": user, "weight": share["weight"], "max_concurrency": share["max_concurrency"],
+                "jobs": 0, "running": 0, "remaining": 0, "results": now[4].get(user, 0),
+                "rate_per_sec": round((now[4].get(user, 0) - start[4].get(user, 0)) / (now[0] - start[0]), 3)
+                if now[0] > start[0] else 0.0,
+                "serpapi_today": user_shares.serpapi_today(user),
+                "serpapi_daily_limit": share["serpapi_daily_limit"],
+            })
+        for job in jobs:
+            users[job.owner or "-"]["jobs"] += 1
+            users[job.owner or "-"]["remaining"] += job.total - job.done_count
+        for job, _ in running:
+            users[job.owner or "-"]["running"] += 1
+        return sorted(users.values(), key=lambda u: (-u["running"], -u["remaining"], u["user"]))
+
+    @staticmethod
+    def _warnings(snapshot, jobs):
+        warnings = []
+        if not jobs:
+            return warnings
+        earlier, recent = snapshot["earlier_rate_per_sec"], snapshot["recent_rate_per_sec"]
+        if earlier and recent < earlier * OPS_THROUGHPUT_DROP:
+            warnings.append(f"Throughput fell to {recent:.2f}/sec from {earlier:.2f}/sec")
+        if snapshot["recent_results"] and snapshot["error_rate"] >= OPS_ERROR_RATE_WARN:
+            warnings.append(f"{snapshot['error_rate']:.0%} of recent results are errors")
+        if snapshot["recent_results"] and snapshot["timeout_rate"] >= OPS_TIMEOUT_RATE_WARN:
+            warnings.append(f"{snapshot['timeout_rate']:.0%} of recent results timed out")
+        budget = min(PERSON_BUDGET_SECONDS if job.budget is None else job.budget for job in jobs)
+        if snapshot["slowest"] and snapshot["slowest"][0]["seconds"] > budget / 2:
+            slow = snapshot["slowest"][0]
+            warnings.append(f"{slow['name']} has been searching for {slow['seconds']:.0f}s")
+        if snapshot["bing_paused_seconds"]:
+            warnings.append(f"Bing is paused for {snapshot['bing_paused_seconds']:.0f}s after a captcha or block page")
+        quota, waiting = snapshot["serpapi_quota_left"], snapshot["queue_depth"]["waiting"]
+        if quota is not None and quota < waiting:
+            warnings.append(f"SerpAPI quota ({quota}) won't cover the {waiting} people still waiting")
+        return warnings
+
+
+ops_monitor = OpsMonitor(job_registry)
+
+# ────────────────────────────────────────────────────────────────
+# Durable work queue (distributed worker mode)
+# ────────────────────────────────────────────────────────────────
+
+# Set WORK_QUEUE_PATH to make the dashboard a coordinator: searches are queued in
+# this SQLite file and run by `LinkedinProfileFinder.py worker` processes
+WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH")
+LEASE_SECONDS = float(os.getenv("LEASE_SECONDS", "30"))
+QUEUE_MAX_ATTEMPTS = 3  # leases a person may lose (dead or hung worker) before it is recorded as timed out
+QUEUE_POLL_SECONDS = 1.0
+QUEUE_FEED_CHUNK = 500  # people the coordinator queues per pass, between result collections
+
+WORK_QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY, settings TEXT, priority INTEGER NOT NULL DEFAULT 1,
+    cancelled INTEGER NOT NULL DEFAULT 0, created_at REAL);
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY, job TEXT NOT NULL, person TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued', worker TEXT, leased_at REAL, lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0);
+CREATE INDEX IF NOT EXISTS tasks_by_state ON tasks (state, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_by_job ON tasks (job, state);
+CREATE TABLE IF NOT EXISTS results (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT, job TEXT NOT NULL, person TEXT NOT NULL, result TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS results_by_job ON results (job, seq);
+"""
+
+
+class WorkQueue:
+    """SQLite queue of people to search, shared by one coordinator and any number of workers.
+
+    A worker leases tasks for ``lease_seconds`` and extends the lease by heartbeat
+    while it searches. A worker that dies or hangs stops extending, so its leases
+    expire and the tasks are handed out again, up to ``max_attempts`` leases per
+    person. Acked results are appended to ``results`` for the coordinator to read
+    in completion order. WAL mode lets processes on one machine share the file;
+    workers elsewhere go through the coordinator's ``/api/queue/*`` routes, since
+    SQLite locking can't be trusted on network filesystems.
+    """
+
+    def __init__(self, path, lease_seconds=LEASE_SECONDS, max_attempts=QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()  # one connection per thread
+
+    def __str__(self):
+        return self.path
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(WORK_QUEUE_SCHEMA)
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")  # take the write lock up front: no lost lease races
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        db.execute("COMMIT")
+
+    # ── coordinator side ──
+
+    def add_job(self, job_id, settings, priority=Priority.BATCH):
+        self._db().execute("INSERT OR REPLACE INTO jobs (id, settings, priority, created_at) VALUES (?, ?, ?, ?)",
+                           (job_id, json.dumps(settings), int(priority), time.time()))
+
+    def put(self, job_id, people):
+        with self._transaction() as db:
+            db.executemany("INSERT INTO tasks (job, person) VALUES (?, ?)",
+                           ((job_id, json.dumps(person, default=str)) for person in people))
+
+    def cancel_job(self, job_id):
+        """Drop the job's queued tasks; workers abort its running ones on their next heartbeat."""
+        with self._transaction() as db:
+            db.execute("UPDATE jobs SET cancelled = 1 WHERE id = ?", (job_id,))
+            db.execute("DELETE FROM tasks WHERE job = ? AND state = 'queued'", (job_id,))
+
+    def results_since(self, job_id, seq, limit=QUEUE_FEED_CHUNK):
+        """``[(seq, person, SearchResult), ...]`` acked after ``seq``, oldest first."""
+        rows = self._db().execute("""SELECT seq, person, result FROM results WHERE job = ? AND seq > ?
+                                     ORDER BY seq LIMIT ?""", (job_id, seq, limit)).fetchall()
+        return [(row_seq, json.loads(person), SearchResult.from_dict(json.loads(result)))
+                for row_seq, person, result in rows]
+
+    def in_flight(self, job_id):
+        """``(person, leased_at, attempts)`` for each of the job's leased tasks."""
+        rows = self._db().execute("SELECT person, leased_at, attempts FROM tasks WHERE job = ? AND state = 'leased'",
+                                  (job_id,)).fetchall()
+        return [(json.loads(person), leased_at, attempts) for person, leased_at, attempts in rows]
+
+    def purge(self, job_id):
+        """Forget a job that has ended, with any tasks and results left behind."""
+        with self._transaction() as db:
+            for table, column in (("tasks", "job"), ("results", "job"), ("jobs", "id")):
+                db.execute(f"DELETE FROM {table} WHERE {column} = ?", (job_id,))
+
+    # ── worker side ──
+
+    def lease(self, worker, limit, batch_limit=None):
+        """Lease up to ``limit`` tasks, at most ``batch_limit`` of them non-interactive:
+        ``[{"id", "job", "person", "settings", "priority", "attempt"}, ...]``.
+
+        Tasks go out by priority, then fair share like ``PriorityExecutor``: each
+        pick serves the owner with the fewest leased tasks per unit of
+        ``user_shares`` weight (owners at their concurrency cap wait), then that
+        owner's job with the fewest leased tasks. Leases count across all workers.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            self._expire(db, now)
+            jobs = db.execute("""
+                SELECT j.id, j.settings, j.priority,
+                       (SELECT COUNT(*) FROM tasks t WHERE t.job = j.id AND t.state = 'leased'
+                        AND t.lease_expires >= ?)
+                FROM jobs j WHERE j.cancelled = 0 ORDER BY j.created_at""", (now,)).fetchall()
+            leased_jobs = {job: leased for job, _, _, leased in jobs}
+            leased_users, waiting = {}, {}
+            for job, settings, priority, leased in jobs:
+                owner = json.loads(settings).get("owner")
+                leased_users[owner] = leased_users.get(owner, 0) + leased
+                tasks = db.execute("""SELECT id, person, attempts FROM tasks WHERE job = ? AND (state = 'queued'
+                                      OR (state = 'leased' AND lease_expires < ?)) ORDER BY id LIMIT ?""",
+                                   (job, now, limit)).fetchall()
+                if tasks:
+                    waiting[job] = (owner, settings, priority, deque(tasks))
+
+            def share(job):
+                owner, _, priority, _ = waiting[job]
+                return priority, leased_users.get(owner, 0) / user_shares.weight(owner), leased_jobs[job]
+
+            picked, batch = [], 0
+            while len(picked) < limit:
+                open_jobs = [job for job, (owner, _, priority, _) in waiting.items()
+                             if (priority == Priority.INTERACTIVE or batch_limit is None or batch < batch_limit)
+                             and (user_shares.max_concurrency(owner) is None
+                                  or leased_users.get(owner, 0) < user_shares.max_concurrency(owner))]
+                if not open_jobs:
+                    break
+                job = min(open_jobs, key=share)
+                owner, settings, priority, tasks = waiting[job]
+                task_id, person, attempts = tasks.popleft()
+                if not tasks:
+                    del waiting[job]
+                leased_users[owner] = leased_users.get(owner, 0) + 1
+                leased_jobs[job] += 1
+                batch += priority != Priority.INTERACTIVE
+                picked.append((task_id, job, person, attempts, settings, priority))
+            db.executemany("""UPDATE tasks SET state = 'leased', worker = ?, leased_at = ?, lease_expires = ?,
+                              attempts = attempts + 1 WHERE id = ?""",
+                           [(worker, now, now + self.lease_seconds, row[0]) for row in picked])
+        return [{"id": task_id, "job": job, "person": json.loads(person), "settings": json.loads(settings),
+                 "priority": priority, "attempt": attempts + 1}
+                for task_id, job, person, attempts, settings, priority in picked]
+
+    def _expire(self, db, now):
+        # Inside a transaction: settle expired leases that must not be handed out again
+        db.execute("""DELETE FROM tasks WHERE state = 'leased' AND lease_expires < ?
+                      AND job IN (SELECT id FROM jobs WHERE cancelled = 1)""", (now,))
+        exhausted = db.execute("""SELECT id, person FROM tasks WHERE state = 'leased'
+                                  AND lease_expires < ? AND attempts >= ?""", (now, self.max_attempts)).fetchall()
+        for task_id, person in exhausted:
+            logger.warning(f"⏱️ Task {task_id} lost its lease {self.max_attempts} times — recording a timeout")
+            self._complete(db, task_id, SearchResult.for_person(
+                json.loads(person), title="Timed Out", status=MatchStatus.TIMEOUT))
+
+    @staticmethod
+    def _complete(db, task_id, result):
+        db.execute("""INSERT INTO results (job, person, result)
+                      SELECT job, person, ? FROM tasks WHERE id = ?""", (json.dumps(result.to_dict()), task_id))
+        db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+
+    def heartbeat(self, worker, task_ids):
+        """Extend ``worker``'s leases; returns the ids it still holds (lost or cancelled ones are left out)."""
+        if not task_ids:
+            return []
+        marks = ",".join("?" * len(task_ids))
+        with self._transaction() as db:
+            db.execute(f"""UPDATE tasks SET lease_expires = ? WHERE worker = ? AND state = 'leased'
+                           AND id IN ({marks}) AND job NOT IN (SELECT id FROM jobs WHERE cancelled = 1)""",
+                       (time.time() + self.lease_seconds, worker, *task_ids))
+            held = db.execute(f"""SELECT t.id FROM tasks t JOIN jobs j ON j.id = t.job WHERE t.worker = ?
+                                  AND t.state = 'leased' AND j.cancelled = 0 AND t.id IN ({marks})""",
+                              (worker, *task_ids)).fetchall()
+        return [task_id for task_id, in held]
+
+    def ack(self, worker, task_id, attempt, result):
+        """Record ``result`` for the lease ``worker`` took as ``attempt``; False if that lease was lost."""
+        with self._transaction() as db:
+            row = db.execute("""SELECT t.worker, t.attempts, j.cancelled FROM tasks t JOIN jobs j ON j.id = t.job
+                                WHERE t.id = ? AND t.state = 'leased'""", (task_id,)).fetchone()
+            if row is None or row[:2] != (worker, attempt):
+                return False  # expired and re-leased: the newer lease's answer will count
+            if row[2]:
+                db.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+                return False
+            self._complete(db, task_id, result)
+        return True
+
+    def release(self, worker):
+        """Hand a stopping worker's leases straight back, without counting them as attempts."""
+        with self._transaction() as db:
+            db.execute("""UPDATE tasks SET state = 'queued', worker = NULL, lease_expires = NULL,
+                          attempts = attempts - 1 WHERE worker = ? AND state = 'leased'""", (worker,))
+
+
+class RemoteWorkQueue:
+    """The worker side of ``WorkQueue``, sent to a coordinator's ``/api/queue/*`` routes."""
+
+    def __init__(self, url, auth):
+        self.url = url.rstrip("/")
+        self.lease_seconds = LEASE_SECONDS  # replaced by the coordinator's on each lease
+        self._session = requests.Session()
+        self._session.auth = auth
+
+    def __str__(self):
+        return self.url
+
+    def _post(self, action, **body):
+        resp = self._session.post(f"{self.url}/api/queue/{action}", json=body, timeout=30)
+        resp.raise_for_status()
+        return resp.json()
+
+    def lease(self, worker, limit, batch_limit=None):
+        data = self._post("lease", worker=worker, limit=limit, batch_limit=batch_limit)
+        self.lease_seconds = data["lease_seconds"]
+        return data["tasks"]
+
+    def heartbeat(self, worker, task_ids):
+        return self._post("heartbeat", worker=worker, tasks=task_ids)["tasks"] if task_ids else []
+
+    def ack(self, worker, task_id, attempt, result):
+        return self._post("ack", worker=worker, task=task_id, attempt=attempt, result=result.to_dict())["acked"]
+
+    def release(self, worker):
+        self._post("release", worker=worker)
+
+
+class QueuedSearchJob(SearchJob):
+    """A SearchJob whose searches run in worker processes fed through a ``WorkQueue``.
+
+    The coordinator only checks the profile index, queues the rest and records the
+    results workers ack, in the order they arrive. ``in_flight`` counts people
+    queued but not yet answered. Stopping cancels the job in the queue; workers
+    abort its running searches on their next heartbeat.
+    """
+
+    locate_rescored = False  # the coordinator loads no models; re-ranked matches keep any cached location
+
+    def __init__(self, people, queue, **kwargs):
+        super().__init__(people, **kwargs)
+        self.queue = queue
+        self.queued = 0
+        self.collected = 0
+        self._result_seq = 0
+
+    @property
+    def in_flight(self):
+        return self.queued - self.collected
+
+    def tasks_in_flight(self):
+        now, mono = time.time(), time.monotonic()
+        tasks = []
+        for person, leased_at, attempts in self.queue.in_flight(self.id):
+            task = _Task(person, CancelToken(), attempts - 1)
+            task.started_at = mono - (now - leased_at)
+            tasks.append(task)
+        return tasks
+
+    def start(self):
+        with self._lock:
+            self.active = True
+            self.started_at = time.time()
+        cosine_threshold, fuzzy_threshold, serpapi_key, engine = self.settings
+        if serpapi_key:
+            # Keys never go into the queue, where every worker could read them
+            logger.info(f"🔑 Job {self.id}'s SerpAPI key stays on the coordinator; workers use their own SERPAPI_KEY")
+        self.queue.add_job(self.id, {"cosine_threshold": cosine_threshold, "fuzzy_threshold": fuzzy_threshold,
+                                     "engine": engine, "budget": self.budget, "owner": self.owner},
+                           self.priority)
+        logger.info(f"🚀 Queueing {self.total} person(s) for workers on {self.queue}")
+        threading.Thread(target=self._collect, name=f"collector-{self.id}", daemon=True).start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            self._source = None
+            if self.active:
+                self.stopped = True
+            self._finish()
+        self.queue.cancel_job(self.id)
+
+    def _feed(self):
+        """Queue the next chunk of people, answering index hits on the spot."""
+        batch, taken = [], 0
+        with self._lock:
+            if self._source is None:
+                return  # stopped meanwhile
+            for person in itertools.islice(self._source, QUEUE_FEED_CHUNK):
+                taken += 1
+                known = self.index.lookup(person, *self.thresholds) if self.index else None
+                if known:
+                    self.from_index += 1
+                    metrics.inc("index_hits_total")
+                    self._record(known)
+                else:
+                    batch.append(person)
+            self.queued += len(batch)
+            if taken < QUEUE_FEED_CHUNK and self._source is not None:
+                self._source = None
+                if not self.in_flight:
+                    self._finish()
+        if batch:
+            self.queue.put(self.id, batch)
+
+    def _collect(self):
+        try:
+            while not self.finished.is_set():
+                if self._source is not None:
+                    self._feed()
+                acked = self.queue.results_since(self.id, self._result_seq)
+                for seq, person, res in acked:
+                    self._result_seq = seq
+                    with self._lock:
+                        if not self.active:
+                            break  # stopped: late results are dropped
+                        self.collected += 1
+                        self._record(res)
+                    if self.index:
+                        self.index.store(person, res)
+                if not acked and self._source is None:
+                    self.finished.wait(QUEUE_POLL_SECONDS)
+        except Exception as e:
+            logger.error(f"Collector for job {self.id} failed: {e}")
+            metrics.inc("errors_total", kind="queue")
+            with self._lock:
+                self.stopped = True
+                self._finish()
+        finally:
+            self.queue.purge(self.id)
+
+
+work_queue = WorkQueue(WORK_QUEUE_PATH) if WORK_QUEUE_PATH else None
+
+
+def new_search_job(people, **kwargs):
+    """A SearchJob on this process's pool, or a QueuedSearchJob when WORK_QUEUE_PATH is set."""
+    if work_queue is not None:
+        return QueuedSearchJob(people, work_queue, **kwargs)
+    return SearchJob(people, **kwargs)
+
+
+class QueueWorker:
+    """Leases people from a work queue, searches them on a thread pool and acks the results.
+
+    Like ``PriorityExecutor`` it keeps ``reserved`` threads for interactive searches.
+    A heartbeat thread keeps the leases of running searches alive. It stops extending
+    a search that has overrun its budget by ``HUNG_TASK_GRACE_SECONDS``, so the queue
+    can hand that person to another worker, and it aborts searches whose job was
+    cancelled or whose lease was lost.
+    """
+
+    def __init__(self, queue, workers=max_threads, worker_id=None, reserved=INTERACTIVE_RESERVED_WORKERS):
+        self.queue = queue
+        self.workers = workers
+        self.reserved = reserved
+        self.id = worker_id or f"{platform.node()}-{os.getpid()}"
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="queue-worker")
+        self.processed = 0
+        self.stopping = threading.Event()
+        self._running = {}  # (task id, attempt) → (CancelToken, monotonic start, seconds before hung, priority)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()  # a search finished or the worker is stopping
+
+    def run(self):
+        logger.info(f"👷 Worker {self.id} pulling from {self.queue} with {self.workers} thread(s)")
+        threading.Thread(target=self._heartbeat, name="queue-heartbeat", daemon=True).start()
+        try:
+            while not self.stopping.is_set():
+                with self._lock:
+                    free = self.workers - len(self._running)
+                    busy_low = sum(entry[3] != Priority.INTERACTIVE for entry in self._running.values())
+                tasks = []
+                if free > 0:
+                    try:
+                        tasks = self.queue.lease(self.id, free, max(1, self.workers - self.reserved) - busy_low)
+                    except Exception as e:
+                        logger.warning(f"⚠️ Lease from {self.queue} failed: {e}")
+                for task in tasks:
+                    self._start(task)
+                if not tasks:
+                    self._wake.wait(QUEUE_POLL_SECONDS)
+                    self._wake.clear()
+        finally:
+            self._shutdown()
+
+    def stop(self):
+        self.stopping.set()
+        self._wake.set()
+
+    def _start(self, task):
+        budget = task["settings"].get("budget")
+        token = CancelToken()
+        with self._lock:
+            self._running[task["id"], task["attempt"]] = (token, time.monotonic(),
+                                         (PERSON_BUDGET_SECONDS if budget is None else budget)
+                                         + HUNG_TASK_GRACE_SECONDS, task.get("priority", Priority.BATCH))
+        self.pool.submit(self._search, task, token)
+
+    def _search(self, task, token):
+        person = task["person"]
+        try:
+            res = search_person(person, cancel=token, **task["settings"]) or SearchResult.for_person(person)
+        except Cancelled:
+            return  # job cancelled, lease lost or worker stopping: someone else answers, or nobody needs to
+        except Exception as e:
+            logger.error(f"Task failure: {e}")
+            metrics.inc("errors_total", kind="task")
+            res = SearchResult.for_person(person, title="Error", status=MatchStatus.ERROR)
+        finally:
+            with self._lock:
+                self._running.pop((task["id"], task["attempt"]), None)
+            self._wake.set()
+        try:
+            if self.queue.ack(self.id, task["id"], task["attempt"], res):
+                self.processed += 1
+        except Exception as e:
+            logger.warning(f"⚠️ Ack of task {task['id']} failed, it will be searched again: {e}")
+
+    def _heartbeat(self):
+        while not self.stopping.wait(self.queue.lease_seconds / 3):
+            now = time.monotonic()
+            with self._lock:
+                running = dict(self._running)
+            # A lease re-taken by this same worker is held by its newest attempt only
+            newest = {}
+            for task_id, attempt in running:
+                newest[task_id] = max(attempt, newest.get(task_id, 0))
+            alive = [task_id for (task_id, attempt), (_, started, limit, _) in running.items()
+                     if attempt == newest[task_id] and now - started <= limit]
+            try:
+                held = set(self.queue.heartbeat(self.id, alive))
+            except Exception as e:
+                logger.warning(f"⚠️ Heartbeat to {self.queue} failed: {e}")
+                continue
+            for (task_id, attempt), (token, started, _, _) in running.items():
+                if (task_id not in held or attempt != newest[task_id]) and not token.cancelled:
+                    logger.warning(f"🐶 Giving up task {task_id} after {now - started:.0f}s "
+                                   f"(hung, cancelled or its lease was lost)")
+                    token.cancel()
+
+    def _shutdown(self):
+        with self._lock:
+            tokens = [entry[0] for entry in self._running.values()]
+        for token in tokens:
+            token.cancel()
+        self.pool.shutdown(wait=True)
+        try:
+            self.queue.release(self.id)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not release leases (they expire in {self.queue.lease_seconds:.0f}s): {e}")
+        logger.info(f"👋 Worker {self.id} stopped after {self.processed} search(es)")
+
+# ────────────────────────────────────────────────────────────────
+# Streaming result writers (CSV, gzip CSV, JSONL, Parquet)
+# ────────────────────────────────────────────────────────────────
+
+class CsvResultWriter:
+    def __init__(self, stream, columns=RESULT_COLUMNS):
+        self._writer = csv.DictWriter(stream, fieldnames=columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row):
+        self._writer.writerow(row)
+
+    def close(self):
+        pass
+
+
+class JsonlResultWriter:
+    def __init__(self, stream, columns=RESULT_COLUMNS):
+        self._stream = stream
+        self._columns = columns
+
+    def write(self, row):
+        record = {c: row.get(c) for c in self._columns}
+        self._stream.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def close(self):
+        pass
+
+
+class ParquetResultWriter:
+    """Buffers ``batch_size`` rows per row group; needs the optional ``pyarrow`` package."""
+
+    def __init__(self, sink, columns=RESULT_COLUMNS, batch_size=1000):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet output needs pyarrow — pip install pyarrow")
+        self._pa = pa
+        self._columns = columns
+        self._schema = pa.schema([(c, getattr(pa, NUMERIC_COLUMN_TYPES.get(c, "string"))()) for c in columns])
+        self._writer = pq.ParquetWriter(sink, self._schema)
+        self._batch_size = batch_size
+        self._rows = []
+
+    def write(self, row):
+        self._rows.append(row)
+        if len(self._rows) >= self._batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._rows:
+            return
+        cols = {c: [r.get(c) if c in NUMERIC_COLUMN_TYPES or r.get(c) is None else str(r.get(c))
+                    for r in self._rows]
+                for c in self._columns}
+        self._writer.write_table(self._pa.table(cols, schema=self._schema))
+        self._rows = []
+
+    def close(self):
+        self.flush()
+        self._writer.close()
+
+
+EXPORT_FORMATS = {
+    # format → (mimetype, file extension)
+    "csv": ("text/csv", "csv"),
+    "csv.gz": ("application/gzip", "csv.gz"),
+    "jsonl": ("application/x-ndjson", "jsonl"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only byte sink that hands back whatever was written since the last drain."""
+
+    def __init__(self):
+        super().__init__()
+        self._parts = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._parts.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b"".join(self._parts)
+        self._parts = []
+        return data
+
+
+def iter_export_chunks(results, fmt, chunk_rows=1000):
+    """Serialise ``results`` as ``fmt`` and yield bytes every ``chunk_rows`` rows.
+
+    Only the rows recorded when the export starts are included, so a running job
+    can be exported as-is; memory stays at one chunk whatever the job size. Rows
+    are written as stored: incomes appear once the job has finalized them.
+    """
+    count = len(results)
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = ParquetResultWriter(sink, batch_size=chunk_rows)
+    else:
+        text = io.TextIOWrapper(sink, encoding="utf-8", newline="", write_through=True)
+        writer = JsonlResultWriter(text) if fmt == "jsonl" else CsvResultWriter(text)
+    compressor = zlib.compressobj(wbits=31) if fmt == "csv.gz" else None  # wbits=31: gzip container
+
+    for start in range(0, count, chunk_rows):
+        for result in results[start:min(start + chunk_rows, count)]:
+            writer.write(export_row(result))
+        if fmt == "parquet":
+            writer.flush()
+        chunk = sink.drain()
+        if compressor:
+            chunk = compressor.compress(chunk)
+        if chunk:
+            yield chunk
+
+    writer.close()
+    tail = sink.drain()
+    if compressor:
+        tail = compressor.compress(tail) + compressor.flush()
+    if tail:
+        yield tail
+
+
+def output_format(path):
+    """Pick the export format from a file name: csv, csv.gz, jsonl or parquet."""
+    name = path.lower()
+    for ext, fmt in ((".csv.gz", "csv.gz"), (".csv", "csv"), (".jsonl", "jsonl"),
+                     (".ndjson", "jsonl"), (".parquet", "parquet")):
+        if name.endswith(ext):
+            return fmt
+    raise ValueError(f"Unsupported output type: {path} (use .csv, .csv.gz, .jsonl or .parquet)")
+
+
+def open_result_writer(path, fmt=None):
+    """Open ``path`` for streaming results; returns ``(writer, file)`` — close both."""
+    fmt = fmt or output_format(path)
+    if fmt == "parquet":
+        return ParquetResultWriter(path), None
+    if fmt == "csv.gz":
+        fh = gzip.open(path, "wt", encoding="utf-8", newline="")
+    else:
+        fh = open(path, "w", encoding="utf-8", newline="")
+    writer = JsonlResultWriter(fh) if fmt == "jsonl" else CsvResultWriter(fh)
+    return writer, fh
+
+# ────────────────────────────────────────────────────────────────
+# Headless batch CLI
+# ────────────────────────────────────────────────────────────────
+
+def run_batch(args):
+    with open(args.input, "rb") as fh:
+        df = read_people_csv(fh.read())
+    total = len(df) if not args.limit else min(len(df), args.limit)
+    people = iter_people(df.head(total))
+
+    writer, out_file = open_result_writer(args.output)
+    finished_rows = queue.Queue()
+    if args.workers != max_threads:
+        apply_cpu_budget(plan_cpu_budget(workers=args.workers))
+    load_models()
+    pool = ThreadPoolExecutor(max_workers=args.workers)
+    job = SearchJob(
+        people, total=total,
+        cosine_threshold=args.cosine_threshold, fuzzy_threshold=args.fuzzy_threshold,
+        serpapi_key=args.serpapi_key, engine=args.engine, budget=args.budget,
+        index=None if args.no_index else profile_index,
+        pool=pool, window=TASK_WINDOW_PER_WORKER * args.workers,
+        on_result=finished_rows.put, keep_results=False,
+    )
+
+    print(f"🚀 {total} people → {args.output} ({args.workers} workers, engine={args.engine})", file=sys.stderr)
+    written = matched = 0
+    last_report = time.time()
+    job.start()
+    try:
+        # Workers only enqueue; all file I/O stays on this thread
+        while written < total:
+            try:
+                row = finished_rows.get(timeout=0.5)
+            except queue.Empty:
+                if job.finished.is_set() and finished_rows.empty():
+                    break
+            else:
+                writer.write(export_row(estimate_income(replace(row))))
+                written += 1
+                matched += row.status is MatchStatus.MATCH
+            if time.time() - last_report >= args.progress_every:
+                last_report = time.time()
+                print(f"⏳ {written}/{total} | {job.rate():.2f} people/sec | "
+                      f"in flight {job.in_flight} | ETA {int(job.eta())}s", file=sys.stderr)
+    except KeyboardInterrupt:
+        print("🛑 Interrupted — stopping workers.", file=sys.stderr)
+        job.stop()
+    finally:
+        writer.close()
+        if out_file:
+            out_file.close()
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.time() - job.started_at
+    print(f"✅ {written} result(s) in {elapsed:.1f}s — {written / elapsed if elapsed else 0:.2f} people/sec, "
+          f"{matched} matched, {job.errors} error(s), {job.timeouts} timed out, {job.from_index} reused from the index", file=sys.stderr)
+    return 0 if written == total else 1
+
+
+def run_worker(args):
+    if args.coordinator:
+        password = os.getenv("COORDINATOR_PASSWORD")
+        source = RemoteWorkQueue(args.coordinator, (args.user, password) if args.user and password else None)
+    elif args.queue:
+        source = WorkQueue(args.queue)
+    else:
+        print("❌ Pass --queue PATH (or set WORK_QUEUE_PATH) or --coordinator URL", file=sys.stderr)
+        return 2
+    if args.workers != max_threads:
+        apply_cpu_budget(plan_cpu_budget(workers=args.workers))
+    load_models()
+    worker = QueueWorker(source, args.workers)
+    signal.signal(signal.SIGTERM, lambda *_: worker.stop())
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        worker.stop()
+    return 0
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(prog="LinkedinProfileFinder.py", description="LinkedIn Profile Finder")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="search a CSV headlessly and stream results to a file")
+    batch.add_argument("input", help="CSV with First Name, Last Name, University[, Graduation Year]")
+    batch.add_argument("output", help="results file: .csv, .csv.gz, .jsonl or .parquet")
+    batch.add_argument("--workers", type=int, default=max_threads)
+    batch.add_argument("--engine", choices=("auto", "serpapi", "bing"), default="auto",
+                       help="auto = SerpAPI with Bing fallback")
+    batch.add_argument("--serpapi-key", default=None, help="defaults to $SERPAPI_KEY")
+    batch.add_argument("--cosine-threshold", type=float, default=0.4)
+    batch.add_argument("--fuzzy-threshold", type=float, default=0.75)
+    batch.add_argument("--budget", type=float, default=PERSON_BUDGET_SECONDS,
+                       help="seconds allowed per person across all search stages and retries")
+    batch.add_argument("--no-index", action="store_true",
+                       help="search everyone again instead of reusing matches from earlier runs")
+    batch.add_argument("--limit", type=int, default=None, help="only search the first N rows")
+    batch.add_argument("--progress-every", type=float, default=5.0, help="seconds between progress lines")
+    batch.set_defaults(func=run_batch)
+
+    worker = commands.add_parser("worker", help="search people queued by a coordinator (dashboard with WORK_QUEUE_PATH)")
+    worker.add_argument("--queue", default=WORK_QUEUE_PATH, help="work queue file on this machine")
+    worker.add_argument("--coordinator", help="dashboard URL, for workers on other machines")
+    worker.add_argument("--user", default=os.getenv("COORDINATOR_USER"),
+                        help="dashboard login for --coordinator; the password comes from $COORDINATOR_PASSWORD")
+    worker.add_argument("--workers", type=int, default=max_threads)
+    worker.set_defaults(func=run_worker)
+    return parser
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())